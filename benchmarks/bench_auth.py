@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# Measures the per request cost of signing with APIAuth: building a new
+# handler for every request, as api_* used to, against re-using one.
+#
+#   python benchmarks/bench_auth.py [iterations]
+import base64
+import hashlib
+import hmac
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from capella.lib.APIAuth import APIAuth  # noqa: E402
+
+SECRET = "s" * 64
+ACCESS = "a" * 32
+TOKEN = "t" * 128
+V3_URL = "https://cloudapi.cloud.couchbase.com/v3/clusters/" \
+    "8a8b3a3c-8e2c-4d5e-9f1a-123456789abc/status"
+V4_URL = "https://cloudapi.cloud.couchbase.com/v4/organizations/" \
+    "8a8b3a3c-8e2c-4d5e-9f1a-123456789abc/projects"
+
+
+class LegacyAPIAuth(object):
+    # The handler as it was before it became persistent, one was built for
+    # every request
+
+    def __init__(self, secret, access, token):
+        self.ACCESS_KEY = access
+        self.SECRET_KEY = secret
+        self.bearer_token = token
+
+    def get_headers(self, method, url):
+        if "v4" in url:
+            return {'Authorization': 'Bearer ' + self.bearer_token,
+                    'Content-Type': 'application/json'}
+        endpoint = url.split(".com", 1)[-1]
+        now = int(time.time() * 1000)
+        message = method + '\n' + endpoint + '\n' + str(now)
+        signature = base64.b64encode(
+            hmac.new(self.SECRET_KEY.encode(), message.encode(),
+                     digestmod=hashlib.sha256).digest())
+        return {'Authorization': 'Bearer ' + self.ACCESS_KEY + ':' +
+                signature.decode(),
+                'Couchbase-Timestamp': str(now),
+                'Content-Type': 'application/json'}
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    auth = APIAuth(SECRET, ACCESS, TOKEN)
+    token_auth = APIAuth(None, None, TOKEN)
+    cases = [
+        ("v3 legacy, new handler per request",
+         lambda: LegacyAPIAuth(SECRET, ACCESS, TOKEN).get_headers(
+             "GET", V3_URL)),
+        ("v3 persistent handler",
+         lambda: auth.get_headers("GET", V3_URL)),
+        ("v4 legacy, new handler per request",
+         lambda: LegacyAPIAuth(SECRET, ACCESS, TOKEN).get_headers(
+             "GET", V4_URL)),
+        ("v4 persistent handler",
+         lambda: auth.get_headers("GET", V4_URL)),
+        ("v4 persistent handler, token only client",
+         lambda: token_auth.get_headers("GET", V4_URL)),
+    ]
+    for name, case in cases:
+        seconds = min(timeit.repeat(case, number=iterations, repeat=3))
+        print("{:<40} {:8.2f} us/request".format(
+            name, seconds / iterations * 1e6))
+
+
+if __name__ == "__main__":
+    main()
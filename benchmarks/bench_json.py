@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# Compares the JSON codecs APICodec can use on listing sized payloads,
+# shaped like list_tenant_events / get_all_serverless_databases pages.
+# Payloads recorded from a live tenant can be passed as extra arguments.
+#
+#   python benchmarks/bench_json.py [iterations] [payload.json ...]
+import os
+import sys
+import timeit
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from capella.lib import APICodec  # noqa: E402
+
+
+def events_page(count):
+    return {
+        "cursor": {"pages": {"page": 1, "next": 2, "last": 40,
+                             "perPage": count, "totalItems": 40 * count},
+                   "hrefs": {"first": "/v4/organizations/x/events?page=1",
+                             "last": "/v4/organizations/x/events?page=40"}},
+        "data": [{
+            "id": str(uuid.uuid4()),
+            "alertKey": "cluster_deployment_completed",
+            "key": "cluster.deployment.completed",
+            "severity": "info",
+            "source": "cp-api",
+            "timestamp": "2024-05-01T10:{:02d}:00.000Z".format(i % 60),
+            "organizationId": str(uuid.uuid4()),
+            "projectId": str(uuid.uuid4()),
+            "clusterId": str(uuid.uuid4()),
+            "userId": str(uuid.uuid4()),
+            "sessionId": str(uuid.uuid4()),
+            "request_id": str(uuid.uuid4()),
+            "kv": {"clusterName": "cluster-{}".format(i),
+                   "provider": "aws", "region": "us-east-1",
+                   "nodes": i % 9, "storage": 50.5 + i,
+                   "services": ["data", "index", "query"]}
+        } for i in range(count)]
+    }
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    payloads = [("synthetic events page, 1000 items", events_page(1000)),
+                ("synthetic events page, 10000 items", events_page(10000))]
+    for path in sys.argv[2:]:
+        with open(path, "rb") as f:
+            payloads.append((os.path.basename(path), APICodec.loads(f.read())))
+
+    codecs = ["json"]
+    try:
+        APICodec.set_codec("orjson")
+        codecs.append("orjson")
+    except ValueError:
+        print("orjson is not installed, only the json module is measured")
+
+    for name, payload in payloads:
+        raw = APICodec.encode(payload)
+        print("{} ({:.1f} MB)".format(name, len(raw) / 1e6))
+        for codec in codecs:
+            APICodec.set_codec(codec)
+            decode = min(timeit.repeat(lambda: APICodec.loads(raw),
+                                       number=iterations, repeat=3))
+            encode = min(timeit.repeat(lambda: APICodec.encode(payload),
+                                       number=iterations, repeat=3))
+            print("  {:<8} decode {:8.2f} ms  encode {:8.2f} ms".format(
+                codec, decode / iterations * 1e3,
+                encode / iterations * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,43 @@ from .lib.APIExceptions import (
     UserBucketAccessListError,
     InvalidUuidError,
     GenericHTTPError,
-    CbcAPIError
+    CbcAPIError,
+    IncompleteDownloadError,
+    DeadlineExceeded,
+    CircuitOpenError,
+    set_exit_on_error
 )
 from .lib.APIRequests import APIRequests
+from .lib.APIAsyncRequests import AsyncAPIRequests
 from .lib.APIAuth import APIAuth
+from .lib.APIRetry import RetryPolicy
+from .lib.APIRateLimiter import TokenBucketRateLimiter
+from .lib.APICache import ResponseCache
+from .lib.APICoalescer import RequestCoalescer
+from .lib.APICodec import set_codec, get_codec
+from .lib.APIDeadline import deadline, remaining
+from .lib.APINameIndex import NameIndex
+from .lib.APITokenManager import JWTTokenManager
+from .lib.APITransport import APITransport
+from .lib.APIMetrics import APIMetrics
+from .lib.APIHedging import HedgePolicy
+from .lib.APICircuitBreaker import CircuitBreaker
+from .lib.APIPool import (
+    APIConnectionPool,
+    get_shared_pool,
+    configure_shared_pool
+)
+from .lib.APIClientManager import APIClientManager
+from .lib.APIHTTP2 import HTTP2Adapter
+from .lib.APICompression import BodyCompression
+from .lib.APIBulkExecutor import (
+    APIBulkExecutor,
+    BulkResult,
+    BulkCallTimeout
+)
+from .lib.APITracing import (
+    APITracer,
+    Span,
+    SpanExporter,
+    InMemorySpanExporter
+)
@@ -1,4 +1,4 @@
-import json
+from ..lib import APICodec
 
 from ..common.CapellaAPI import CommonCapellaAPI
 
@@ -31,7 +31,7 @@ class CapellaAPI(CommonCapellaAPI):
             "scheduledTimeInUTC": time,
             "clusters": instance_ids
         }
-        resp = self._urllib_request(url, "POST", params=json.dumps(body),
+        resp = self._urllib_request(url, "POST", params=APICodec.dumps(body),
                                     headers=self.cbc_api_request_headers)
         return resp
 
@@ -49,7 +49,7 @@ class CapellaAPI(CommonCapellaAPI):
             "all_instances": all_instances
         }
         url = "{}/internal/support/columnar/recovery/scheduling".format(self.internal_url)
-        resp = self._urllib_request(url, "POST", params=json.dumps(body),
+        resp = self._urllib_request(url, "POST", params=APICodec.dumps(body),
                                     headers=self.cbc_api_request_headers)
         return resp
 
@@ -67,7 +67,7 @@ class CapellaAPI(CommonCapellaAPI):
             "allInstances": all_instances
         }
         url = "{}/internal/support/columnar/recovery/retention".format(self.internal_url)
-        resp = self._urllib_request(url, "POST", params=json.dumps(body),
+        resp = self._urllib_request(url, "POST", params=APICodec.dumps(body),
                                     headers=self.cbc_api_request_headers)
         return resp
 
@@ -140,7 +140,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = "{}/v2/organizations/{}/projects/{}/instance".format(
             self.internal_url, tenant_id, project_id)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def get_columnar_instances(self, tenant_id, project_id, page=1,
@@ -223,7 +223,7 @@ class CapellaAPI(CommonCapellaAPI):
         for key, value in kwargs.items():
             body[key] = value
 
-        resp = self.do_internal_request(url, method="PATCH", params=json.dumps(body))
+        resp = self.do_internal_request(url, method="PATCH", params=APICodec.dumps(body))
         return resp
 
     def create_columnar_role(self, tenant_id, project_id, instance_id,
@@ -231,7 +231,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = "{}/v2/organizations/{}/projects/{}/instance/{}/roles".format(
             self.internal_url, tenant_id, project_id, instance_id)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(payload))
+                                        params=APICodec.dumps(payload))
         return resp
 
     def delete_columnar_role(self, tenant_id, project_id, instance_id,
@@ -256,7 +256,7 @@ class CapellaAPI(CommonCapellaAPI):
             self.internal_url, tenant_id, project_id, instance_id)
         if payload:
             resp = self.do_internal_request(url, method="POST",
-                                            params=json.dumps(payload))
+                                            params=APICodec.dumps(payload))
         else:
             resp = self.do_internal_request(url, method="POST")
         return resp
@@ -306,7 +306,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = "{}/v2/organizations/{}/projects/{}/instance/{}/apikeys/{}".format(
             self.internal_url, tenant_id, project_id, instance_id, api_key_id)
         resp = self.do_internal_request(url, method="PATCH",
-                                        params=json.dumps(payload))
+                                        params=APICodec.dumps(payload))
         return resp
 
     def allow_ip(self, tenant_id, project_id, instance_id, cidr, comment="", **kwargs):
@@ -328,7 +328,7 @@ class CapellaAPI(CommonCapellaAPI):
             body[key] = value
 
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(body))
+                                        params=APICodec.dumps(body))
         return resp
 
     def turn_off_instance(self, tenant_id, project_id, instance_id):
@@ -368,7 +368,7 @@ class CapellaAPI(CommonCapellaAPI):
                   'timeout': str(analytics_timeout) + time_out_unit}
 
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(params))
+                                        params=APICodec.dumps(params))
         return resp
 
     def schedule_on_off(self, tenant_id, project_id, instance_id, days, timezone="UTC", **kwargs):
@@ -389,7 +389,7 @@ class CapellaAPI(CommonCapellaAPI):
             body[k] = v
         url = '{}/v2/organizations/{}/projects/{}/instance/{}/schedules/onoff' \
             .format(self.internal_url, tenant_id, project_id, instance_id)
-        resp = self.do_internal_request(url, method="PUT", params=json.dumps(body))
+        resp = self.do_internal_request(url, method="PUT", params=APICodec.dumps(body))
         return resp
 
     def create_backup(self, tenant_id, project_id, instance_id, retention=None):
@@ -406,7 +406,7 @@ class CapellaAPI(CommonCapellaAPI):
             payload = {"retention": retention}
         url = '{}/v2/organizations/{}/projects/{}/instance/{}/snapshotbackups'.format(
             self.internal_url, tenant_id, project_id, instance_id)
-        resp = self.do_internal_request(url, method="POST", params=json.dumps(payload))
+        resp = self.do_internal_request(url, method="POST", params=APICodec.dumps(payload))
         return resp
 
     def list_backups(self, tenant_id, project_id, instance_id, page=1, perPage=100):
@@ -451,7 +451,7 @@ class CapellaAPI(CommonCapellaAPI):
         payload = {"retention": retention}
         url = '{}/v2/organizations/{}/projects/{}/instance/{}/snapshotbackups/{}' \
             .format(self.internal_url, tenant_id, project_id, instance_id, backup_id)
-        resp = self.do_internal_request(url, method="PUT", params=json.dumps(payload))
+        resp = self.do_internal_request(url, method="PUT", params=APICodec.dumps(payload))
         return resp
 
     def backup_restore_billing_rate(self, tenant_id, project_id, instance_id):
@@ -530,7 +530,7 @@ class CapellaAPI(CommonCapellaAPI):
 
         url = '{}/v2/organizations/{}/projects/{}/instance/{}/snapshotbackupschedule' \
             .format(self.internal_url, tenant_id, project_id, instance_id)
-        resp = self.do_internal_request(url, method="PUT", params=json.dumps(payload))
+        resp = self.do_internal_request(url, method="PUT", params=APICodec.dumps(payload))
         return resp
 
     def get_backup_schedules(self, tenant_id, project_id, instance_id):
@@ -578,7 +578,7 @@ class CapellaAPI(CommonCapellaAPI):
         }
         url = "{}/v2/organizations/{}/projects/{}/instance/{}/links".format(
             self.internal_url, tenant_id, project_id, instance_id)
-        resp = self.do_internal_request(url, method="POST", params=json.dumps(payload))
+        resp = self.do_internal_request(url, method="POST", params=APICodec.dumps(payload))
         return resp
 
     def create_analytics_admin_user(self, instance_id):
@@ -640,7 +640,7 @@ class CapellaAPI(CommonCapellaAPI):
             "perPage": per_page
         }
         resp = self.do_internal_request(
-            url, method="GET", params=json.dumps(payload))
+            url, method="GET", params=APICodec.dumps(payload))
         return resp
 
     """
@@ -3,12 +3,14 @@
 
 import logging
 from ..lib.APIRequests import APIRequests
+from ..lib.APIAsyncRequests import AsyncAPIRequests
 
 
 class ColumnarAPIs(APIRequests):
 
-    def __init__(self, url, secret, access, bearer_token):
-        super(ColumnarAPIs, self).__init__(url, secret, access, bearer_token)
+    def __init__(self, url, secret, access, bearer_token, transport=None):
+        super(ColumnarAPIs, self).__init__(url, secret, access, bearer_token,
+                                           transport=transport)
         self.columnar_ops_API_log = logging.getLogger(__name__)
         self.analytics_clusters_endpoint = "/v4/organizations/{}/projects/{}/analyticsClusters"
         self.org_level_analytics_clusters_endpoint = "/v4/organizations/{}/analyticsClusters"
@@ -37,8 +39,8 @@ class ColumnarAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.columnar_ops_API_log.info(
-            "Turning off the columnar instance {}, inside project {}, inside "
-            "tenant {}".format(instanceId, projectId, organizationId))
+            "Turning off the columnar instance %s, inside project %s, inside "
+            "tenant %s", instanceId, projectId, organizationId)
 
         if kwargs:
             params = kwargs
@@ -71,8 +73,8 @@ class ColumnarAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.columnar_ops_API_log.info(
-            "Turning on the columnar instance {}, inside project {}, inside "
-            "tenant {}".format(instanceId, projectId, organizationId))
+            "Turning on the columnar instance %s, inside project %s, inside "
+            "tenant %s", instanceId, projectId, organizationId)
 
         if kwargs:
             params = kwargs
@@ -123,8 +125,8 @@ class ColumnarAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.columnar_ops_API_log.info(
-            "Creating an columnar instance inside project {}, inside tenant "
-            "{}.".format(projectId, organizationId))
+            "Creating an columnar instance inside project %s, inside tenant "
+            "%s.", projectId, organizationId)
 
         params = {
             "name": name,
@@ -166,8 +168,8 @@ class ColumnarAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.columnar_ops_API_log.info(
-            "Deleting the columnar instance {}, inside project {}, inside "
-            "tenant {}.".format(instanceId, projectId, organizationId))
+            "Deleting the columnar instance %s, inside project %s, inside "
+            "tenant %s.", instanceId, projectId, organizationId)
 
         if kwargs:
             params = kwargs
@@ -201,8 +203,8 @@ class ColumnarAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.columnar_ops_API_log.info(
-            "Fetching the info for columnar instance {}, inside project {}, "
-            "inside tenant {}.".format(instanceId, projectId, organizationId))
+            "Fetching the info for columnar instance %s, inside project %s, "
+            "inside tenant %s.", instanceId, projectId, organizationId)
 
         if kwargs:
             params = kwargs
@@ -242,8 +244,7 @@ class ColumnarAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.columnar_ops_API_log.info(
-            "Listing all columnar instances inside tenant {}"
-            .format(organizationId))
+            "Listing all columnar instances inside tenant %s", organizationId)
 
         params = {}
         if page:
@@ -261,6 +262,36 @@ class ColumnarAPIs(APIRequests):
             organizationId), params, headers)
         return resp
 
+    def iter_organization_level_analytics_clusters(
+            self,
+            organizationId,
+            perPage=None,
+            sortBy=None,
+            sortDirection=None,
+            headers=None,
+            **kwargs):
+        """
+        Generator version of list_organization_level_analytics_clusters, follows cursor.pages and
+        yields the listed items one at a time. Pages are only fetched as
+        they are consumed.
+
+        Args:
+            perPage: Sets how many results are fetched per page. (int)
+            prefetch_workers: Fetch the pages after the first one concurrently, with this many workers. (int)
+            Takes the same args as list_organization_level_analytics_clusters otherwise.
+
+        Returns:
+            Generator of the listed items.
+        """
+        return self.iter_listing(
+            self.list_organization_level_analytics_clusters,
+            organizationId,
+            perPage=perPage,
+            sortBy=sortBy,
+            sortDirection=sortDirection,
+            headers=headers,
+            **kwargs)
+
     def list_project_level_analytics_clusters(
             self,
             organizationId,
@@ -290,8 +321,8 @@ class ColumnarAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.columnar_ops_API_log.info(
-            "Listing all columnar instances inside project {}, "
-            "inside tenant {}.".format(projectId, organizationId))
+            "Listing all columnar instances inside project %s, "
+            "inside tenant %s.", projectId, organizationId)
 
         params = {}
         if page:
@@ -310,6 +341,38 @@ class ColumnarAPIs(APIRequests):
             params, headers)
         return resp
 
+    def iter_project_level_analytics_clusters(
+            self,
+            organizationId,
+            projectId,
+            perPage=None,
+            sortBy=None,
+            sortDirection=None,
+            headers=None,
+            **kwargs):
+        """
+        Generator version of list_project_level_analytics_clusters, follows cursor.pages and
+        yields the listed items one at a time. Pages are only fetched as
+        they are consumed.
+
+        Args:
+            perPage: Sets how many results are fetched per page. (int)
+            prefetch_workers: Fetch the pages after the first one concurrently, with this many workers. (int)
+            Takes the same args as list_project_level_analytics_clusters otherwise.
+
+        Returns:
+            Generator of the listed items.
+        """
+        return self.iter_listing(
+            self.list_project_level_analytics_clusters,
+            organizationId,
+            projectId,
+            perPage=perPage,
+            sortBy=sortBy,
+            sortDirection=sortDirection,
+            headers=headers,
+            **kwargs)
+
     def update_analytics_cluster(
             self,
             organizationId,
@@ -342,8 +405,8 @@ class ColumnarAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.columnar_ops_API_log.info(
-            "Updating the columnar instance {}, inside project {}, inside "
-            "tenant {}".format(instanceId, projectId, organizationId))
+            "Updating the columnar instance %s, inside project %s, inside "
+            "tenant %s", instanceId, projectId, organizationId)
 
         params = {
             "name": name,
@@ -386,8 +449,8 @@ class ColumnarAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.columnar_ops_API_log.info(
-            "Creating on off schedule for the instance {}, inside project {}, "
-            "inside tenant {}.".format(instanceId, projectId, organizationId))
+            "Creating on off schedule for the instance %s, inside project %s, "
+            "inside tenant %s.", instanceId, projectId, organizationId)
 
         params = {
             "timezone": timezone,
@@ -422,8 +485,8 @@ class ColumnarAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.columnar_ops_API_log.info(
-            "Deleting on/off schedule for instance {}, inside project {}, "
-            "inside tenant {}.".format(instanceId, projectId, organizationId))
+            "Deleting on/off schedule for instance %s, inside project %s, "
+            "inside tenant %s.", instanceId, projectId, organizationId)
 
         if kwargs:
             params = kwargs
@@ -456,9 +519,9 @@ class ColumnarAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.columnar_ops_API_log.info(
-            "Fetching on/off schedule details for the instance {}, inside "
-            "project {}, inside tenant {}".format(instanceId, projectId,
-                                                  organizationId))
+            "Fetching on/off schedule details for the instance %s, inside "
+            "project %s, inside tenant %s",
+            instanceId, projectId, organizationId)
 
         if kwargs:
             params = kwargs
@@ -495,8 +558,8 @@ class ColumnarAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.columnar_ops_API_log.info(
-            "Changing on/off schedule for instance {}, inside project {}, "
-            "inside tenant {}".format(instanceId, projectId, instanceId))
+            "Changing on/off schedule for instance %s, inside project %s, "
+            "inside tenant %s", instanceId, projectId, instanceId)
 
         params = {
             "timezone": timezone,
@@ -508,3 +571,14 @@ class ColumnarAPIs(APIRequests):
         resp = self.api_put(self.schedule_on_off_endpoint.format(
             organizationId, projectId, instanceId), params, headers)
         return resp
+
+
+class AsyncColumnarAPIs(AsyncAPIRequests, ColumnarAPIs):
+    """
+    Awaitable version of ColumnarAPIs, every method returns a coroutine
+    resolving to the response. Requires the httpx package.
+    """
+
+    def __init__(self, url, secret, access, bearer_token, **kwargs):
+        ColumnarAPIs.__init__(self, url, secret, access, bearer_token)
+        self._init_async_session(**kwargs)
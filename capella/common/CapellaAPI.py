@@ -2,7 +2,7 @@
 # Generic/Built-in
 import logging
 
-import json
+from ..lib import APICodec
 from ..lib.APIRequests import APIRequests
 
 
@@ -30,7 +30,7 @@ class CommonCapellaAPI(APIRequests):
             "ticketId": ticketId,
             "nodeId": nodeId
         }
-        resp = self._urllib_request(url, "POST", params=json.dumps(payload),
+        resp = self._urllib_request(url, "POST", params=APICodec.dumps(payload),
                                     headers=self.cbc_api_request_headers)
         return resp
 
@@ -59,7 +59,7 @@ class CommonCapellaAPI(APIRequests):
             'region': region
         }
         url = self.internal_url + '/internal/support/distribution-points'
-        resp = self._urllib_request(url, "POST", params=json.dumps(body),
+        resp = self._urllib_request(url, "POST", params=APICodec.dumps(body),
                                     headers=self.cbc_api_request_headers)
         return resp
 
@@ -113,7 +113,7 @@ class CommonCapellaAPI(APIRequests):
             "marketingOptIn": False
         }
         resp = self._urllib_request(url, method="POST",
-                                    params=json.dumps(body),
+                                    params=APICodec.dumps(body),
                                     headers=headers)
         return resp
 
@@ -141,7 +141,7 @@ class CommonCapellaAPI(APIRequests):
         }
         resp = self._urllib_request(url, "GET",
                                     headers=headers,
-                                    params=json.dumps({}))
+                                    params=APICodec.dumps({}))
         return resp
 
     def activate_resource_container(self, cloud, body):
@@ -149,7 +149,7 @@ class CommonCapellaAPI(APIRequests):
             self.internal_url, cloud.lower())
         resp = self._urllib_request(url, "POST",
                                     headers=self.cbc_api_request_headers,
-                                    params=json.dumps(body))
+                                    params=APICodec.dumps(body))
         return resp
 
     def list_accessible_tenants(self):
@@ -168,7 +168,7 @@ class CommonCapellaAPI(APIRequests):
             "tenantId": tenant_id
         }
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(body),
+                                        params=APICodec.dumps(body),
                                         headers=headers)
         return resp
 
@@ -192,7 +192,7 @@ class CommonCapellaAPI(APIRequests):
         params = {}
         if duration_seconds > 0:
             params['timeInSeconds'] = duration_seconds
-        resp = self._urllib_request(url, "POST", params=json.dumps(params),
+        resp = self._urllib_request(url, "POST", params=APICodec.dumps(params),
                                     headers=self.cbc_api_request_headers)
         return resp
 
@@ -251,7 +251,7 @@ class CommonCapellaAPI(APIRequests):
 
         url = '{}/v2/organizations/{}/projects'.format(self.internal_url, tenant_id)
         capella_api_response = self.do_internal_request(url, method="POST",
-                                                        params=json.dumps(project_details))
+                                                        params=APICodec.dumps(project_details))
         return capella_api_response
 
     def delete_project(self, tenant_id, project_id):
@@ -270,13 +270,13 @@ class CommonCapellaAPI(APIRequests):
     def run_query(self, cluster_id, payload):
         url = "{0}/v2/databases/{1}/proxy/_p/query/query/service" \
             .format(self.internal_url, cluster_id)
-        resp = self.do_internal_request(url, method="POST", params=json.dumps(payload))
+        resp = self.do_internal_request(url, method="POST", params=APICodec.dumps(payload))
         return resp
 
     def create_fts_index(self, database_id, fts_index_name, payload):
         url = "{}/v2/databases/{}/proxy/_p/fts/api/bucket/{}/scope/samples/index/{}" \
             .format(self.internal_url, database_id, database_id, fts_index_name)
-        resp = self.do_internal_request(url, method="PUT", params=json.dumps(payload))
+        resp = self.do_internal_request(url, method="PUT", params=APICodec.dumps(payload))
         return resp
 
     """
@@ -303,7 +303,7 @@ class CommonCapellaAPI(APIRequests):
             "password": password
         }
         resp = self.do_internal_request(
-            url, method="POST", params=json.dumps(payload))
+            url, method="POST", params=APICodec.dumps(payload))
         return resp
 
     """
@@ -326,7 +326,7 @@ class CommonCapellaAPI(APIRequests):
     def schedule_cluster_maintenance(self, payload):
         url = "{}/internal/support/maintenance/schedules".format(
             self.internal_url)
-        resp = self._urllib_request(url, "POST", params=json.dumps(payload),
+        resp = self._urllib_request(url, "POST", params=APICodec.dumps(payload),
                                     headers=self.cbc_api_request_headers)
         return resp
 
@@ -2,8 +2,9 @@
 # Generic/Built-in
 import logging
 
-import json
+from ..lib import APICodec
 from ..lib.APIRequests import APIRequests
+from ..lib.APIAsyncRequests import AsyncAPIRequests
 
 """
 Import CommonCapellaAPI to get access to all the API functionalities.
@@ -13,9 +14,9 @@ APIs are segregated according to class for better code management.
 
 class OrganizationOperationsAPIs(APIRequests):
 
-    def __init__(self, url, secret, access, bearer_token):
+    def __init__(self, url, secret, access, bearer_token, transport=None):
         super(OrganizationOperationsAPIs, self).__init__(
-            url, secret, access, bearer_token)
+            url, secret, access, bearer_token, transport=transport)
         self.org_ops_API_log = logging.getLogger(__name__)
         self.organization_endpoint = "/v4/organizations"
         self.apikeys_endpoint = self.organization_endpoint + "/{}/apikeys"
@@ -35,7 +36,7 @@ class OrganizationOperationsAPIs(APIRequests):
 
     def fetch_organization_info(self, organizationId, headers=None, **kwargs):
         self.org_ops_API_log.info(
-            "Fetching info for organization {}".format(organizationId))
+            "Fetching info for organization %s", organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -64,6 +65,25 @@ class OrganizationOperationsAPIs(APIRequests):
             self.organization_endpoint, params, headers)
         return resp
 
+    """
+    Generator version of list_organizations, follows cursor.pages and yields the
+    listed items one at a time. Pages are only fetched as they are consumed.
+    :param perPage (int) Sets how many results are fetched per page.
+    :param prefetch_workers (int) Fetch the pages after the first one concurrently, with this many workers.
+    Takes the same params as list_organizations otherwise.
+    """
+
+    def iter_organizations(
+            self,
+            perPage=None,
+            headers=None,
+            **kwargs):
+        return self.iter_listing(
+            self.list_organizations,
+            perPage=perPage,
+            headers=headers,
+            **kwargs)
+
     """
     Method to creates a new API key under an organization.
     - Organization Owners can create Organization and Project scoped APIKeys.
@@ -106,7 +126,7 @@ class OrganizationOperationsAPIs(APIRequests):
             resources=[],
             headers=None,
             **kwargs):
-        self.org_ops_API_log.info("Creating a new API key - {}".format(name))
+        self.org_ops_API_log.info("Creating a new API key - %s", name)
         params = {
             "name": name,
             "organizationRoles": organizationRoles,
@@ -146,7 +166,7 @@ class OrganizationOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.org_ops_API_log.info(
-            "List all the API key for Organization {}".format(organizationId))
+            "List all the API key for Organization %s", organizationId)
         params = {}
         if page:
             params["page"] = page
@@ -164,6 +184,31 @@ class OrganizationOperationsAPIs(APIRequests):
             self.apikeys_endpoint.format(organizationId), params, headers)
         return resp
 
+    """
+    Generator version of list_api_keys, follows cursor.pages and yields the
+    listed items one at a time. Pages are only fetched as they are consumed.
+    :param perPage (int) Sets how many results are fetched per page.
+    :param prefetch_workers (int) Fetch the pages after the first one concurrently, with this many workers.
+    Takes the same params as list_api_keys otherwise.
+    """
+
+    def iter_api_keys(
+            self,
+            organizationId,
+            perPage=None,
+            sortBy=None,
+            sortDirection=None,
+            headers=None,
+            **kwargs):
+        return self.iter_listing(
+            self.list_api_keys,
+            organizationId,
+            perPage=perPage,
+            sortBy=sortBy,
+            sortDirection=sortDirection,
+            headers=headers,
+            **kwargs)
+
     """
     Method fetches the details of given APIKey under an organization.
     Organization Owners can get any APIKey inside the Organization.
@@ -182,8 +227,8 @@ class OrganizationOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.org_ops_API_log.info(
-            "Fetching API key info for {} in organization {}".format(
-                accessKey, organizationId))
+            "Fetching API key info for %s in organization %s",
+            accessKey, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -210,8 +255,8 @@ class OrganizationOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.org_ops_API_log.info(
-            "Deleting API key {} in organization {}".format(
-                accessKey, organizationId))
+            "Deleting API key %s in organization %s",
+            accessKey, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -236,7 +281,8 @@ class OrganizationOperationsAPIs(APIRequests):
             accessKey,
             headers=None,
             **kwargs):
-        self.org_ops_API_log.info("Rotating secret key for API key - {}".format(accessKey))
+        self.org_ops_API_log.info("Rotating secret key for API key - %s",
+                                  accessKey)
         params = {}
         for k, v in kwargs.items():
             params[k] = v
@@ -277,8 +323,8 @@ class OrganizationOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.org_ops_API_log.info(
-            "Inviting user {} to organization {} with role {}".format(
-                email, organizationId, organizationRoles))
+            "Inviting user %s to organization %s with role %s",
+            email, organizationId, organizationRoles)
         params = {
             "email": email,
             "organizationRoles": organizationRoles
@@ -323,7 +369,7 @@ class OrganizationOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.org_ops_API_log.info(
-            "List all the users for Organization {}".format(organizationId))
+            "List all the users for Organization %s", organizationId)
 
         params = {}
         if page:
@@ -344,6 +390,33 @@ class OrganizationOperationsAPIs(APIRequests):
             self.users_endpoint.format(organizationId), params, headers)
         return resp
 
+    """
+    Generator version of list_org_users, follows cursor.pages and yields the
+    listed items one at a time. Pages are only fetched as they are consumed.
+    :param perPage (int) Sets how many results are fetched per page.
+    :param prefetch_workers (int) Fetch the pages after the first one concurrently, with this many workers.
+    Takes the same params as list_org_users otherwise.
+    """
+
+    def iter_org_users(
+            self,
+            organizationId,
+            perPage=None,
+            sortBy=None,
+            sortDirection=None,
+            projectId=None,
+            headers=None,
+            **kwargs):
+        return self.iter_listing(
+            self.list_org_users,
+            organizationId,
+            perPage=perPage,
+            sortBy=sortBy,
+            sortDirection=sortDirection,
+            projectId=projectId,
+            headers=headers,
+            **kwargs)
+
     """
     Method fetches the info of the user mentioned.
     In order to access this endpoint, the provided API key must have at least one of the roles referenced below:
@@ -358,8 +431,8 @@ class OrganizationOperationsAPIs(APIRequests):
 
     def fetch_user_info(self, organizationId, userId, headers=None, **kwargs):
         self.org_ops_API_log.info(
-            "Fetching user info for {} in organization {}".format(
-                userId, organizationId))
+            "Fetching user info for %s in organization %s",
+            userId, organizationId)
 
         if kwargs:
             params = kwargs
@@ -433,8 +506,7 @@ class OrganizationOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.org_ops_API_log.info(
-            "Updating user {} in organization {}".format(
-                userId, organizationId))
+            "Updating user %s in organization %s", userId, organizationId)
 
         if kwargs:
             update_info += kwargs
@@ -454,8 +526,7 @@ class OrganizationOperationsAPIs(APIRequests):
 
     def delete_user(self, organizationId, userId, headers=None, **kwargs):
         self.org_ops_API_log.info(
-            "Deleting user {} in organization {}".format(
-                userId, organizationId))
+            "Deleting user %s in organization %s", userId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -484,8 +555,7 @@ class OrganizationOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.org_ops_API_log.info(
-            "Creating Project {} in organization {}".format(
-                name, organizationId))
+            "Creating Project %s in organization %s", name, organizationId)
         params = {
             "name": name,
         }
@@ -526,7 +596,7 @@ class OrganizationOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.org_ops_API_log.info(
-            "List all the project for Organization {}".format(organizationId))
+            "List all the project for Organization %s", organizationId)
 
         params = {}
         if page:
@@ -545,6 +615,31 @@ class OrganizationOperationsAPIs(APIRequests):
             self.project_endpoint.format(organizationId), params, headers)
         return resp
 
+    """
+    Generator version of list_projects, follows cursor.pages and yields the
+    listed items one at a time. Pages are only fetched as they are consumed.
+    :param perPage (int) Sets how many results are fetched per page.
+    :param prefetch_workers (int) Fetch the pages after the first one concurrently, with this many workers.
+    Takes the same params as list_projects otherwise.
+    """
+
+    def iter_projects(
+            self,
+            organizationId,
+            perPage=None,
+            sortBy=None,
+            sortDirection=None,
+            headers=None,
+            **kwargs):
+        return self.iter_listing(
+            self.list_projects,
+            organizationId,
+            perPage=perPage,
+            sortBy=sortBy,
+            sortDirection=sortDirection,
+            headers=headers,
+            **kwargs)
+
     """
     Method lists all the info of the project mentioned.
     In order to access this endpoint, the provided API key must have at least one of the roles referenced below:
@@ -566,8 +661,8 @@ class OrganizationOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.org_ops_API_log.info(
-            "Fetching project info for {} in organization {}".format(
-                projectId, organizationId))
+            "Fetching project info for %s in organization %s",
+            projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -600,8 +695,8 @@ class OrganizationOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.org_ops_API_log.info(
-            "Updating project {} in organization {}".format(
-                projectId, organizationId))
+            "Updating project %s in organization %s",
+            projectId, organizationId)
         params = {
             "name": name,
             "description": description
@@ -611,7 +706,7 @@ class OrganizationOperationsAPIs(APIRequests):
             if not headers:
                 headers = {}
             result = self.fetch_project_info(organizationId, projectId)
-            version_id = result.json()["audit"]["version"]
+            version_id = APICodec.response_json(result)["audit"]["version"]
             headers["If-Match"] = "Version: {}".format(version_id)
 
         for k, v in kwargs.items():
@@ -639,8 +734,8 @@ class OrganizationOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.org_ops_API_log.info(
-            "Deleting project {} in organization {}".format(
-                projectId, organizationId))
+            "Deleting project %s in organization %s",
+            projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -650,12 +745,41 @@ class OrganizationOperationsAPIs(APIRequests):
         return resp
 
 
+class AsyncOrganizationOperationsAPIs(AsyncAPIRequests,
+                                      OrganizationOperationsAPIs):
+    """
+    Awaitable version of OrganizationOperationsAPIs, every method returns a
+    coroutine resolving to the response. Requires the httpx package.
+    """
+
+    def __init__(self, url, secret, access, bearer_token, **kwargs):
+        OrganizationOperationsAPIs.__init__(
+            self, url, secret, access, bearer_token)
+        self._init_async_session(**kwargs)
+
+    async def update_project(
+            self,
+            organizationId,
+            projectId,
+            name,
+            description,
+            ifmatch,
+            headers=None,
+            **kwargs):
+        if ifmatch:
+            headers = await self._version_headers(
+                self.fetch_project_info(organizationId, projectId), headers)
+        return await OrganizationOperationsAPIs.update_project(
+            self, organizationId, projectId, name, description, False,
+            headers, **kwargs)
+
+
 class CommonCapellaAPI(APIRequests):
 
     def __init__(self, url, secret, access, user, pwd, bearer_token,
-                 TOKEN_FOR_INTERNAL_SUPPORT=None):
+                 TOKEN_FOR_INTERNAL_SUPPORT=None, transport=None):
         super(CommonCapellaAPI, self).__init__(
-            url, secret, access, bearer_token)
+            url, secret, access, bearer_token, transport=transport)
         self.user = user
         self.pwd = pwd
         self.internal_url = url.replace("https://cloud", "https://", 1)
@@ -667,12 +791,12 @@ class CommonCapellaAPI(APIRequests):
             'Content-Type': 'application/json'
         }
         self.org_ops_apis = OrganizationOperationsAPIs(
-            url, secret, access, bearer_token)
+            url, secret, access, bearer_token, transport=self.transport)
 
     def trigger_log_collection(self, cluster_id, log_id={}):
         url = self.internal_url + \
             "/internal/support/logcollections/clusters/{}".format(cluster_id)
-        resp = self._urllib_request(url, "POST", params=json.dumps(log_id),
+        resp = self._urllib_request(url, "POST", params=APICodec.dumps(log_id),
                                     headers=self.cbc_api_request_headers)
         return resp
 
@@ -682,7 +806,7 @@ class CommonCapellaAPI(APIRequests):
         body = {
             "value": bool(value)
         }
-        resp = self._urllib_request(url, "PUT", params=json.dumps(body),
+        resp = self._urllib_request(url, "PUT", params=APICodec.dumps(body),
                                     headers=self.cbc_api_request_headers)
         return resp
 
@@ -717,7 +841,7 @@ class CommonCapellaAPI(APIRequests):
             "password": password
         }
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(body),
+                                        params=APICodec.dumps(body),
                                         headers=headers)
         return resp
 
@@ -757,7 +881,7 @@ class CommonCapellaAPI(APIRequests):
             "tenantId": tenant_id
         }
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(body),
+                                        params=APICodec.dumps(body),
                                         headers=headers)
         return resp
     """
@@ -785,7 +909,7 @@ class CommonCapellaAPI(APIRequests):
         params = {}
         if duration_seconds > 0:
             params['timeInSeconds'] = duration_seconds
-        resp = self._urllib_request(url, "POST", params=json.dumps(params),
+        resp = self._urllib_request(url, "POST", params=APICodec.dumps(params),
                                     headers=self.cbc_api_request_headers)
         return resp
 
@@ -842,7 +966,7 @@ class CommonCapellaAPI(APIRequests):
 
         url = '{}/v2/organizations/{}/projects'.format(self.internal_url, tenant_id)
         api_response = self.do_internal_request(url, method="POST",
-                                                        params=json.dumps(project_details))
+                                                        params=APICodec.dumps(project_details))
         return api_response
     """
 
@@ -871,14 +995,14 @@ class CommonCapellaAPI(APIRequests):
         url = "{0}/v2/databases/{1}/proxy/_p/query/query/service" \
             .format(self.internal_url, cluster_id)
         resp = self.do_internal_request(
-            url, method="POST", params=json.dumps(payload))
+            url, method="POST", params=APICodec.dumps(payload))
         return resp
 
     def create_fts_index(self, database_id, fts_index_name, payload):
         url = "{}/v2/databases/{}/proxy/_p/fts/api/bucket/{}/scope/samples/index/{}" \
             .format(self.internal_url, database_id, database_id, fts_index_name)
         resp = self.do_internal_request(
-            url, method="PUT", params=json.dumps(payload))
+            url, method="PUT", params=APICodec.dumps(payload))
         return resp
 
     def create_control_plane_api_key(
@@ -888,8 +1012,8 @@ class CommonCapellaAPI(APIRequests):
             roles=["organizationOwner"],
             keyType="machine",
             description=""):
-        self.commonCapellaAPI_log.info("Creating V2 control plane API key {"
-                                       "0} with role {1}".format(name, roles))
+        self.commonCapellaAPI_log.info(
+            "Creating V2 control plane API key %s with role %s", name, roles)
         url = "{}/v2/organizations/{}/apikeys".format(
             self.internal_url, organizationID)
         params = {
@@ -899,12 +1023,12 @@ class CommonCapellaAPI(APIRequests):
             "description": description
         }
         resp = self.do_internal_request(
-            url, method="POST", params=json.dumps(params))
+            url, method="POST", params=APICodec.dumps(params))
         return resp
 
     def delete_control_plane_api_key(self, organizationID, accesskey):
-        self.commonCapellaAPI_log.info("Deleting V2 control plane API key {"
-                                       "0}".format(accesskey))
+        self.commonCapellaAPI_log.info(
+            "Deleting V2 control plane API key %s", accesskey)
         url = "{}/v2/organizations/{}/apikeys/{}".format(
             self.internal_url, organizationID, accesskey)
         resp = self.do_internal_request(url, method="DELETE")
@@ -934,7 +1058,7 @@ class CommonCapellaAPI(APIRequests):
             "password": password
         }
         resp = self.do_internal_request(
-            url, method="POST", params=json.dumps(payload))
+            url, method="POST", params=APICodec.dumps(payload))
         return resp
 
     """
@@ -943,7 +1067,7 @@ class CommonCapellaAPI(APIRequests):
     def schedule_cluster_maintenance(self, payload):
         url = "{}/internal/support/maintenance/schedules".format(
             self.internal_url)
-        resp = self._urllib_request(url, "POST", params=json.dumps(payload),
+        resp = self._urllib_request(url, "POST", params=APICodec.dumps(payload),
                                     headers=self.cbc_api_request_headers)
         return resp
 
@@ -1,16 +1,36 @@
 # -*- coding: utf-8 -*-
 # Generic/Built-in
 import base64
-import json
+from ..lib import APICodec
 
 from ..common.CapellaAPI import CommonCapellaAPI
+from ..lib.APIDeadline import deadline
+from ..lib.APINameIndex import NameIndex
 
 
 class CapellaAPI(CommonCapellaAPI):
 
+    # NameIndex used by the get_*_id helpers, see enable_name_index
+    name_index = None
+
     def set_logging_level(self, level):
         self._log.setLevel(level)
 
+    def enable_name_index(self, ttl=300, miss_max_age=5):
+        """
+        Keeps the /v3/clusters listing and the bucket listings used by get_tenant_id, get_project_id,
+        get_cluster_id and get_bucket_id in memory for ttl seconds, so repeated lookups do not download
+        them again. Names that are not found reload listings older than miss_max_age seconds.
+        :param ttl:
+        :param miss_max_age:
+        :return: the NameIndex
+        """
+        self.name_index = NameIndex(ttl, miss_max_age)
+        return self.name_index
+
+    def disable_name_index(self):
+        self.name_index = None
+
     # Cluster methods
     def get_clusters(self, params=None):
         api_response = self.api_get('/v3/clusters', params)
@@ -56,7 +76,7 @@ class CapellaAPI(CommonCapellaAPI):
                 # We use response.text as this is a string
                 # response.content is in bytes which we use for json.loads
                 if len(api_response.text) > 0:
-                    response_dict = api_response.json()['place']
+                    response_dict = APICodec.response_json(api_response)['place']
 
         # return just the servers bit
         return (response_dict)
@@ -151,7 +171,7 @@ class CapellaAPI(CommonCapellaAPI):
                    "durabilityLevel": "none", "timeToLive": None}
         default.update(bucket_params)
         resp = self.do_internal_request(url, method="POST",
-                                    params=json.dumps(default))
+                                    params=APICodec.dumps(default))
         return resp
 
     def get_buckets(self, tenant_id, project_id, cluster_id):
@@ -181,7 +201,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = "{}/v2/organizations/{}/projects/{}/clusters/{}/buckets/{}" \
             .format(self.internal_url, tenant_id, project_id,
                     cluster_id, bucket_id)
-        resp = self.do_internal_request(url, method="PUT", params=json.dumps(bucket_params))
+        resp = self.do_internal_request(url, method="PUT", params=APICodec.dumps(bucket_params))
         return resp
 
     def get_cluster_specs(self, tenant_id, project_id, cluster_id):
@@ -236,25 +256,29 @@ class CapellaAPI(CommonCapellaAPI):
                 "permissions": {"data_reader": {}, "data_writer": {}}}
         url = '{}/users'.format(url)
         resp = self.do_internal_request(url, method="POST",
-                                    params=json.dumps(body))
+                                    params=APICodec.dumps(body))
         return resp
 
-    def allow_my_ip(self, tenant_id, project_id, cluster_id, all=False):
+    def allow_my_ip(self, tenant_id, project_id, cluster_id, all=False,
+                    timeout=None):
+        # timeout, in seconds, bounds the public IP lookup and the
+        # allowlist call together
         url = '{}/v2/organizations/{}/projects/{}/clusters/{}'\
             .format(self.internal_url, tenant_id, project_id, cluster_id)
         body = dict()
-        if all:
-            body = {"create": [{"cidr": "0.0.0.0/0",
-                                "comment": ""}]}
-        else:
-            resp = self._urllib_request("https://ifconfig.me", method="GET")
-            if resp.status_code != 200:
-                raise Exception("Fetch public IP failed!")
-            body = {"create": [{"cidr": "{}/32".format(resp.content.decode()),
-                                "comment": ""}]}
-        url = '{}/allowlists-bulk'.format(url)
-        resp = self.do_internal_request(url, method="POST",
-                                    params=json.dumps(body))
+        with deadline(timeout):
+            if all:
+                body = {"create": [{"cidr": "0.0.0.0/0",
+                                    "comment": ""}]}
+            else:
+                resp = self._urllib_request("https://ifconfig.me", method="GET")
+                if resp.status_code != 200:
+                    raise Exception("Fetch public IP failed!")
+                body = {"create": [{"cidr": "{}/32".format(resp.content.decode()),
+                                    "comment": ""}]}
+            url = '{}/allowlists-bulk'.format(url)
+            resp = self.do_internal_request(url, method="POST",
+                                        params=APICodec.dumps(body))
         return resp
 
     def enable_data_api(self, cluster_id):
@@ -265,7 +289,7 @@ class CapellaAPI(CommonCapellaAPI):
         data = {
             "enabled": True
         }
-        resp = self._urllib_request(url, "PUT", params=json.dumps(data),
+        resp = self._urllib_request(url, "PUT", params=APICodec.dumps(data),
                                     headers=self.cbc_api_request_headers)
         return resp
 
@@ -279,7 +303,7 @@ class CapellaAPI(CommonCapellaAPI):
         }
         url = '{}/allowlists-bulk'.format(url)
         resp = self.do_internal_request(url, method="POST",
-                                    params=json.dumps(body))
+                                    params=APICodec.dumps(body))
         return resp
 
     def load_sample_bucket(self, tenant_id, project_id, cluster_id,
@@ -288,7 +312,7 @@ class CapellaAPI(CommonCapellaAPI):
               .format(self.internal_url, tenant_id, project_id, cluster_id)
         param = {'name': bucket_name}
         resp = self.do_internal_request(url, method="POST",
-                                    params=json.dumps(param))
+                                    params=APICodec.dumps(param))
         return resp
 
     def configure_autoscaling(self, cluster_id, config):
@@ -301,7 +325,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = "{}/internal/support/clusters/{}/auto-scaling-config"\
             .format(self.internal_url, cluster_id)
         resp = self._urllib_request(url, method="PUT",
-                                    params=json.dumps(config),
+                                    params=APICodec.dumps(config),
                                     headers=self.cbc_api_request_headers)
         return resp
 
@@ -310,7 +334,7 @@ class CapellaAPI(CommonCapellaAPI):
               .format(self.internal_url, cluster_id)
         param = {'hash': version_hash}
         resp = self._urllib_request(url, method="POST",
-                                    params=json.dumps(param),
+                                    params=APICodec.dumps(param),
                                     headers=self.cbc_api_request_headers)
         return resp
 
@@ -373,7 +397,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = '{}/v2/organizations/{}/clusters'.format(
             self.internal_url, tenant_id)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def create_cluster_customAMI(self, tenant_id, config):
@@ -400,7 +424,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = '{}/v2/organizations/{}/clusters/deploy'.format(
             self.internal_url, tenant_id)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def upgrade_cluster(self, tenant_id, project_id, cluster_id, config):
@@ -416,7 +440,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = '{}/v2/organizations/{}/projects/{}/clusters/{}/version'.format(
             self.internal_url, tenant_id, project_id, cluster_id)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def get_deployment_options(self, tenant_id, provider='aws'):
@@ -444,7 +468,7 @@ class CapellaAPI(CommonCapellaAPI):
                                                   function_scope["scope"])
 
         resp = self.do_internal_request(url, method="POST",
-                                    params=json.dumps(body))
+                                    params=APICodec.dumps(body))
         return resp
 
     def __set_eventing_function_settings(self, cluster_id, name, body, function_scope=None):
@@ -455,7 +479,7 @@ class CapellaAPI(CommonCapellaAPI):
                                                   function_scope["scope"])
 
         resp = self.do_internal_request(url, method="POST",
-                                    params=json.dumps(body))
+                                    params=APICodec.dumps(body))
         return resp
 
     def pause_eventing_function(self, cluster_id, name, function_scope=None):
@@ -515,7 +539,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = "{}/v2/organizations/{}/projects/{}/clusters/{}/virtualnetworks"\
               .format(self.internal_url, tenant_id, project_id, cluster_id)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(private_network_params))
+                                        params=APICodec.dumps(private_network_params))
         return resp
 
     def get_private_network(self, tenant_id, project_id, cluster_id,
@@ -529,16 +553,19 @@ class CapellaAPI(CommonCapellaAPI):
         url = "{}/v2/organizations/{}/projects/{}/clusters/{}/specs"\
                 .format(self.internal_url, tenant_id, project_id, cluster_id)
         resp = self.do_internal_request(url, method="POST",
-                                    params=json.dumps(specs))
+                                    params=APICodec.dumps(specs))
         return resp
 
-    def restore_from_backup(self, tenant_id, project_id, cluster_id, bucket_name):
+    def restore_from_backup(self, tenant_id, project_id, cluster_id, bucket_name,
+                            timeout=None):
         """
         method used to restore from the backup
         :param tenant_id:
         :param project_id:
         :param cluster_id:
         :param bucket_name:
+        :param timeout: seconds the backup lookup and the restore call
+        have, together, to complete in
         :return: response object
         """
         payload = {"sourceClusterId": cluster_id,
@@ -546,41 +573,72 @@ class CapellaAPI(CommonCapellaAPI):
                    "options": {"services": ["data", "query", "index", "search"], "filterKeys": "", "filterValues": "",
                                "mapData": "", "includeData": "", "excludeData": "", "autoCreateBuckets": True,
                                "autoRemoveCollections": True, "forceUpdates": True}}
-        bucket_id = self.get_backups_bucket_id(tenant_id=tenant_id,
-                                               project_id=project_id,
-                                               cluster_id=cluster_id,
-                                               bucket_name=bucket_name)
-        url = r"{}/v2/organizations/{}/projects/{}/clusters/{}/buckets/{}/restore" \
-            .format(self.internal_url, tenant_id, project_id, cluster_id, bucket_id)
-        resp = self.do_internal_request(url, method="POST", params=json.dumps(payload))
+        with deadline(timeout):
+            bucket_id = self.get_backups_bucket_id(tenant_id=tenant_id,
+                                                   project_id=project_id,
+                                                   cluster_id=cluster_id,
+                                                   bucket_name=bucket_name)
+            url = r"{}/v2/organizations/{}/projects/{}/clusters/{}/buckets/{}/restore" \
+                .format(self.internal_url, tenant_id, project_id, cluster_id, bucket_id)
+            resp = self.do_internal_request(url, method="POST", params=APICodec.dumps(payload))
         return resp
 
     def get_cluster_id(self, cluster_name):
         return self._get_meta_data(cluster_name=cluster_name)['id']
 
-    def get_bucket_id(self, cluster_name, project_name, bucket_name):
-        tenant_id, project_id, cluster_id = self.get_tenant_id(), self.get_project_id(
-            project_name), self.get_cluster_id(cluster_name=cluster_name)
+    def get_bucket_id(self, cluster_name, project_name, bucket_name,
+                      timeout=None):
+        # timeout, in seconds, bounds all the lookups it takes together
+        with deadline(timeout):
+            tenant_id, project_id, cluster_id = self.get_tenant_id(), self.get_project_id(
+                project_name), self.get_cluster_id(cluster_name=cluster_name)
+            if self.name_index is not None:
+                return self.name_index.lookup(
+                    ("buckets", tenant_id, project_id, cluster_id),
+                    lambda: self._load_bucket_index(tenant_id, project_id, cluster_id),
+                    bucket_name)
+            buckets = self._list_buckets(tenant_id, project_id, cluster_id)
+            for bucket in buckets:
+                if bucket['data']['name'] == bucket_name:
+                    return bucket['data']['id']
+
+    def _list_buckets(self, tenant_id, project_id, cluster_id):
         resp = self.get_buckets(tenant_id, project_id, cluster_id)
         if resp.status_code != 200:
             raise Exception("Response when trying to fetch buckets.")
-        buckets = json.loads(resp.content)['buckets']['data']
-        for bucket in buckets:
-            if bucket['data']['name'] == bucket_name:
-                return bucket['data']['id']
+        return APICodec.loads(resp.content)['buckets']['data']
+
+    def _load_bucket_index(self, tenant_id, project_id, cluster_id):
+        buckets = {}
+        for bucket in self._list_buckets(tenant_id, project_id, cluster_id):
+            buckets.setdefault(bucket['data']['name'], bucket['data']['id'])
+        return buckets
 
     def get_tenant_id(self):
-        return json.loads(self.get_clusters().content)['data']['tenantId']
+        if self.name_index is not None:
+            return self.name_index.get("clusters", self._load_cluster_index)['tenantId']
+        return APICodec.loads(self.get_clusters().content)['data']['tenantId']
 
     def get_project_id(self, cluster_name):
         return self._get_meta_data(cluster_name=cluster_name)['projectId']
 
     def _get_meta_data(self, cluster_name):
-        all_clusters = json.loads(self.get_clusters().content)['data']
+        if self.name_index is not None:
+            return self.name_index.lookup(
+                "clusters", self._load_cluster_index, cluster_name, section='clusters')
+        all_clusters = APICodec.loads(self.get_clusters().content)['data']
         for cluster in all_clusters['items']:
             if cluster['name'] == cluster_name:
                 return cluster
 
+    def _load_cluster_index(self):
+        all_clusters = APICodec.loads(self.get_clusters().content)['data']
+        clusters = {}
+        for cluster in all_clusters['items']:
+            # The first cluster with a given name wins, as in the linear scan
+            clusters.setdefault(cluster['name'], cluster)
+        return {'tenantId': all_clusters['tenantId'], 'clusters': clusters}
+
     def get_restores(self, tenant_id, project_id, cluster_id, bucket_name):
         """
         method used to obtain list of restores of a given bucket.
@@ -624,7 +682,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = "{}/v2/organizations/{}/projects/{}/clusters/{}/backups".format(
             self.internal_url, tenant_id, project_id, cluster_id)
         resp = self.do_internal_request(url, method="GET").content
-        for bucket in json.loads(resp)['data']:
+        for bucket in APICodec.loads(resp)['data']:
             if bucket['data']['bucket'] == bucket_name:
                 return bucket['data']['bucketId']
 
@@ -640,7 +698,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = "{}/v2/organizations/{}/projects/{}/clusters/backup-image".format(
             self.internal_url, tenant_id, project_id, cluster_id)
         payload = {"image": backup_ami}
-        resp = self.do_internal_request(url, method="POST", params=json.dumps(payload))
+        resp = self.do_internal_request(url, method="POST", params=APICodec.dumps(payload))
         return resp
 
     def backup_now(self, tenant_id, project_id, cluster_id, bucket_name):
@@ -655,7 +713,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = "{}/v2/organizations/{}/projects/{}/clusters/{}/backup".format(
             self.internal_url, tenant_id, project_id, cluster_id)
         payload = {"bucket": bucket_name}
-        resp = self.do_internal_request(url, method="POST", params=json.dumps(payload))
+        resp = self.do_internal_request(url, method="POST", params=APICodec.dumps(payload))
         return resp
 
     def list_all_bucket_backups(self, tenant_id, project_id, cluster_id, bucket_id):
@@ -702,7 +760,8 @@ class CapellaAPI(CommonCapellaAPI):
 
     def generate_export_link(self, tenant_id, project_id, cluster_id, export_id):
         """
-        method to generate a pre-signed link for the given export
+        method to generate a pre-signed link for the given export, the export itself can be
+        fetched from the link with stream_download
         :param tenant_id:
         :param project_id:
         :param cluster_id:
@@ -725,7 +784,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = "{}/v2/organizations/{}/users" \
             .format(self.internal_url, tenant_id)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def invite_new_user_with_config(self, tenant_id, config):
@@ -733,7 +792,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = "{}/v2/organizations/{}/users" \
             .format(self.internal_url, tenant_id)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def fetch_all_invitations(self):
@@ -755,7 +814,7 @@ class CapellaAPI(CommonCapellaAPI):
         """
         url = "{}/invitations/{}".format(self.internal_url, invitation_id)
         resp = self.do_internal_request(url, method="PUT",
-                                        params=json.dumps({"action": action}))
+                                        params=APICodec.dumps({"action": action}))
         return resp
 
     def verify_email(self, token):
@@ -816,7 +875,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = "{}/v2/organizations/{}/projects/{}/clusters/{}/xdcr"\
               .format(self.internal_url, tenant_id, project_id, cluster_id)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(payload))
+                                        params=APICodec.dumps(payload))
         return resp
 
     def list_cluster_replications(self, tenant_id, project_id, cluster_id):
@@ -885,7 +944,7 @@ class CapellaAPI(CommonCapellaAPI):
         """
         url = '{}/v2/organizations/{}/backends'.format(self.internal_url, tenant_id)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def get_sgw_backend(self, tenant_id, project_id, cluster_id, backend_id):
@@ -922,7 +981,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = '{}/v2/organizations/{}/projects/{}/clusters/{}/backends/{}/databases' \
               .format(self.internal_url, tenant_id, project_id, cluster_id, backend_id)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def get_sgw_databases(self, tenant_id, project_id, cluster_id, backend_id):
@@ -937,7 +996,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = '{}/v2/organizations/{}/projects/{}/clusters/{}/backends/{}/databases/{}' \
               .format(self.internal_url, tenant_id, project_id, cluster_id, backend_id, db_name)
         resp = self.do_internal_request(url, method="PUT",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def resume_sgw_database(self, tenant_id, project_id, cluster_id, backend_id, db_name):
@@ -962,7 +1021,7 @@ class CapellaAPI(CommonCapellaAPI):
             raise Exception("Fetch public IP failed!")
         body = {"cidr": "{}/32".format(resp.content.decode()), "comment": ""}
         resp = self.do_internal_request(url, method="POST",
-                                    params=json.dumps(body))
+                                    params=APICodec.dumps(body))
         return resp
 
     def add_allowed_ip_sgw(self, tenant_id, project_id, cluster_id, backend_id, ip):
@@ -970,35 +1029,35 @@ class CapellaAPI(CommonCapellaAPI):
             .format(self.internal_url, tenant_id, project_id, backend_id, cluster_id)
         body = {"cidr": "{}/32".format(ip), "comment": ""}
         resp = self.do_internal_request(url, method="POST",
-                                    params=json.dumps(body))
+                                    params=APICodec.dumps(body))
         return resp
 
     def update_sync_function_sgw(self, tenant_id, project_id, cluster_id, backend_id, db_name, config):
         url = '{}/v2/organizations/{}/projects/{}/clusters/{}/backends/{}/databases/{}/sync' \
               .format(self.internal_url, tenant_id, project_id, cluster_id, backend_id, db_name)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def add_app_role_sgw(self, tenant_id, project_id, cluster_id, backend_id, db_name, config):
         url = '{}/v2/organizations/{}/projects/{}/clusters/{}/backends/{}/databases/{}/roles' \
               .format(self.internal_url, tenant_id, project_id, cluster_id, backend_id, db_name)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def add_user_sgw(self, tenant_id, project_id, cluster_id, backend_id, db_name, config):
         url = '{}/v2/organizations/{}/projects/{}/clusters/{}/backends/{}/databases/{}/users' \
               .format(self.internal_url, tenant_id, project_id, cluster_id, backend_id, db_name)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def add_admin_user_sgw(self, tenant_id, project_id, cluster_id, backend_id, config):
         url = '{}/v2/organizations/{}/projects/{}/clusters/{}/backends/{}/adminusers' \
               .format(self.internal_url, tenant_id, project_id, cluster_id, backend_id)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def get_sgw_links(self, tenant_id, project_id, cluster_id, backend_id, db_name):
@@ -1044,7 +1103,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = '{}/v2/organizations/{}/projects/{}/clusters/{}/backends/{}/logstreaming/config' \
               .format(self.internal_url, tenant_id, project_id, cluster_id, backend_id)
         resp = self.do_internal_request(url, method="PUT",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def delete_log_streaming_config(self, tenant_id, project_id, cluster_id, backend_id):
@@ -1087,7 +1146,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = '{}/v2/organizations/{}/projects/{}/clusters/{}/backends/{}/databases/{}/logging' \
               .format(self.internal_url, tenant_id, project_id, cluster_id, backend_id, db_name)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def sgw_enable_audit_logging(self, tenant_id, project_id, cluster_id, backend_id):
@@ -1116,7 +1175,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = '{}/v2/organizations/{}/projects/{}/clusters/{}/backends/{}/audit-logging/{}/config' \
               .format(self.internal_url, tenant_id, project_id, cluster_id, backend_id, db_name)
         resp = self.do_internal_request(url, method="PUT",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def sgw_update_audit_logging_config(self, tenant_id, project_id, cluster_id, backend_id, db_name, config):
@@ -1124,7 +1183,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = '{}/v2/organizations/{}/projects/{}/clusters/{}/backends/{}/audit-logging/{}/config' \
               .format(self.internal_url, tenant_id, project_id, cluster_id, backend_id, db_name)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def sgw_get_audit_logging_config(self, tenant_id, project_id, cluster_id, backend_id, db_name):
@@ -1146,7 +1205,7 @@ class CapellaAPI(CommonCapellaAPI):
 
         url = '{}/v2/organizations/{}/projects'.format(self.internal_url, tenant_id)
         api_response = self.do_internal_request(url, method="POST",
-                                                        params=json.dumps(project_details))
+                                                        params=APICodec.dumps(project_details))
         return api_response
 
     def delete_project(self, tenant_id, project_id):
@@ -1166,7 +1225,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = '{}/v2/organizations/{}/projects/{}/clusters/{}/on' \
             .format(self.internal_url, tenant_id, project_id, cluster_id)
         payload = {"turnOnAppService" : True}
-        resp = self.do_internal_request(url, method="POST", params=json.dumps(payload))
+        resp = self.do_internal_request(url, method="POST", params=APICodec.dumps(payload))
         return resp
 
     def enable_private_endpoint(self, tenant_id, project_id, cluster_id):
@@ -1197,7 +1256,7 @@ class CapellaAPI(CommonCapellaAPI):
         """
         url = '{}/v2/organizations/{}/projects/{}/clusters/{}/privateendpoint/linkcommand' \
             .format(self.internal_url, tenant_id, project_id, cluster_id)
-        resp = self.do_internal_request(url, method="POST", params=json.dumps(body))
+        resp = self.do_internal_request(url, method="POST", params=APICodec.dumps(body))
         return resp
 
     def accept_gcp_private_endpoint_connection(self, tenant_id, project_id, cluster_id, body):
@@ -1209,7 +1268,7 @@ class CapellaAPI(CommonCapellaAPI):
         """
         url = '{}/v2/organizations/{}/projects/{}/clusters/{}/privateendpoint/connection' \
             .format(self.internal_url, tenant_id, project_id, cluster_id)
-        resp = self.do_internal_request(url, method="POST", params=json.dumps(body))
+        resp = self.do_internal_request(url, method="POST", params=APICodec.dumps(body))
         return resp
 
     def list_private_endpoint_connections(self, tenant_id, project_id, cluster_id):
@@ -1228,7 +1287,7 @@ class CapellaAPI(CommonCapellaAPI):
     def update_cluster_sepcs(self, tenant_id, project_id, cluster_id, specs):
         url = '{}/v2/organizations/{}/projects/{}/clusters/{}/specs' \
             .format(self.internal_url, tenant_id, project_id, cluster_id)
-        resp = self.do_internal_request(url, method="POST", params=json.dumps(specs))
+        resp = self.do_internal_request(url, method="POST", params=APICodec.dumps(specs))
         return resp
 
     def get_root_ca(self, cluster_id):
@@ -1243,7 +1302,7 @@ class CapellaAPI(CommonCapellaAPI):
             .format(self.internal_url, tenant_id, project_id, cluster_id)
         payload = {"deletionProtection": deletion_protection}
         resp = self.do_internal_request(url, method="PATCH",
-                                        params=json.dumps(payload))
+                                        params=APICodec.dumps(payload))
         return resp
 
     def get_unique_cidr(self, tenant_id):
@@ -1254,7 +1313,7 @@ class CapellaAPI(CommonCapellaAPI):
 
     def deploy_v2_cluster(self, tenant_id, payload):
         url = '{}/v2/organizations/{}/clusters/v2'.format(self.internal_url, tenant_id)
-        resp = self.do_internal_request(url, method="POST", params=json.dumps(payload))
+        resp = self.do_internal_request(url, method="POST", params=APICodec.dumps(payload))
         return resp
 
     def list_global_feature_flags(self):
@@ -1290,14 +1349,14 @@ class CapellaAPI(CommonCapellaAPI):
     def create_global_feature_flag(self, flag_name, payload):
         url = "{}/internal/support/features/flags/{}".format(self.internal_url, flag_name)
         resp = self._urllib_request(url, method="POST",
-                                    params=json.dumps(payload),
+                                    params=APICodec.dumps(payload),
                                     headers=self.cbc_api_request_headers)
         return resp
 
     def update_global_feature_flag(self, flag_name, payload):
         url = "{}/internal/support/features/flags/{}".format(self.internal_url, flag_name)
         resp = self._urllib_request(url, method="PUT",
-                                    params=json.dumps(payload),
+                                    params=APICodec.dumps(payload),
                                     headers=self.cbc_api_request_headers)
         return resp
 
@@ -1322,14 +1381,14 @@ class CapellaAPI(CommonCapellaAPI):
     def create_tenant_feature_flag(self, tenant_id, flag_name, payload):
         url = "{}/internal/support/features/{}/flags/{}".format(self.internal_url, tenant_id, flag_name)
         resp = self._urllib_request(url, method="POST",
-                                    params=json.dumps(payload),
+                                    params=APICodec.dumps(payload),
                                     headers=self.cbc_api_request_headers)
         return resp
 
     def update_tenant_feature_flag(self, tenant_id, flag_name, payload):
         url = "{}/internal/support/features/{}/flags/{}".format(self.internal_url, tenant_id, flag_name)
         resp = self._urllib_request(url, method="PUT",
-                                    params=json.dumps(payload),
+                                    params=APICodec.dumps(payload),
                                     headers=self.cbc_api_request_headers)
         return resp
 
@@ -1379,7 +1438,7 @@ class CapellaAPI(CommonCapellaAPI):
             }
         """
         url = "{}/v2/organizations/{}/integrations".format(self.internal_url, tenant_id)
-        resp = self.do_internal_request(url, method="POST", params=json.dumps(payload))
+        resp = self.do_internal_request(url, method="POST", params=APICodec.dumps(payload))
         return resp
 
     def get_autovec_integration(self, tenant_id, integration_id):
@@ -1422,7 +1481,7 @@ class CapellaAPI(CommonCapellaAPI):
             No content
         """
         url = "{}/v2/organizations/{}/integrations/{}".format(self.internal_url, tenant_id, integration_id)
-        resp = self.do_internal_request(url, method="PUT", params=json.dumps(payload))
+        resp = self.do_internal_request(url, method="PUT", params=APICodec.dumps(payload))
         return resp
 
     def list_autovec_integrations(self, tenant_id, integration_type=None, page=1, per_page=25):
@@ -1554,7 +1613,7 @@ class CapellaAPI(CommonCapellaAPI):
         """
         url = "{}/v2/organizations/{}/projects/{}/clusters/{}/ai/workflows".format(self.internal_url, tenant_id,
                                                                                    project_id, cluster_id)
-        resp = self.do_internal_request(url, method="POST", params=json.dumps(payload))
+        resp = self.do_internal_request(url, method="POST", params=APICodec.dumps(payload))
         return resp
 
     def get_autovec_workflow(self, tenant_id, project_id, cluster_id, workflow_id):
@@ -1684,7 +1743,7 @@ class CapellaAPI(CommonCapellaAPI):
     def update_health_advisor_settings(self, tenant_id, project_id, cluster_id, payload=None):
         url = '{}/v2/organizations/{}/projects/{}/clusters/{}/health-advisor/settings'.format(
             self.internal_url, tenant_id, project_id, cluster_id)
-        resp = self.do_internal_request(url, method="PATCH", params=json.loads(payload))
+        resp = self.do_internal_request(url, method="PATCH", params=APICodec.loads(payload))
         return resp
 
     def get_info_health_report(self, tenant_id, project_id, cluster_id, report_id):
@@ -1700,16 +1759,29 @@ class CapellaAPI(CommonCapellaAPI):
         resp = self.do_internal_request(url, method="GET")
         return resp
 
+    def download_pdf_health_report(self, tenant_id, project_id, cluster_id, report_id,
+                                   destination, **kwargs):
+        """
+        Streams the pdf health report to destination instead of loading it in memory.
+        :param destination: file path or writable binary file object
+        :param kwargs: see APIRequests.stream_download
+        :return: number of bytes written
+        """
+        url = '{}/v2/organizations/{}/projects/{}/clusters/{}/health-advisor/{}/pdf'.format(
+                self.internal_url, tenant_id, project_id, cluster_id, report_id)
+        return self.stream_download(url, destination,
+                                    headers=self.get_authorization_internal(), **kwargs)
+
     def upload_cert_mtls(self, tenant_id, project_id, cluster_id, payload):
         url = '{}/v2/organizations/{}/projects/{}/clusters/{}/mtls'.format(
             self.internal_url, tenant_id, project_id, cluster_id)
-        resp = self.do_internal_request(url, method="POST", params=json.dumps(payload))
+        resp = self.do_internal_request(url, method="POST", params=APICodec.dumps(payload))
         return resp
 
     def upload_mtls_settings(self, tenant_id, project_id, cluster_id, payload):
         url = '{}/v2/organizations/{}/projects/{}/clusters/{}/mtls'.format(
             self.internal_url, tenant_id, project_id, cluster_id)
-        resp = self.do_internal_request(url, method="PUT", params=json.dumps(payload))
+        resp = self.do_internal_request(url, method="PUT", params=APICodec.dumps(payload))
         return resp
 
     def get_mtls_details(self, tenant_id, project_id, cluster_id):
@@ -1746,7 +1818,7 @@ class CapellaAPI(CommonCapellaAPI):
         """
         url = "{}/v2/organizations/{}/projects/{}/clusters/{}/languagemodels".format(self.internal_url, tenant_id,
                                                                                      project_id, cluster_id)
-        resp = self.do_internal_request(url, method="POST", params=json.dumps(payload))
+        resp = self.do_internal_request(url, method="POST", params=APICodec.dumps(payload))
         return resp
 
     def delete_model(self, tenant_id, project_id, cluster_id, model_id):
@@ -3,17 +3,18 @@
 import base64
 import logging
 
-import json
+from ..lib import APICodec
 
 from ..lib.APIRequests import APIRequests
+from ..lib.APIAsyncRequests import AsyncAPIRequests
 from ..common.CapellaAPI_v4 import CommonCapellaAPI
 
 
 class ClusterOperationsAPIs(APIRequests):
 
-    def __init__(self, url, secret, access, bearer_token):
+    def __init__(self, url, secret, access, bearer_token, transport=None):
         super(ClusterOperationsAPIs, self).__init__(
-            url, secret, access, bearer_token)
+            url, secret, access, bearer_token, transport=transport)
         self.cluster_ops_API_log = logging.getLogger(__name__)
         organization_endpoint = "/v4/organizations"
         self.cluster_endpoint = organization_endpoint + "/{}/projects/{}/clusters"
@@ -97,8 +98,8 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Fetching details for free-tier cluster: {}, inside project: {}, "
-            "inside tenant: {}".format(organizationId, projectId, clusterId))
+            "Fetching details for free-tier cluster: %s, inside project: %s, "
+            "inside tenant: %s", organizationId, projectId, clusterId)
         if kwargs:
             params = kwargs
         else:
@@ -136,8 +137,8 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Creating cluster inside project: {}, inside tenant: {}".format(
-                projectId, organizationId))
+            "Creating cluster inside project: %s, inside tenant: %s",
+            projectId, organizationId)
         params = {
             "name": name,
             "cloudProvider": cloudProvider,
@@ -172,8 +173,8 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Deleting free-tier cluster: {}, in project: {}, in tenant: {}"
-            .format(clusterId, projectId, organizationId))
+            "Deleting free-tier cluster: %s, in project: %s, in tenant: %s",
+            clusterId, projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -210,8 +211,8 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Creating cluster inside project: {}, inside tenant: {}".format(
-                projectId, organizationId))
+            "Creating cluster inside project: %s, inside tenant: %s",
+            projectId, organizationId)
         params = {
             "name": name,
             "description": description
@@ -249,8 +250,8 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Turning on Free Tier Cluster: {}, inside Project: {}, inside Org:"
-            " {}".format(clusterId, projectId, organizationId))
+            "Turning on Free Tier Cluster: %s, inside Project: %s, inside Org:"
+            " %s", clusterId, projectId, organizationId)
 
         params = {
             "turnOnLinkedAppService": turnOnLinkedAppService
@@ -285,8 +286,8 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Turning on Free Tier Cluster: {}, inside Project: {}, inside Org:"
-            " {}".format(clusterId, projectId, organizationId))
+            "Turning on Free Tier Cluster: %s, inside Project: %s, inside Org:"
+            " %s", clusterId, projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -323,9 +324,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Creating a free tier app service inside cluster: {}, inside "
-            "project: {}, inside org: {}".format(clusterId, projectId,
-                                                 organizationId))
+            "Creating a free tier app service inside cluster: %s, inside "
+            "project: %s, inside org: %s",
+            clusterId, projectId, organizationId)
         params = {
             "name": name,
             "description": description
@@ -366,9 +367,8 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Updating app service: {}, linked to cluster: {}, inside project: "
-            "{}, inside Org: {}".format(appId, clusterId, projectId,
-                                        organizationId))
+            "Updating app service: %s, linked to cluster: %s, inside project: "
+            "%s, inside Org: %s", appId, clusterId, projectId, organizationId)
         params = {
             "name": name,
             "description": description
@@ -407,9 +407,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Fetching info for app service: {}, linked to cluster: {}, inside "
-            "project: {}, inside Org: {}".format(appId, clusterId,
-                                                 projectId, organizationId))
+            "Fetching info for app service: %s, linked to cluster: %s, inside "
+            "project: %s, inside Org: %s",
+            appId, clusterId, projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -445,9 +445,8 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Deleting the AppSvc: {}, inside cluster: {}, inside project: {}, "
-            "inside Org: {}".format(appId, clusterId, projectId,
-                                    organizationId))
+            "Deleting the AppSvc: %s, inside cluster: %s, inside project: %s, "
+            "inside Org: %s", appId, clusterId, projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -484,9 +483,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Creating a bucket inside free tier cluster: {}, inside "
-            "project: {}, inside tenant: {}".format(clusterId, projectId,
-                                                    organizationId))
+            "Creating a bucket inside free tier cluster: %s, inside "
+            "project: %s, inside tenant: %s",
+            clusterId, projectId, organizationId)
         params = {
             "name": name,
             "memoryAllocationInMb": memoryAllocationInMb,
@@ -522,9 +521,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Deleting bucket: {}, inside cluster: {}, inside project: {}, "
-            "inside tenant: {}".format(bucketId, clusterId, projectId,
-                                       organizationId))
+            "Deleting bucket: %s, inside cluster: %s, inside project: %s, "
+            "inside tenant: %s",
+            bucketId, clusterId, projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -559,9 +558,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Fetching bucket: {}, inside cluster: {}, inside project: {}, "
-            "inside tenant: {}".format(bucketId, clusterId, projectId,
-                                       organizationId))
+            "Fetching bucket: %s, inside cluster: %s, inside project: %s, "
+            "inside tenant: %s",
+            bucketId, clusterId, projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -598,9 +597,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Fetching bucket: {}, inside cluster: {}, inside project: {}, "
-            "inside tenant: {}".format(bucketId, clusterId, projectId,
-                                       organizationId))
+            "Fetching bucket: %s, inside cluster: %s, inside project: %s, "
+            "inside tenant: %s",
+            bucketId, clusterId, projectId, organizationId)
         params = {
             "memoryAllocationInMb": memoryAllocationInMb
         }
@@ -634,9 +633,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Creating a bucket inside free tier cluster: {}, inside "
-            "project: {}, inside tenant: {}".format(clusterId, projectId,
-                                                    organizationId))
+            "Creating a bucket inside free tier cluster: %s, inside "
+            "project: %s, inside tenant: %s",
+            clusterId, projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -680,9 +679,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Creating an App endpoint inside the App Service: {}, inside the "
-            "Cluster: {}, inside the Project: {}, inside the tenant: {}"
-            .format(appServiceId, clusterId, projectId, organizationId))
+            "Creating an App endpoint inside the App Service: %s, inside the "
+            "Cluster: %s, inside the Project: %s, inside the tenant: %s",
+            appServiceId, clusterId, projectId, organizationId)
         params = {
             "name": name,
             "deltaSyncEnabled": deltaSyncEnabled,
@@ -724,10 +723,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Fetching details for app Endpoint: {}, linked to App Svc: {}, "
-            "inside Cluster: {}, inside Project: {}, inside tenant: {}".format(
-                appEndpointName, appServiceId, clusterId, projectId,
-                organizationId))
+            "Fetching details for app Endpoint: %s, linked to App Svc: %s, "
+            "inside Cluster: %s, inside Project: %s, inside tenant: %s",
+            appEndpointName, appServiceId, clusterId, projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -764,10 +762,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Deleting  app Endpoint: {}, linked to App Svc: {}, inside "
-            "Cluster: {}, inside Project: {}, inside tenant: {}".format(
-                appEndpointName, appServiceId, clusterId, projectId,
-                organizationId))
+            "Deleting  app Endpoint: %s, linked to App Svc: %s, inside "
+            "Cluster: %s, inside Project: %s, inside tenant: %s",
+            appEndpointName, appServiceId, clusterId, projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -812,9 +809,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Listing App Endpoints in App Service: {}, inside cluster: {}, "
-            "inside project: {}, inside tenant: {}".format(
-                appServiceId, clusterId, projectId, organizationId))
+            "Listing App Endpoints in App Service: %s, inside cluster: %s, "
+            "inside project: %s, inside tenant: %s",
+            appServiceId, clusterId, projectId, organizationId)
         params = {}
         if page:
             params["page"] = page
@@ -832,6 +829,37 @@ class ClusterOperationsAPIs(APIRequests):
             params, headers)
         return resp
 
+    """
+    Generator version of list_app_endpoints, follows cursor.pages and yields the
+    listed items one at a time. Pages are only fetched as they are consumed.
+    :param perPage (int) Sets how many results are fetched per page.
+    :param prefetch_workers (int) Fetch the pages after the first one concurrently, with this many workers.
+    Takes the same params as list_app_endpoints otherwise.
+    """
+
+    def iter_app_endpoints(
+            self,
+            organizationId,
+            projectId,
+            clusterId,
+            appServiceId,
+            perPage=None,
+            sortBy=None,
+            sortDirection=None,
+            headers=None,
+            **kwargs):
+        return self.iter_listing(
+            self.list_app_endpoints,
+            organizationId,
+            projectId,
+            clusterId,
+            appServiceId,
+            perPage=perPage,
+            sortBy=sortBy,
+            sortDirection=sortDirection,
+            headers=headers,
+            **kwargs)
+
     def list_app_endpoint_collections(
             self,
             organizationId,
@@ -865,12 +893,11 @@ class ClusterOperationsAPIs(APIRequests):
                    Error : message, hint, code, HttpStatusCode
                """
         self.cluster_ops_API_log.info(
-            "Listing Collections in App Endpoints {} in App Service: {}, "
+            "Listing Collections in App Endpoints %s in App Service: %s, "
             "inside "
-            "cluster: {}, "
-            "inside project: {}, inside tenant: {}".format(
-                appEndpointName, appServiceId, clusterId, projectId,
-                organizationId))
+            "cluster: %s, "
+            "inside project: %s, inside tenant: %s",
+            appEndpointName, appServiceId, clusterId, projectId, organizationId)
         params = {}
         if page:
             params["page"] = page
@@ -887,6 +914,37 @@ class ClusterOperationsAPIs(APIRequests):
             params, headers)
         return resp
 
+    """
+    Generator version of list_app_endpoint_collections, follows cursor.pages and yields the
+    listed items one at a time. Pages are only fetched as they are consumed.
+    :param perPage (int) Sets how many results are fetched per page.
+    :param prefetch_workers (int) Fetch the pages after the first one concurrently, with this many workers.
+    Takes the same params as list_app_endpoint_collections otherwise.
+    """
+
+    def iter_app_endpoint_collections(
+            self,
+            organizationId,
+            projectId,
+            clusterId,
+            appServiceId,
+            appEndpointName,
+            perPage=None,
+            sortDirection=None,
+            headers=None,
+            **kwargs):
+        return self.iter_listing(
+            self.list_app_endpoint_collections,
+            organizationId,
+            projectId,
+            clusterId,
+            appServiceId,
+            appEndpointName,
+            perPage=perPage,
+            sortDirection=sortDirection,
+            headers=headers,
+            **kwargs)
+
 
     def update_app_endpoint(
             self,
@@ -925,10 +983,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Updating App Endpoint: {}, linked to App Service: {}, inside "
-            "cluster: {}, inside project: {}, inside tenant: {}"
-            .format(appEndpointName, appServiceId, clusterId, projectId,
-                    organizationId))
+            "Updating App Endpoint: %s, linked to App Service: %s, inside "
+            "cluster: %s, inside project: %s, inside tenant: %s",
+            appEndpointName, appServiceId, clusterId, projectId, organizationId)
         params = {
             "name": name,
             "deltaSyncEnabled": deltaSyncEnabled,
@@ -970,10 +1027,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Turning on appEndpoint: {}, linked to appService: {}, inside "
-            "cluster: {}, inside project: {}, inside tenant: {}".format(
-                appEndpointName, appServiceId, clusterId, projectId,
-                organizationId))
+            "Turning on appEndpoint: %s, linked to appService: %s, inside "
+            "cluster: %s, inside project: %s, inside tenant: %s",
+            appEndpointName, appServiceId, clusterId, projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -1012,10 +1068,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Turning off appEndpoint: {}, linked to appService: {}, inside "
-            "cluster: {}, inside project: {}, inside tenant: {}".format(
-                appEndpointName, appServiceId, clusterId, projectId,
-                organizationId))
+            "Turning off appEndpoint: %s, linked to appService: %s, inside "
+            "cluster: %s, inside project: %s, inside tenant: %s",
+            appEndpointName, appServiceId, clusterId, projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -1051,10 +1106,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Deleting the accessFunction in appEndpointKeyspa {} in "
-            "appService {} in cluster {} in project {} in organization {}".format(
-                appEndpointKeyspace, appServiceId, clusterId, projectId,
-                organizationId))
+            "Deleting the accessFunction in appEndpointKeyspa %s in "
+            "appService %s in cluster %s in project %s in organization %s",
+            appEndpointKeyspace, appServiceId, clusterId, projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -1097,11 +1151,10 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Updating the access control function in appEndpointKeyspace {} "
-            "in appService: {} in cluster: {} in project: {} in "
-            "organization: {}".format(
-                appEndpointKeyspace, appServiceId, clusterId, projectId,
-                organizationId))
+            "Updating the access control function in appEndpointKeyspace %s "
+            "in appService: %s in cluster: %s in project: %s in "
+            "organization: %s",
+            appEndpointKeyspace, appServiceId, clusterId, projectId, organizationId)
         params = payload
         for k, v in kwargs.items():
             params[k] = v
@@ -1137,10 +1190,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Fetching access control function info for appEndpointKeyspace: {}"
-            " in appService: {} in cluster {} in project {} in organization {}"
-            .format(appEndpointKeyspace, appServiceId, clusterId, projectId,
-                    organizationId))
+            "Fetching access control function info for appEndpointKeyspace: %s"
+            " in appService: %s in cluster %s in project %s in organization %s",
+            appEndpointKeyspace, appServiceId, clusterId, projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -1178,10 +1230,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Fetching resync status for appEndpoint: {}, inside appService: "
-            "{}, linked to cluster: {}, inside project: {}, inside tenant: {}"
-            .format(appEndpointName, appServiceId, clusterId, projectId,
-                    organizationId))
+            "Fetching resync status for appEndpoint: %s, inside appService: "
+            "%s, linked to cluster: %s, inside project: %s, inside tenant: %s",
+            appEndpointName, appServiceId, clusterId, projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -1221,10 +1272,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Starting resync for appEndpoint: {}, inside appService: {}, "
-            "linked to cluster: {}, inside project: {}, inside tenant: {}"
-            .format(appEndpointName, appServiceId, clusterId, projectId,
-                    organizationId))
+            "Starting resync for appEndpoint: %s, inside appService: %s, "
+            "linked to cluster: %s, inside project: %s, inside tenant: %s",
+            appEndpointName, appServiceId, clusterId, projectId, organizationId)
         params = {
             "scopes": scopes,
         }
@@ -1262,10 +1312,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Stopping resync for appEndpoint: {}, inside appService: {}, "
-            "linked to cluster: {}, inside project: {}, inside tenant: {}"
-            .format(appEndpointName, appServiceId, clusterId, projectId,
-                    organizationId))
+            "Stopping resync for appEndpoint: %s, inside appService: %s, "
+            "linked to cluster: %s, inside project: %s, inside tenant: %s",
+            appEndpointName, appServiceId, clusterId, projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -1302,10 +1351,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Fetching the importFilter info in appEndpointKeyspace: {} in "
-            "appService: {} in cluster: {} in project: {} in tenant: {}"
-            .format(appEndpointKeyspace, appServiceId, clusterId, projectId,
-                    organizationId))
+            "Fetching the importFilter info in appEndpointKeyspace: %s in "
+            "appService: %s in cluster: %s in project: %s in tenant: %s",
+            appEndpointKeyspace, appServiceId, clusterId, projectId, organizationId)
 
         if kwargs:
             params = kwargs
@@ -1344,10 +1392,9 @@ class ClusterOperationsAPIs(APIRequests):
         """
 
         self.cluster_ops_API_log.info(
-            "Deleting the importFilter for appEndpointKeyspace: {} in "
-            "appService: {} in cluster:{} in project: {} in tenant: {}"
-            .format(appEndpointKeyspace, appServiceId, clusterId, projectId,
-                    organizationId))
+            "Deleting the importFilter for appEndpointKeyspace: %s in "
+            "appService: %s in cluster:%s in project: %s in tenant: %s",
+            appEndpointKeyspace, appServiceId, clusterId, projectId, organizationId)
 
         if kwargs:
             params = kwargs
@@ -1391,10 +1438,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Updating the importFilter in appEndpointKeyspace: {} in "
-            "appService: {} in cluster: {} in project: {} in tenant: {}"
-            .format(appEndpointKeyspace, appServiceId, clusterId, projectId,
-                    organizationId))
+            "Updating the importFilter in appEndpointKeyspace: %s in "
+            "appService: %s in cluster: %s in project: %s in tenant: %s",
+            appEndpointKeyspace, appServiceId, clusterId, projectId, organizationId)
 
         params = payload
         for k, v in kwargs.items():
@@ -1431,9 +1477,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Fetching bulk index status for indices: {}, in the cluster: {}, "
-            "in the project: {}, in the tenant: {}"
-            .format(indexes, clusterId, projectId, organizationId))
+            "Fetching bulk index status for indices: %s, in the cluster: %s, "
+            "in the project: %s, in the tenant: %s",
+            indexes, clusterId, projectId, organizationId)
 
         params = {
             "state": state,
@@ -1603,9 +1649,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Updating audit logging state of app service: {}, linked to the "
-            "cluster: {}, inside project: {}, inside tenant: {}"
-            .format(appServiceId, clusterId, projectId, organizationId))
+            "Updating audit logging state of app service: %s, linked to the "
+            "cluster: %s, inside project: %s, inside tenant: %s",
+            appServiceId, clusterId, projectId, organizationId)
         params = {
             "auditEnabled": auditEnabled
         }
@@ -1641,9 +1687,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Fetching audit logging state of app service: {}, linked to the "
-            "cluster: {}, inside project: {}, inside tenant: {}"
-            .format(appServiceId, clusterId, projectId, organizationId))
+            "Fetching audit logging state of app service: %s, linked to the "
+            "cluster: %s, inside project: %s, inside tenant: %s",
+            appServiceId, clusterId, projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -1680,11 +1726,10 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Listing Audit Log Events for the App Endpoint: {}, inside the "
-            "app Service: {}, linked to the cluster: {}, inside the project: "
-            "{}, inside the tenant: {}".format(appEndpointName, appServiceId,
-                                               clusterId, projectId,
-                                               organizationId))
+            "Listing Audit Log Events for the App Endpoint: %s, inside the "
+            "app Service: %s, linked to the cluster: %s, inside the project: "
+            "%s, inside the tenant: %s",
+            appEndpointName, appServiceId, clusterId, projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -1730,11 +1775,10 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Updating audit logging config for app endpoint: {}, inside app "
-            "service: {}, linked to the cluster: {}, inside the project: {}, "
-            "inside the tenant: {}"
-            .format(appEndpointName, appServiceId, clusterId, projectId,
-                    organizationId))
+            "Updating audit logging config for app endpoint: %s, inside app "
+            "service: %s, linked to the cluster: %s, inside the project: %s, "
+            "inside the tenant: %s",
+            appEndpointName, appServiceId, clusterId, projectId, organizationId)
         params = {
             "auditEnabled": auditEnabled,
             "enabledEventIds": enabledEventIds,
@@ -1775,11 +1819,10 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Fetching audit log config for app endpoint: {}, inside the app "
-            "service: {}, linked to cluster: {}, inside the project: {}, "
-            "inside the tenant: {}"
-            .format(appEndpointName, appServiceId, clusterId, projectId,
-                    organizationId))
+            "Fetching audit log config for app endpoint: %s, inside the app "
+            "service: %s, linked to cluster: %s, inside the project: %s, "
+            "inside the tenant: %s",
+            appEndpointName, appServiceId, clusterId, projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -1821,9 +1864,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Changing streaming config for appService: {}, in the cluster: {},"
-            " inside the project: {}, inside the tenant: {}".format(
-                appServiceId, clusterId, projectId, organizationId))
+            "Changing streaming config for appService: %s, in the cluster: %s,"
+            " inside the project: %s, inside the tenant: %s",
+            appServiceId, clusterId, projectId, organizationId)
         params = {
             "op": op,
             "path": path,
@@ -1873,9 +1916,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Updating audit logs streaming config for App Service: {}, linked "
-            "to the cluster: {}, inside the project: {}, inside the tenant: {}"
-            .format(appServiceId, clusterId, projectId, organizationId))
+            "Updating audit logs streaming config for App Service: %s, linked "
+            "to the cluster: %s, inside the project: %s, inside the tenant: %s",
+            appServiceId, clusterId, projectId, organizationId)
         params = {
             "streamingEnabled": streamingEnabled,
             "disabledAppEndpoints": disabledAppEndpoints,
@@ -1914,9 +1957,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Fetching audit log streaming state for app service: {}, linked to"
-            " cluster: {}, inside project: {}, inside tenant: {}".format(
-                appServiceId, clusterId, projectId, organizationId))
+            "Fetching audit log streaming state for app service: %s, linked to"
+            " cluster: %s, inside project: %s, inside tenant: %s",
+            appServiceId, clusterId, projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -1955,9 +1998,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Creating export logs for App Service: {}, inside the Cluster: {},"
-            " inside the Project: {}, inside the Tenant: {}".format(
-                appServiceId, clusterId, projectId, organizationId))
+            "Creating export logs for App Service: %s, inside the Cluster: %s,"
+            " inside the Project: %s, inside the Tenant: %s",
+            appServiceId, clusterId, projectId, organizationId)
         params = {
             "start": start,
             "end": end,
@@ -2004,9 +2047,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Listing audit log exports for App Service: {}, inside the "
-            "Cluster: {}, inside the Project: {}, in the Tenant: {}".format(
-                appServiceId, clusterId, projectId, organizationId))
+            "Listing audit log exports for App Service: %s, inside the "
+            "Cluster: %s, inside the Project: %s, in the Tenant: %s",
+            appServiceId, clusterId, projectId, organizationId)
         params = {}
         if page:
             params["page"] = page
@@ -2024,6 +2067,37 @@ class ClusterOperationsAPIs(APIRequests):
             params, headers)
         return resp
 
+    """
+    Generator version of list_app_svc_audit_log_exports, follows cursor.pages and yields the
+    listed items one at a time. Pages are only fetched as they are consumed.
+    :param perPage (int) Sets how many results are fetched per page.
+    :param prefetch_workers (int) Fetch the pages after the first one concurrently, with this many workers.
+    Takes the same params as list_app_svc_audit_log_exports otherwise.
+    """
+
+    def iter_app_svc_audit_log_exports(
+            self,
+            organizationId,
+            projectId,
+            clusterId,
+            appServiceId,
+            perPage=None,
+            sortBy=None,
+            sortDirection=None,
+            headers=None,
+            **kwargs):
+        return self.iter_listing(
+            self.list_app_svc_audit_log_exports,
+            organizationId,
+            projectId,
+            clusterId,
+            appServiceId,
+            perPage=perPage,
+            sortBy=sortBy,
+            sortDirection=sortDirection,
+            headers=headers,
+            **kwargs)
+
     def fetch_app_svc_audit_log_export_info(
             self,
             organizationId,
@@ -2050,11 +2124,10 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Fetching specification for the audit log export: {}, linked to "
-            "the app service: {}, inside the cluster: {}, inside the "
-            "project: {}, inside the tenant: {}".format(
-                auditLogExportId, appServiceId, clusterId, projectId,
-                organizationId))
+            "Fetching specification for the audit log export: %s, linked to "
+            "the app service: %s, inside the cluster: %s, inside the "
+            "project: %s, inside the tenant: %s",
+            auditLogExportId, appServiceId, clusterId, projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -2090,9 +2163,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Flushing bucket: {}, inside the cluster: {}, "
-            "inside the project: {}, inside the tenant: {}"
-            .format(bucketId, clusterId, projectId, organizationId))
+            "Flushing bucket: %s, inside the cluster: %s, "
+            "inside the project: %s, inside the tenant: %s",
+            bucketId, clusterId, projectId, organizationId)
 
         if kwargs:
             params = kwargs
@@ -2131,7 +2204,7 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Listing events inside the tenant {}".format(organizationId))
+            "Listing events inside the tenant %s", organizationId)
 
         params = {}
         if page:
@@ -2149,6 +2222,31 @@ class ClusterOperationsAPIs(APIRequests):
             organizationId), params, headers)
         return resp
 
+    """
+    Generator version of list_tenant_events, follows cursor.pages and yields the
+    listed items one at a time. Pages are only fetched as they are consumed.
+    :param perPage (int) Sets how many results are fetched per page.
+    :param prefetch_workers (int) Fetch the pages after the first one concurrently, with this many workers.
+    Takes the same params as list_tenant_events otherwise.
+    """
+
+    def iter_tenant_events(
+            self,
+            organizationId,
+            perPage=None,
+            sortBy=None,
+            sortDirection=None,
+            headers=None,
+            **kwargs):
+        return self.iter_listing(
+            self.list_tenant_events,
+            organizationId,
+            perPage=perPage,
+            sortBy=sortBy,
+            sortDirection=sortDirection,
+            headers=headers,
+            **kwargs)
+
     def fetch_tenant_event_info(
             self,
             organizationId,
@@ -2169,8 +2267,8 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Fetching information for event {} inside tenant {}".format(
-                eventId, organizationId))
+            "Fetching information for event %s inside tenant %s",
+            eventId, organizationId)
 
         if kwargs:
             params = kwargs
@@ -2210,8 +2308,8 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Listing the events inside the project {}, inside the tenant {}"
-            .format(projectId, organizationId))
+            "Listing the events inside the project %s, inside the tenant %s",
+            projectId, organizationId)
 
         params = {}
         if page:
@@ -2229,6 +2327,33 @@ class ClusterOperationsAPIs(APIRequests):
             organizationId, projectId), params, headers)
         return resp
 
+    """
+    Generator version of list_project_events, follows cursor.pages and yields the
+    listed items one at a time. Pages are only fetched as they are consumed.
+    :param perPage (int) Sets how many results are fetched per page.
+    :param prefetch_workers (int) Fetch the pages after the first one concurrently, with this many workers.
+    Takes the same params as list_project_events otherwise.
+    """
+
+    def iter_project_events(
+            self,
+            organizationId,
+            projectId,
+            perPage=None,
+            sortBy=None,
+            sortDirection=None,
+            headers=None,
+            **kwargs):
+        return self.iter_listing(
+            self.list_project_events,
+            organizationId,
+            projectId,
+            perPage=perPage,
+            sortBy=sortBy,
+            sortDirection=sortDirection,
+            headers=headers,
+            **kwargs)
+
     def fetch_project_event_info(
             self,
             organizationId,
@@ -2251,8 +2376,8 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Fetching info for event {}, inside the project {}, "
-            "inside the tenant {}".format(eventId, projectId, organizationId))
+            "Fetching info for event %s, inside the project %s, "
+            "inside the tenant %s", eventId, projectId, organizationId)
 
         if kwargs:
             params = kwargs
@@ -2418,6 +2543,35 @@ class ClusterOperationsAPIs(APIRequests):
             organizationId, projectId, clusterId), params, headers)
         return resp
 
+    """
+    Generator version of list_network_peer_records, follows cursor.pages and yields the
+    listed items one at a time. Pages are only fetched as they are consumed.
+    :param perPage (int) Sets how many results are fetched per page.
+    :param prefetch_workers (int) Fetch the pages after the first one concurrently, with this many workers.
+    Takes the same params as list_network_peer_records otherwise.
+    """
+
+    def iter_network_peer_records(
+            self,
+            organizationId,
+            projectId,
+            clusterId,
+            perPage=None,
+            sortBy=None,
+            sortDirection=None,
+            headers=None,
+            **kwargs):
+        return self.iter_listing(
+            self.list_network_peer_records,
+            organizationId,
+            projectId,
+            clusterId,
+            perPage=perPage,
+            sortBy=sortBy,
+            sortDirection=sortDirection,
+            headers=headers,
+            **kwargs)
+
     def get_azure_vnet_peering_command(
             self,
             organizationId,
@@ -2487,9 +2641,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Accepting private endpoint request for {}, inside cluster {}, "
-            "inside project {}, inside tenant {}.".format(
-                endpointId, clusterId, projectId, organizationId))
+            "Accepting private endpoint request for %s, inside cluster %s, "
+            "inside project %s, inside tenant %s.",
+            endpointId, clusterId, projectId, organizationId)
 
         if kwargs:
             params = kwargs
@@ -2524,9 +2678,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Removing the private endpoint for {}, inside cluster {}, "
-            "inside project {}, inside tenant".format(
-                endpointId, clusterId, projectId, organizationId))
+            "Removing the private endpoint for %s, inside cluster %s, "
+            "inside project %s, inside tenant %s",
+            endpointId, clusterId, projectId, organizationId)
 
         if kwargs:
             params = kwargs
@@ -2559,8 +2713,8 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Disabling Private Endpoint Service for cluster {}, in project {},"
-            " in tenant {}.".format(clusterId, projectId, organizationId))
+            "Disabling Private Endpoint Service for cluster %s, in project %s,"
+            " in tenant %s.", clusterId, projectId, organizationId)
 
         if kwargs:
             params = kwargs
@@ -2593,8 +2747,8 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
          """
         self.cluster_ops_API_log.info(
-            "Enabling Private endpoint service on cluster {}, in project {}, "
-            "in tenant {}".format(clusterId, projectId, organizationId))
+            "Enabling Private endpoint service on cluster %s, in project %s, "
+            "in tenant %s", clusterId, projectId, organizationId)
 
         if kwargs:
             params = kwargs
@@ -2627,8 +2781,8 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "Fetching Private Endpoint info of cluster {}, in project {}, "
-            "in tenant {}".format(clusterId, projectId, organizationId))
+            "Fetching Private Endpoint info of cluster %s, in project %s, "
+            "in tenant %s", clusterId, projectId, organizationId)
 
         if kwargs:
             params = kwargs
@@ -2674,8 +2828,8 @@ class ClusterOperationsAPIs(APIRequests):
         """
         self.cluster_ops_API_log.info(
             "Listing all the private endpoints linked to the endpoint "
-            "service for cluster {}, in project {}, in tenant {}".format(
-                clusterId, projectId, organizationId))
+            "service for cluster %s, in project %s, in tenant %s",
+            clusterId, projectId, organizationId)
 
         params = {}
         if page:
@@ -2693,6 +2847,35 @@ class ClusterOperationsAPIs(APIRequests):
             organizationId, projectId, clusterId), params, headers)
         return resp
 
+    """
+    Generator version of list_private_endpoint, follows cursor.pages and yields the
+    listed items one at a time. Pages are only fetched as they are consumed.
+    :param perPage (int) Sets how many results are fetched per page.
+    :param prefetch_workers (int) Fetch the pages after the first one concurrently, with this many workers.
+    Takes the same params as list_private_endpoint otherwise.
+    """
+
+    def iter_private_endpoint(
+            self,
+            organizationId,
+            projectId,
+            clusterId,
+            perPage=None,
+            sortBy=None,
+            sortDirection=None,
+            headers=None,
+            **kwargs):
+        return self.iter_listing(
+            self.list_private_endpoint,
+            organizationId,
+            projectId,
+            clusterId,
+            perPage=perPage,
+            sortBy=sortBy,
+            sortDirection=sortDirection,
+            headers=headers,
+            **kwargs)
+
     def post_private_endpoint_command(
             self,
             organizationId,
@@ -2717,9 +2900,9 @@ class ClusterOperationsAPIs(APIRequests):
             Error : message, hint, code, HttpStatusCode
         """
         self.cluster_ops_API_log.info(
-            "getting command for the subnets inside vpc for cluster {}, "
-            "inside project {}, inside tenant {}".format(
-                clusterId, projectId, organizationId))
+            "getting command for the subnets inside vpc for cluster %s, "
+            "inside project %s, inside tenant %s",
+            clusterId, projectId, organizationId)
 
         params = payload
         for k, v in kwargs:
@@ -2759,8 +2942,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Restore Backup in project {} in organization {}".format(
-                projectId, organizationId))
+            "Restore Backup in project %s in organization %s",
+            projectId, organizationId)
         params = {
             "targetClusterID": targetClusterID,
             "sourceClusterID": sourceClusterID,
@@ -2799,8 +2982,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Delete Backup in project {} in organization {}".format(
-                projectId, organizationId))
+            "Delete Backup in project %s in organization %s",
+            projectId, organizationId)
         params = {}
         for k, v in kwargs.items():
             params[k] = v
@@ -2832,8 +3015,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Get Backup in project {} in organization {}".format(
-                projectId, organizationId))
+            "Get Backup in project %s in organization %s",
+            projectId, organizationId)
         params = {}
         for k, v in kwargs.items():
             params[k] = v
@@ -2863,8 +3046,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "List Backup in project {} in organization {}".format(
-                projectId, organizationId))
+            "List Backup in project %s in organization %s",
+            projectId, organizationId)
         params = {}
         for k, v in kwargs.items():
             params[k] = v
@@ -2873,6 +3056,31 @@ class ClusterOperationsAPIs(APIRequests):
                 organizationId, projectId, clusterId), params, headers)
         return resp
 
+    """
+    Generator version of list_backups, follows cursor.pages and yields the
+    listed items one at a time. Pages are only fetched as they are consumed.
+    :param perPage (int) Sets how many results are fetched per page.
+    :param prefetch_workers (int) Fetch the pages after the first one concurrently, with this many workers.
+    Takes the same params as list_backups otherwise.
+    """
+
+    def iter_backups(
+            self,
+            organizationId,
+            projectId,
+            clusterId,
+            perPage=None,
+            headers=None,
+            **kwargs):
+        return self.iter_listing(
+            self.list_backups,
+            organizationId,
+            projectId,
+            clusterId,
+            perPage=perPage,
+            headers=headers,
+            **kwargs)
+
     """
     Method creates a backup under bucket, cluster, project and organization mentioned.
     In order to access this endpoint, the provided API key must have at least one of the roles referenced below:
@@ -2895,8 +3103,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Creating Backup in project {} in organization {}".format(
-                projectId, organizationId))
+            "Creating Backup in project %s in organization %s",
+            projectId, organizationId)
         params = {}
         for k, v in kwargs.items():
             params[k] = v
@@ -2981,8 +3189,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Creating Cluster {} in project {} in organization {}".format(
-                name, projectId, organizationId))
+            "Creating Cluster %s in project %s in organization %s",
+            name, projectId, organizationId)
         params = {
             "name": name,
             "cloudProvider": cloudProvider
@@ -3037,8 +3245,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "List all the cluster for project {} in organization {}".format(
-                projectId, organizationId))
+            "List all the cluster for project %s in organization %s",
+            projectId, organizationId)
         params = {}
         if page:
             params["page"] = page
@@ -3057,6 +3265,33 @@ class ClusterOperationsAPIs(APIRequests):
                 organizationId, projectId), params, headers)
         return resp
 
+    """
+    Generator version of list_clusters, follows cursor.pages and yields the
+    listed items one at a time. Pages are only fetched as they are consumed.
+    :param perPage (int) Sets how many results are fetched per page.
+    :param prefetch_workers (int) Fetch the pages after the first one concurrently, with this many workers.
+    Takes the same params as list_clusters otherwise.
+    """
+
+    def iter_clusters(
+            self,
+            organizationId,
+            projectId,
+            perPage=None,
+            sortBy=None,
+            sortDirection=None,
+            headers=None,
+            **kwargs):
+        return self.iter_listing(
+            self.list_clusters,
+            organizationId,
+            projectId,
+            perPage=perPage,
+            sortBy=sortBy,
+            sortDirection=sortDirection,
+            headers=headers,
+            **kwargs)
+
     """
     Method fetches info of the required cluster.
     In order to access this endpoint, the provided API key must have at least one of the roles referenced below:
@@ -3081,8 +3316,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Fetching cluster info for {} in project {} in organization {}".format(
-                clusterId, projectId, organizationId))
+            "Fetching cluster info for %s in project %s in organization %s",
+            clusterId, projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -3158,8 +3393,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Updating cluster {} in project {} in organization {}".format(
-                clusterId, projectId, organizationId))
+            "Updating cluster %s in project %s in organization %s",
+            clusterId, projectId, organizationId)
         params = {
             "name": name,
             "description": description,
@@ -3171,7 +3406,7 @@ class ClusterOperationsAPIs(APIRequests):
                 headers = {}
             result = self.fetch_cluster_info(
                 organizationId, projectId, clusterId)
-            version_id = result.json()["audit"]["version"]
+            version_id = APICodec.response_json(result)["audit"]["version"]
             headers["If-Match"] = "Version: {}".format(version_id)
 
         for k, v in kwargs.items():
@@ -3208,8 +3443,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Deleting cluster {} in project {} in organization {}".format(
-                clusterId, projectId, organizationId))
+            "Deleting cluster %s in project %s in organization %s",
+            clusterId, projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -3242,8 +3477,8 @@ class ClusterOperationsAPIs(APIRequests):
     def switch_cluster_on(self, organizationId, projectId, clusterId,
                           turnOnLinkedAppService, headers=None, **kwargs):
         self.cluster_ops_API_log.info(
-            "Switching on Cluster {} in project {} in organization {}".format(
-                clusterId, projectId, organizationId))
+            "Switching on Cluster %s in project %s in organization %s",
+            clusterId, projectId, organizationId)
 
         params = {
             "turnOnLinkedAppService": turnOnLinkedAppService,
@@ -3274,8 +3509,8 @@ class ClusterOperationsAPIs(APIRequests):
     def switch_cluster_off(self, organizationId, projectId, clusterId,
                            headers=None, **kwargs):
         self.cluster_ops_API_log.info(
-            "Switching off Cluster {} in project {} in organization {}".format(
-                clusterId, projectId, organizationId))
+            "Switching off Cluster %s in project %s in organization %s",
+            clusterId, projectId, organizationId)
 
         if kwargs:
             params = kwargs
@@ -3325,8 +3560,8 @@ class ClusterOperationsAPIs(APIRequests):
             days,
             headers=None,
             **kwargs):
-        self.cluster_ops_API_log.info("Adding on/off schedule in cluster {} "
-                                      .format(clusterId))
+        self.cluster_ops_API_log.info("Adding on/off schedule in cluster %s ",
+                                      clusterId)
         params = {
             "timezone": timezone,
             "days": days,
@@ -3360,8 +3595,8 @@ class ClusterOperationsAPIs(APIRequests):
             clusterId,
             headers=None,
             **kwargs):
-        self.cluster_ops_API_log.info("Fetching on/off schedule in cluster {}"
-                                      .format(clusterId))
+        self.cluster_ops_API_log.info("Fetching on/off schedule in cluster %s",
+                                      clusterId)
         if kwargs:
             params = kwargs
         else:
@@ -3410,8 +3645,8 @@ class ClusterOperationsAPIs(APIRequests):
             days,
             headers=None,
             **kwargs):
-        self.cluster_ops_API_log.info("Updating on/off schedule in cluster {}"
-                                      .format(clusterId))
+        self.cluster_ops_API_log.info("Updating on/off schedule in cluster %s",
+                                      clusterId)
         params = {
             "timezone": timezone,
             "days": days,
@@ -3446,8 +3681,8 @@ class ClusterOperationsAPIs(APIRequests):
             clusterId,
             headers=None,
             **kwargs):
-        self.cluster_ops_API_log.info("Deleting on/off schedule in cluster {}"
-                                      .format(clusterId))
+        self.cluster_ops_API_log.info("Deleting on/off schedule in cluster %s",
+                                      clusterId)
         if kwargs:
             params = kwargs
         else:
@@ -3477,8 +3712,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Migrating buckets `{}` in cluster {} in project {} in organization {}.".format(
-                buckets, clusterId, projectId, organizationId))
+            "Migrating buckets `%s` in cluster %s in project %s in organization %s.",
+            buckets, clusterId, projectId, organizationId)
         params = {
             "buckets": buckets,
         }
@@ -3530,8 +3765,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Creating an alert inside the project {} inside the organization {}.".format(
-                projectId, organizationId))
+            "Creating an alert inside the project %s inside the organization %s.",
+            projectId, organizationId)
 
         params = {
             "kind": kind,
@@ -3563,8 +3798,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Fetching the alert {} inside the project {} inside the organization {}.".format(
-                alertId, projectId, organizationId))
+            "Fetching the alert %s inside the project %s inside the organization %s.",
+            alertId, projectId, organizationId)
 
         if kwargs:
             params = kwargs
@@ -3590,8 +3825,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "List alert inside project {} the organization {}.".format(
-                projectId, organizationId))
+            "List alert inside project %s the organization %s.",
+            projectId, organizationId)
 
         if kwargs:
             params = kwargs
@@ -3602,6 +3837,29 @@ class ClusterOperationsAPIs(APIRequests):
             params, headers)
         return resp
 
+    """
+    Generator version of list_alerts, follows cursor.pages and yields the
+    listed items one at a time. Pages are only fetched as they are consumed.
+    :param perPage (int) Sets how many results are fetched per page.
+    :param prefetch_workers (int) Fetch the pages after the first one concurrently, with this many workers.
+    Takes the same params as list_alerts otherwise.
+    """
+
+    def iter_alerts(
+            self,
+            organizationId,
+            projectId,
+            perPage=None,
+            headers=None,
+            **kwargs):
+        return self.iter_listing(
+            self.list_alerts,
+            organizationId,
+            projectId,
+            perPage=perPage,
+            headers=headers,
+            **kwargs)
+
     """
     Method deletes an alert inside a project.
     :param organizationId (str) Organization ID under which the cluster is present.
@@ -3619,8 +3877,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Deleting an alert inside the project {} inside the organization {}.".format(
-                projectId, organizationId))
+            "Deleting an alert inside the project %s inside the organization %s.",
+            projectId, organizationId)
 
         if kwargs:
             params = kwargs
@@ -3674,8 +3932,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Updating the alert {} inside the project {} inside the organization {}.".format(
-                alert_id, projectId, organizationId))
+            "Updating the alert %s inside the project %s inside the organization %s.",
+            alert_id, projectId, organizationId)
 
         params = {
             "kind": kind,
@@ -3706,8 +3964,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Test alert inside project {} the organization {}.".format(
-                projectId, organizationId))
+            "Test alert inside project %s the organization %s.",
+            projectId, organizationId)
 
         params = {
             "config": config,
@@ -3751,8 +4009,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Creating Audit Log inside cluster {} inside project {} inside organization {}".format(
-                clusterId, projectId, organizationId))
+            "Creating Audit Log inside cluster %s inside project %s inside organization %s",
+            clusterId, projectId, organizationId)
 
         params = {
             "auditEnabled": auditEnabled,
@@ -3792,8 +4050,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Fetching Audit Logging inside cluster {} inside project {} inside organization {}".format(
-                clusterId, projectId, organizationId))
+            "Fetching Audit Logging inside cluster %s inside project %s inside organization %s",
+            clusterId, projectId, organizationId)
 
         if kwargs:
             params = kwargs
@@ -3829,8 +4087,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Fetching Audit Log Events info inside cluster {} inside project {} inside organization {}".format(
-                clusterId, projectId, organizationId))
+            "Fetching Audit Log Events info inside cluster %s inside project %s inside organization %s",
+            clusterId, projectId, organizationId)
 
         if kwargs:
             params = kwargs
@@ -3866,8 +4124,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Creating Audit Log inside cluster {} inside project {} inside organization {}".format(
-                clusterId, projectId, organizationId))
+            "Creating Audit Log inside cluster %s inside project %s inside organization %s",
+            clusterId, projectId, organizationId)
 
         params = {
             "start": start,
@@ -3908,8 +4166,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Fetching Audit Log {} inside cluster {} inside project {} inside organization {}".format(
-                auditLogId, clusterId, projectId, organizationId))
+            "Fetching Audit Log %s inside cluster %s inside project %s inside organization %s",
+            auditLogId, clusterId, projectId, organizationId)
 
         if kwargs:
             params = kwargs
@@ -3947,8 +4205,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Listing Audit Logs inside cluster {} inside project {} inside organization {}".format(
-                clusterId, projectId, organizationId))
+            "Listing Audit Logs inside cluster %s inside project %s inside organization %s",
+            clusterId, projectId, organizationId)
 
         if kwargs:
             params = kwargs
@@ -3982,8 +4240,8 @@ class ClusterOperationsAPIs(APIRequests):
                                 headers=None,
                                 **kwargs):
         self.cluster_ops_API_log.info(
-            "Downloading certificate for cluster {} in project {} in organization {}".format(
-                cluster_id, project_id, organization_id))
+            "Downloading certificate for cluster %s in project %s in organization %s",
+            cluster_id, project_id, organization_id)
         if kwargs:
             params = kwargs
         else:
@@ -4022,8 +4280,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Adding {} CIDR block to {} cluster allowed CIDR list".format(
-                cidr, clusterId))
+            "Adding %s CIDR block to %s cluster allowed CIDR list",
+            cidr, clusterId)
         params = {
             "cidr": cidr
         }
@@ -4068,7 +4326,7 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "List all the allowed CIDRs for cluster {}".format(clusterId))
+            "List all the allowed CIDRs for cluster %s", clusterId)
         params = {}
         if page:
             params["page"] = page
@@ -4086,6 +4344,35 @@ class ClusterOperationsAPIs(APIRequests):
             organizationId, projectId, clusterId), params, headers)
         return resp
 
+    """
+    Generator version of list_allowed_CIDRs, follows cursor.pages and yields the
+    listed items one at a time. Pages are only fetched as they are consumed.
+    :param perPage (int) Sets how many results are fetched per page.
+    :param prefetch_workers (int) Fetch the pages after the first one concurrently, with this many workers.
+    Takes the same params as list_allowed_CIDRs otherwise.
+    """
+
+    def iter_allowed_CIDRs(
+            self,
+            organizationId,
+            projectId,
+            clusterId,
+            perPage=None,
+            sortBy=None,
+            sortDirection=None,
+            headers=None,
+            **kwargs):
+        return self.iter_listing(
+            self.list_allowed_CIDRs,
+            organizationId,
+            projectId,
+            clusterId,
+            perPage=perPage,
+            sortBy=sortBy,
+            sortDirection=sortDirection,
+            headers=headers,
+            **kwargs)
+
     """
     Method fetches info of the required allowed CIDR ID.
     In order to access this endpoint, the provided API key must have at least one of the roles referenced below:
@@ -4110,8 +4397,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Fetching allowed CIDR info for {} in cluster {}".format(
-                allowedCidrId, clusterId))
+            "Fetching allowed CIDR info for %s in cluster %s",
+            allowedCidrId, clusterId)
         if kwargs:
             params = kwargs
         else:
@@ -4150,8 +4437,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Deleting allowed CIDR {} from cluster {}".format(
-                allowedCidrId, clusterId))
+            "Deleting allowed CIDR %s from cluster %s",
+            allowedCidrId, clusterId)
         if kwargs:
             params = kwargs
         else:
@@ -4209,8 +4496,7 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Creating Database User {} in cluster {}".format(
-                name, clusterId))
+            "Creating Database User %s in cluster %s", name, clusterId)
         params = {
             "name": name,
             "access": access
@@ -4254,7 +4540,7 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "List all the database users for cluster {}".format(clusterId))
+            "List all the database users for cluster %s", clusterId)
         params = {}
         if page:
             params["page"] = page
@@ -4272,6 +4558,35 @@ class ClusterOperationsAPIs(APIRequests):
             organizationId, projectId, clusterId), params, headers)
         return resp
 
+    """
+    Generator version of list_database_users, follows cursor.pages and yields the
+    listed items one at a time. Pages are only fetched as they are consumed.
+    :param perPage (int) Sets how many results are fetched per page.
+    :param prefetch_workers (int) Fetch the pages after the first one concurrently, with this many workers.
+    Takes the same params as list_database_users otherwise.
+    """
+
+    def iter_database_users(
+            self,
+            organizationId,
+            projectId,
+            clusterId,
+            perPage=None,
+            sortBy=None,
+            sortDirection=None,
+            headers=None,
+            **kwargs):
+        return self.iter_listing(
+            self.list_database_users,
+            organizationId,
+            projectId,
+            clusterId,
+            perPage=perPage,
+            sortBy=sortBy,
+            sortDirection=sortDirection,
+            headers=headers,
+            **kwargs)
+
     """
     Method fetches info of the required database user ID.
     In order to access this endpoint, the provided API key must have at least one of the roles referenced below:
@@ -4296,8 +4611,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Fetching Database user info for {} present in cluster {}".format(
-                userId, clusterId))
+            "Fetching Database user info for %s present in cluster %s",
+            userId, clusterId)
         if kwargs:
             params = kwargs
         else:
@@ -4354,8 +4669,7 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Updating database user {} in cluster {}".format(
-                userId, clusterId))
+            "Updating database user %s in cluster %s", userId, clusterId)
         params = {
             "access": access
         }
@@ -4364,7 +4678,7 @@ class ClusterOperationsAPIs(APIRequests):
                 headers = {}
             result = self.fetch_database_user_info(
                 organizationId, projectId, clusterId, userId)
-            version_id = result.json()["audit"]["version"]
+            version_id = APICodec.response_json(result)["audit"]["version"]
             headers["If-Match"] = "Version: {}".format(version_id)
 
         for k, v in kwargs.items():
@@ -4403,8 +4717,7 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Deleting database user {} from cluster {}".format(
-                userId, clusterId))
+            "Deleting database user %s from cluster %s", userId, clusterId)
         if kwargs:
             params = kwargs
         else:
@@ -4447,9 +4760,9 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Loading Sample Bucket {} into cluster {} in project {} in "
-            "organization {}".format(
-                sampleBucket, clusterId, projectId, organizationId))
+            "Loading Sample Bucket %s into cluster %s in project %s in "
+            "organization %s",
+            sampleBucket, clusterId, projectId, organizationId)
         params = {
             "name": sampleBucket,
         }
@@ -4489,9 +4802,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Listing all Sample Buckets in cluster {} in project {} in "
-            "organization {}".format(
-                clusterId, projectId, organizationId))
+            "Listing all Sample Buckets in cluster %s in project %s in "
+            "organization %s", clusterId, projectId, organizationId)
         params = {}
         if page:
             params["page"] = page
@@ -4509,6 +4821,35 @@ class ClusterOperationsAPIs(APIRequests):
             organizationId, projectId, clusterId), params, headers)
         return resp
 
+    """
+    Generator version of list_sample_buckets, follows cursor.pages and yields the
+    listed items one at a time. Pages are only fetched as they are consumed.
+    :param perPage (int) Sets how many results are fetched per page.
+    :param prefetch_workers (int) Fetch the pages after the first one concurrently, with this many workers.
+    Takes the same params as list_sample_buckets otherwise.
+    """
+
+    def iter_sample_buckets(
+            self,
+            organizationId,
+            projectId,
+            clusterId,
+            perPage=None,
+            sortBy=None,
+            sortDirection=None,
+            headers=None,
+            **kwargs):
+        return self.iter_listing(
+            self.list_sample_buckets,
+            organizationId,
+            projectId,
+            clusterId,
+            perPage=perPage,
+            sortBy=sortBy,
+            sortDirection=sortDirection,
+            headers=headers,
+            **kwargs)
+
     """
     Method Fetches the configuration of the given sample bucket.
     In order to access this endpoint, the provided API key must have at least one of the following roles:
@@ -4535,8 +4876,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Fetching sample bucket info for {} present in cluster {}".format(
-                sampleBucket, clusterId))
+            "Fetching sample bucket info for %s present in cluster %s",
+            sampleBucket, clusterId)
         if kwargs:
             params = kwargs
         else:
@@ -4570,9 +4911,9 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Deleting Sample Bucket {} from cluster {} in project {} "
-            "in organization {}".format(
-                sampleBucket, clusterId, projectId, organizationId))
+            "Deleting Sample Bucket %s from cluster %s in project %s "
+            "in organization %s",
+            sampleBucket, clusterId, projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -4667,8 +5008,7 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Creating bucket {} in cluster {}".format(
-                name, clusterId))
+            "Creating bucket %s in cluster %s", name, clusterId)
         params = {
             "name": name,
             "type": type,
@@ -4719,7 +5059,7 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "List all the buckets in the cluster {}".format(clusterId))
+            "List all the buckets in the cluster %s", clusterId)
         if kwargs:
             params = kwargs
         else:
@@ -4728,6 +5068,31 @@ class ClusterOperationsAPIs(APIRequests):
             organizationId, projectId, clusterId), params, headers)
         return resp
 
+    """
+    Generator version of list_buckets, follows cursor.pages and yields the
+    listed items one at a time. Pages are only fetched as they are consumed.
+    :param perPage (int) Sets how many results are fetched per page.
+    :param prefetch_workers (int) Fetch the pages after the first one concurrently, with this many workers.
+    Takes the same params as list_buckets otherwise.
+    """
+
+    def iter_buckets(
+            self,
+            organizationId,
+            projectId,
+            clusterId,
+            perPage=None,
+            headers=None,
+            **kwargs):
+        return self.iter_listing(
+            self.list_buckets,
+            organizationId,
+            projectId,
+            clusterId,
+            perPage=perPage,
+            headers=headers,
+            **kwargs)
+
     """
     Method fetches info of the required bucket.
     In order to access this endpoint, the provided API key must have at least one of the roles referenced below:
@@ -4754,8 +5119,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Fetching bucket info for {} present in cluster {}".format(
-                bucketId, clusterId))
+            "Fetching bucket info for %s present in cluster %s",
+            bucketId, clusterId)
         if kwargs:
             params = kwargs
         else:
@@ -4818,8 +5183,7 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Updating bucket {} in cluster {}".format(
-                bucketId, clusterId))
+            "Updating bucket %s in cluster %s", bucketId, clusterId)
         params = {
             "memoryAllocationInMb": memoryAllocationInMb,
             "durabilityLevel": durabilityLevel,
@@ -4836,7 +5200,7 @@ class ClusterOperationsAPIs(APIRequests):
                 headers = {}
             result = self.fetch_bucket_info(
                 organizationId, projectId, clusterId, bucketId)
-            version_id = result.json()["audit"]["version"]
+            version_id = APICodec.response_json(result)["audit"]["version"]
             headers["If-Match"] = "Version: {}".format(version_id)
 
         for k, v in kwargs.items():
@@ -4869,8 +5233,7 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Deleting bucket {} in cluster {}".format(
-                bucketId, clusterId))
+            "Deleting bucket %s in cluster %s", bucketId, clusterId)
         if kwargs:
             params = kwargs
         else:
@@ -4903,8 +5266,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Creating scope {} in bucket {} in cluster {}".format(
-                name, bucketId, clusterId))
+            "Creating scope %s in bucket %s in cluster %s",
+            name, bucketId, clusterId)
         params = {
             "name": name
         }
@@ -4936,8 +5299,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "List all the scopes for bucket {} in cluster {}".format(
-                bucketId, clusterId))
+            "List all the scopes for bucket %s in cluster %s",
+            bucketId, clusterId)
         if kwargs:
             params = kwargs
         else:
@@ -4970,8 +5333,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Fetching scope info for {} in bucket {} in cluster {}".format(
-                scopeName, bucketId, clusterId))
+            "Fetching scope info for %s in bucket %s in cluster %s",
+            scopeName, bucketId, clusterId)
         if kwargs:
             params = kwargs
         else:
@@ -5012,8 +5375,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Deleting scope {} in bucket {} in cluster {}".format(
-                scopeName, bucketId, clusterId))
+            "Deleting scope %s in bucket %s in cluster %s",
+            scopeName, bucketId, clusterId)
         if kwargs:
             params = kwargs
         else:
@@ -5048,8 +5411,8 @@ class ClusterOperationsAPIs(APIRequests):
     def create_collection(self, organizationId, projectId, clusterId, bucketId,
                           scopeName, name, maxTTL=-1, headers=None, **kwargs):
         self.cluster_ops_API_log.info(
-            "Creating collection {} in scope {} in bucket {} in cluster {}".format(
-                name, scopeName, bucketId, clusterId))
+            "Creating collection %s in scope %s in bucket %s in cluster %s",
+            name, scopeName, bucketId, clusterId)
         params = {
             "name": name
         }
@@ -5092,8 +5455,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "List all the collections in the scope {} in bucket {} in cluster {}".format(
-                scopeName, bucketId, clusterId))
+            "List all the collections in the scope %s in bucket %s in cluster %s",
+            scopeName, bucketId, clusterId)
         if kwargs:
             params = kwargs
         else:
@@ -5135,8 +5498,8 @@ class ClusterOperationsAPIs(APIRequests):
             headers=None,
             **kwargs):
         self.cluster_ops_API_log.info(
-            "Fetching info for the collection {} in scope {} in bucket {} in cluster {}".format(
-                collectionName, scopeName, bucketId, clusterId))
+            "Fetching info for the collection %s in scope %s in bucket %s in cluster %s",
+            collectionName, scopeName, bucketId, clusterId)
         if kwargs:
             params = kwargs
         else:
@@ -5211,8 +5574,8 @@ class ClusterOperationsAPIs(APIRequests):
     def delete_collection(self, organizationId, projectId, clusterId, bucketId,
                           scopeName, collectionName, headers=None, **kwargs):
         self.cluster_ops_API_log.info(
-            "Deleting the collection {} in scope {} in bucket {} in cluster {}".format(
-                collectionName, scopeName, bucketId, clusterId))
+            "Deleting the collection %s in scope %s in bucket %s in cluster %s",
+            collectionName, scopeName, bucketId, clusterId)
         if kwargs:
             params = kwargs
         else:
@@ -5428,6 +5791,33 @@ class ClusterOperationsAPIs(APIRequests):
         resp = self.api_get(url, params=params, headers=headers)
         return resp
 
+    """
+    Generator version of list_appservices, follows cursor.pages and yields the
+    listed items one at a time. Pages are only fetched as they are consumed.
+    :param perPage (int) Sets how many results are fetched per page.
+    :param prefetch_workers (int) Fetch the pages after the first one concurrently, with this many workers.
+    Takes the same params as list_appservices otherwise.
+    """
+
+    def iter_appservices(
+            self,
+            tenant_id,
+            perPage=None,
+            sortBy=None,
+            sortDirection=None,
+            projectId=None,
+            headers=None,
+            **kwargs):
+        return self.iter_listing(
+            self.list_appservices,
+            tenant_id,
+            perPage=perPage,
+            sortBy=sortBy,
+            sortDirection=sortDirection,
+            projectId=projectId,
+            headers=headers,
+            **kwargs)
+
     def create_appservice(self, tenant_id, project_id, cluster_id,
                           appservice_name, compute, nodes=None, version=None,
                           description="", headers=None, **kwargs):
@@ -5588,9 +5978,9 @@ class ClusterOperationsAPIs(APIRequests):
     def switch_app_service_on(self, organizationId, projectId, clusterId,
                               appServiceId, headers=None, **kwargs):
         self.cluster_ops_API_log.info(
-            "Switching on App Service {} in cluster {} in project {} in "
-            "organization {}".format(appServiceId, clusterId, projectId,
-                                     organizationId))
+            "Switching on App Service %s in cluster %s in project %s in "
+            "organization %s",
+            appServiceId, clusterId, projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -5618,9 +6008,9 @@ class ClusterOperationsAPIs(APIRequests):
     def switch_app_service_off(self, organizationId, projectId, clusterId,
                                appServiceId, headers=None, **kwargs):
         self.cluster_ops_API_log.info(
-            "Switching off App Service {} in cluster {} in project {} in "
-            "organization {}".format(appServiceId, clusterId, projectId,
-                                     organizationId))
+            "Switching off App Service %s in cluster %s in project %s in "
+            "organization %s",
+            appServiceId, clusterId, projectId, organizationId)
         if kwargs:
             params = kwargs
         else:
@@ -5632,19 +6022,98 @@ class ClusterOperationsAPIs(APIRequests):
         return resp
 
 
+class AsyncClusterOperationsAPIs(AsyncAPIRequests, ClusterOperationsAPIs):
+    """
+    Awaitable version of ClusterOperationsAPIs, every method returns a
+    coroutine resolving to the response. Requires the httpx package.
+    """
+
+    def __init__(self, url, secret, access, bearer_token, **kwargs):
+        ClusterOperationsAPIs.__init__(
+            self, url, secret, access, bearer_token)
+        self._init_async_session(**kwargs)
+
+    async def update_cluster(
+            self,
+            organizationId,
+            projectId,
+            clusterId,
+            name,
+            description,
+            support,
+            serviceGroups,
+            ifmatch,
+            headers=None,
+            **kwargs):
+        if ifmatch:
+            headers = await self._version_headers(
+                self.fetch_cluster_info(organizationId, projectId, clusterId),
+                headers)
+        return await ClusterOperationsAPIs.update_cluster(
+            self, organizationId, projectId, clusterId, name, description,
+            support, serviceGroups, False, headers, **kwargs)
+
+    async def update_database_user(
+            self,
+            organizationId,
+            projectId,
+            clusterId,
+            userId,
+            access,
+            ifmatch,
+            headers=None,
+            **kwargs):
+        if ifmatch:
+            headers = await self._version_headers(
+                self.fetch_database_user_info(
+                    organizationId, projectId, clusterId, userId),
+                headers)
+        return await ClusterOperationsAPIs.update_database_user(
+            self, organizationId, projectId, clusterId, userId, access,
+            False, headers, **kwargs)
+
+    async def update_bucket_config(
+            self,
+            organizationId,
+            projectId,
+            clusterId,
+            bucketId,
+            memoryAllocationInMb,
+            durabilityLevel,
+            replicas,
+            flush,
+            timeToLiveInSeconds,
+            ifmatch,
+            priority=None,
+            headers=None,
+            **kwargs):
+        if ifmatch:
+            headers = await self._version_headers(
+                self.fetch_bucket_info(
+                    organizationId, projectId, clusterId, bucketId),
+                headers)
+        return await ClusterOperationsAPIs.update_bucket_config(
+            self, organizationId, projectId, clusterId, bucketId,
+            memoryAllocationInMb, durabilityLevel, replicas, flush,
+            timeToLiveInSeconds, False, priority, headers, **kwargs)
+
+
 class CapellaAPI(CommonCapellaAPI):
 
     def __init__(self, url, secret, access, user, pwd, bearer_token,
-                 TOKEN_FOR_INTERNAL_SUPPORT=None):
+                 TOKEN_FOR_INTERNAL_SUPPORT=None, transport=None):
         """
         Making explicit call to init function of inherited classes because the init params differ.
+        The API groups share this client's transport, and so its connections, auth, retry policy,
+        rate limit and cache.
         """
         super(CapellaAPI, self).__init__(
             url=url, secret=secret, access=access, user=user, pwd=pwd,
             bearer_token=bearer_token,
-            TOKEN_FOR_INTERNAL_SUPPORT=TOKEN_FOR_INTERNAL_SUPPORT)
+            TOKEN_FOR_INTERNAL_SUPPORT=TOKEN_FOR_INTERNAL_SUPPORT,
+            transport=transport)
         self.cluster_ops_apis = ClusterOperationsAPIs(
-            url, secret, access, bearer_token)
+            url, secret, access, bearer_token, transport=self.transport)
         self.capellaAPI_log = logging.getLogger(__name__)
 
     def set_logging_level(self, level):
@@ -5708,7 +6177,7 @@ class CapellaAPI(CommonCapellaAPI):
                 # We use response.text as this is a string
                 # response.content is in bytes which we use for json.loads
                 if len(api_response.text) > 0:
-                    response_dict = api_response.json()['place']
+                    response_dict = APICodec.response_json(api_response)['place']
 
         # return just the servers bit
         return (response_dict)
@@ -5855,7 +6324,7 @@ class CapellaAPI(CommonCapellaAPI):
                    "durabilityLevel": "none", "timeToLive": None}
         default.update(bucket_params)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(default))
+                                        params=APICodec.dumps(default))
         return resp
     """
 
@@ -5897,7 +6366,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = "{}/v2/organizations/{}/projects/{}/clusters/{}/buckets/{}" \
             .format(self.internal_url, tenant_id, project_id,
                     cluster_id, bucket_id)
-        resp = self.do_internal_request(url, method="PUT", params=json.dumps(bucket_params))
+        resp = self.do_internal_request(url, method="PUT", params=APICodec.dumps(bucket_params))
         return resp
     """
 
@@ -5962,7 +6431,7 @@ class CapellaAPI(CommonCapellaAPI):
                 "permissions": {"data_reader": {}, "data_writer": {}}}
         url = '{}/users'.format(url)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(body))
+                                        params=APICodec.dumps(body))
         return resp
     """
 
@@ -5976,7 +6445,7 @@ class CapellaAPI(CommonCapellaAPI):
                             "comment": ""}]}
         url = '{}/allowlists-bulk'.format(url)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(body))
+                                        params=APICodec.dumps(body))
         return resp
 
     """
@@ -5992,7 +6461,7 @@ class CapellaAPI(CommonCapellaAPI):
         }
         url = '{}/allowlists-bulk'.format(url)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(body))
+                                        params=APICodec.dumps(body))
         return resp
     """
 
@@ -6002,7 +6471,7 @@ class CapellaAPI(CommonCapellaAPI):
             .format(self.internal_url, tenant_id, project_id, cluster_id)
         param = {'name': bucket_name}
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(param))
+                                        params=APICodec.dumps(param))
         return resp
 
     def create_cluster_customAMI(self, tenant_id, config):
@@ -6029,7 +6498,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = '{}/v2/organizations/{}/clusters/deploy'.format(
             self.internal_url, tenant_id)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def get_deployment_options(self, tenant_id):
@@ -6063,7 +6532,7 @@ class CapellaAPI(CommonCapellaAPI):
                                                   function_scope["scope"])
 
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(body))
+                                        params=APICodec.dumps(body))
         return resp
 
     def __set_eventing_function_settings(
@@ -6076,7 +6545,7 @@ class CapellaAPI(CommonCapellaAPI):
                                                   function_scope["scope"])
 
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(body))
+                                        params=APICodec.dumps(body))
         return resp
 
     def pause_eventing_function(self, cluster_id, name, function_scope=None):
@@ -6147,7 +6616,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = "{}/v2/organizations/{}/projects/{}/clusters/{}/virtualnetworks" \
             .format(self.internal_url, tenant_id, project_id, cluster_id)
         resp = self.do_internal_request(
-            url, method="POST", params=json.dumps(private_network_params))
+            url, method="POST", params=APICodec.dumps(private_network_params))
         return resp
 
     def get_private_network(self, tenant_id, project_id, cluster_id,
@@ -6162,7 +6631,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = "{}/v2/organizations/{}/projects/{}/clusters/{}/specs" \
             .format(self.internal_url, tenant_id, project_id, cluster_id)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(specs))
+                                        params=APICodec.dumps(specs))
         return resp
 
     def restore_from_backup(
@@ -6205,7 +6674,7 @@ class CapellaAPI(CommonCapellaAPI):
             .format(self.internal_url, tenant_id, project_id, cluster_id,
                     bucket_id)
         resp = self.do_internal_request(
-            url, method="POST", params=json.dumps(payload))
+            url, method="POST", params=APICodec.dumps(payload))
         return resp
 
     def get_cluster_id(self, cluster_name):
@@ -6217,19 +6686,19 @@ class CapellaAPI(CommonCapellaAPI):
         resp = self.get_buckets(tenant_id, project_id, cluster_id)
         if resp.status_code != 200:
             raise Exception("Response when trying to fetch buckets.")
-        buckets = json.loads(resp.content)['buckets']['data']
+        buckets = APICodec.loads(resp.content)['buckets']['data']
         for bucket in buckets:
             if bucket['data']['name'] == bucket_name:
                 return bucket['data']['id']
 
     def get_tenant_id(self):
-        return json.loads(self.get_clusters().content)['data']['tenantId']
+        return APICodec.loads(self.get_clusters().content)['data']['tenantId']
 
     def get_project_id(self, cluster_name):
         return self._get_meta_data(cluster_name=cluster_name)['projectId']
 
     def _get_meta_data(self, cluster_name):
-        all_clusters = json.loads(self.get_clusters().content)['data']
+        all_clusters = APICodec.loads(self.get_clusters().content)['data']
         for cluster in all_clusters['items']:
             if cluster['name'] == cluster_name:
                 return cluster
@@ -6282,7 +6751,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = "{}/v2/organizations/{}/projects/{}/clusters/{}/backups".format(
             self.internal_url, tenant_id, project_id, cluster_id)
         resp = self.do_internal_request(url, method="GET").content
-        for bucket in json.loads(resp)['data']:
+        for bucket in APICodec.loads(resp)['data']:
             if bucket['data']['bucket'] == bucket_name:
                 return bucket['data']['bucketId']
 
@@ -6299,7 +6768,7 @@ class CapellaAPI(CommonCapellaAPI):
             self.internal_url, tenant_id, project_id, cluster_id)
         payload = {"bucket": bucket_name}
         resp = self.do_internal_request(
-            url, method="POST", params=json.dumps(payload))
+            url, method="POST", params=APICodec.dumps(payload))
         return resp
 
     def list_all_bucket_backups(
@@ -6383,7 +6852,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = "{}/v2/organizations/{}/users" \
             .format(self.internal_url, tenant_id)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def invite_new_user_with_config(self, tenant_id, config):
@@ -6391,7 +6860,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = "{}/v2/organizations/{}/users" \
             .format(self.internal_url, tenant_id)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def fetch_all_invitations(self):
@@ -6413,7 +6882,7 @@ class CapellaAPI(CommonCapellaAPI):
         """
         url = "{}/invitations/{}".format(self.internal_url, invitation_id)
         resp = self.do_internal_request(url, method="PUT",
-                                        params=json.dumps({"action": action}))
+                                        params=APICodec.dumps({"action": action}))
         return resp
 
     def verify_email(self, token):
@@ -6480,7 +6949,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = "{}/v2/organizations/{}/projects/{}/clusters/{}/xdcr" \
             .format(self.internal_url, tenant_id, project_id, cluster_id)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(payload))
+                                        params=APICodec.dumps(payload))
         return resp
 
     def list_cluster_replications(self, tenant_id, project_id, cluster_id):
@@ -6574,7 +7043,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = '{}/v2/organizations/{}/backends'.format(
             self.internal_url, tenant_id)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def get_sgw_backend(self, tenant_id, project_id, cluster_id, backend_id):
@@ -6623,7 +7092,7 @@ class CapellaAPI(CommonCapellaAPI):
             .format(self.internal_url, tenant_id, project_id, cluster_id,
                     backend_id)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def get_sgw_databases(self, tenant_id, project_id, cluster_id, backend_id):
@@ -6671,7 +7140,7 @@ class CapellaAPI(CommonCapellaAPI):
             raise Exception("Fetch public IP failed!")
         body = {"cidr": "{}/32".format(resp.content.decode()), "comment": ""}
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(body))
+                                        params=APICodec.dumps(body))
         return resp
 
     def add_allowed_ip_sgw(
@@ -6686,7 +7155,7 @@ class CapellaAPI(CommonCapellaAPI):
                     cluster_id)
         body = {"cidr": "{}/32".format(ip), "comment": ""}
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(body))
+                                        params=APICodec.dumps(body))
         return resp
 
     def update_sync_function_sgw(
@@ -6701,7 +7170,7 @@ class CapellaAPI(CommonCapellaAPI):
             .format(self.internal_url, tenant_id, project_id, cluster_id,
                     backend_id, db_name)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def add_app_role_sgw(
@@ -6716,7 +7185,7 @@ class CapellaAPI(CommonCapellaAPI):
             .format(self.internal_url, tenant_id, project_id, cluster_id,
                     backend_id, db_name)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def add_user_sgw(
@@ -6731,7 +7200,7 @@ class CapellaAPI(CommonCapellaAPI):
             .format(self.internal_url, tenant_id, project_id, cluster_id,
                     backend_id, db_name)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def add_admin_user_sgw(
@@ -6746,7 +7215,7 @@ class CapellaAPI(CommonCapellaAPI):
             .format(self.internal_url, tenant_id, project_id, cluster_id,
                     backend_id, db_name)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def get_sgw_links(
@@ -6805,7 +7274,7 @@ class CapellaAPI(CommonCapellaAPI):
 
         url = '{}/v2/organizations/{}/projects'.format(self.internal_url, tenant_id)
         api_response = self.do_internal_request(url, method="POST",
-                                                        params=json.dumps(project_details))
+                                                        params=APICodec.dumps(project_details))
         return api_response
     """
 
@@ -6831,7 +7300,7 @@ class CapellaAPI(CommonCapellaAPI):
             .format(self.internal_url, tenant_id, project_id, cluster_id)
         payload = "{\"turnOnAppService\":true}"
         resp = self.do_internal_request(
-            url, method="POST", params=json.dumps(payload))
+            url, method="POST", params=APICodec.dumps(payload))
         return resp
 
     def get_root_ca(self, cluster_id):
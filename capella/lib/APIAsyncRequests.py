@@ -0,0 +1,577 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+import asyncio
+import base64
+import copy
+import logging
+import pprint
+import time
+
+# Other Libs
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+# Owned
+from . import APICodec
+from .APICache import ResponseCache
+from .APIPaginator import aiter_items, aprefetch_items
+from .APIRequests import (
+    APIRequests,
+    _EXPIRED,
+    _apply_deadline,
+    _circuit_open,
+    _deadline_exceeded,
+    _encode_json_body,
+    _finish_request,
+    _time_attempt
+)
+from .APIDeadline import remaining
+from .APIHTTP2 import _httpx_timeout, _require_http2
+from .APIRetry import parse_retry_after
+from .APIExceptions import (
+    MissingAccessKeyError,
+    MissingSecretKeyError,
+    GenericHTTPError,
+    CircuitOpenError,
+    DeadlineExceeded
+)
+
+
+class AsyncAPIRequests(APIRequests):
+    # asyncio counterpart of APIRequests. The api_* and internal request
+    # methods are coroutines, so a single event loop can keep many control
+    # plane calls in flight. Requires the optional httpx package.
+
+    def __init__(self, url, secret=None, access=None, token=None,
+                 max_connections=100, max_keepalive_connections=20,
+                 keepalive_expiry=30, http2=False, **kwargs):
+        super(AsyncAPIRequests, self).__init__(url, secret, access, token,
+                                               **kwargs)
+        self._init_async_session(max_connections, max_keepalive_connections,
+                                 keepalive_expiry, http2)
+
+    def _init_async_session(self, max_connections=100,
+                            max_keepalive_connections=20, keepalive_expiry=30,
+                            http2=False):
+        # Kept separate from __init__ so that the async API classes, whose
+        # init params differ, can set up the async session explicitly.
+        # With http2 concurrent requests to a host are multiplexed over a
+        # few connections, for servers offering HTTP/2.
+        if httpx is None:
+            raise ImportError(
+                "AsyncAPIRequests requires the httpx package, "
+                "install it with 'pip install httpx'")
+        if http2:
+            _require_http2()
+        self._async_http2 = http2
+        self._async_limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry)
+        # Both are bound to the running event loop, so they are only
+        # created on first use
+        self._async_client = None
+        self._async_lock = None
+        # Tasks of the GETs in flight, by key, for request coalescing
+        self._async_inflight = {}
+        # Refreshes happen on the event loop, ahead of expiry, from
+        # get_authorization_internal rather than from a background thread
+        self.token_manager.background = False
+
+    @property
+    def async_session(self):
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                limits=self._async_limits, verify=False, timeout=None,
+                http2=self._async_http2)
+        return self._async_client
+
+    def enable_http2(self, max_connections=None,
+                     max_keepalive_connections=None, keepalive_expiry=None):
+        # Sends every request of this client, api_* and internal ones, over
+        # HTTP/2 with httpx's http2 option, the same as passing http2=True.
+        # The limits given replace those of the async session. Must be
+        # called before the first request, which creates the session.
+        # Requires httpx and h2.
+        _require_http2()
+        if self._async_client is not None:
+            raise RuntimeError(
+                "enable_http2 must be called before the first request, "
+                "or pass http2=True to the client")
+        limits = self._async_limits
+        self._async_limits = httpx.Limits(
+            max_connections=max_connections or limits.max_connections,
+            max_keepalive_connections=(
+                max_keepalive_connections or
+                limits.max_keepalive_connections),
+            keepalive_expiry=keepalive_expiry or limits.keepalive_expiry)
+        self._async_http2 = True
+
+    async def aclose(self):
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def _send_request(self, method, url, auth=None, rate_limiter=None,
+                            **kwargs):
+        # Every HTTP call made by this class goes through here. The request
+        # is rebuilt, and so re-signed, on every attempt
+        kwargs = _encode_json_body(kwargs, "content")
+        if self.compression is not None:
+            kwargs = self.compression.apply(kwargs, "content")
+        timeout = kwargs.pop("timeout", None)
+        if timeout is None:
+            timeout = self.timeout
+        policy = self.retry_policy
+        metrics = self.metrics
+        tracer = self.tracer
+        hedging = self.hedging if method == "GET" else None
+        breaker = self.circuit_breaker
+        span = None
+        if tracer is not None:
+            kwargs["headers"] = dict(kwargs.get("headers") or {})
+            span = tracer.start_request(method, url, kwargs)
+        start = time.monotonic()
+        attempt = 0
+        try:
+            while True:
+                if rate_limiter is not None:
+                    waited = await rate_limiter.acquire_async()
+                    if span is not None:
+                        span.queue_time += waited
+                request_timeout = _apply_deadline(timeout)
+                if request_timeout is _EXPIRED:
+                    raise _deadline_exceeded(metrics, tracer, span, method,
+                                             url, start, attempt, kwargs,
+                                             "content")
+                if breaker is not None:
+                    circuit, wait = breaker.allow(url)
+                    if wait is not None:
+                        raise _circuit_open(metrics, tracer, span, method, url,
+                                            start, attempt, kwargs, "content",
+                                            circuit, wait)
+                request = self.async_session.build_request(
+                    method, url, timeout=_httpx_timeout(request_timeout),
+                    **kwargs)
+                if auth is not None:
+                    request.headers.update(
+                        auth.get_headers(request.method, str(request.url)))
+                sent = time.monotonic()
+                try:
+                    if hedging is None:
+                        resp = await self.async_session.send(request)
+                    else:
+                        resp = await hedging.asend(
+                            url, lambda: self.async_session.send(request),
+                            span)
+                except httpx.TransportError as e:
+                    # Connection, timeout, read/write and protocol errors, the
+                    # ones requests reports as ConnectionError or Timeout
+                    if breaker is not None:
+                        breaker.record(circuit, False)
+                    if isinstance(e, httpx.TimeoutException) and \
+                            _apply_deadline(None) is _EXPIRED:
+                        raise _deadline_exceeded(
+                            metrics, tracer, span, method, url, start, attempt,
+                            kwargs, "content") from e
+                    if policy is None or \
+                            not policy.should_retry_error(method, attempt):
+                        e.retries = attempt
+                        _finish_request(metrics, tracer, span, method, url,
+                                        None, start, attempt, kwargs,
+                                        "content", e)
+                        raise
+                    delay = policy.get_backoff(attempt)
+                    policy.record_retry(url, type(e).__name__)
+                except (httpx.HTTPError, httpx.InvalidURL) as e:
+                    # Never retried: undecodable bodies, too many redirects...
+                    if breaker is not None:
+                        breaker.record(circuit, False)
+                    e.retries = attempt
+                    _finish_request(metrics, tracer, span, method, url, None,
+                                    start, attempt, kwargs, "content", e)
+                    raise
+                else:
+                    if breaker is not None:
+                        breaker.record(
+                            circuit, not breaker.is_failure(resp.status_code))
+                    if span is not None:
+                        _time_attempt(span, resp, time.monotonic() - sent,
+                                      False)
+                    if rate_limiter is not None:
+                        rate_limiter.on_response(resp.status_code,
+                                                 parse_retry_after(resp))
+                    if policy is None or not policy.should_retry(
+                            method, resp.status_code, attempt):
+                        if method != "GET" and self.response_cache is not None:
+                            self.response_cache.invalidate(url)
+                        resp.retries = attempt
+                        _finish_request(metrics, tracer, span, method, url,
+                                        resp, start, attempt, kwargs,
+                                        "content")
+                        return resp
+                    delay = policy.get_backoff(attempt, resp)
+                    policy.record_retry(url, resp.status_code)
+                    await resp.aclose()
+                left = remaining()
+                if left is not None and delay >= left:
+                    # The retry could not be sent in time
+                    raise _deadline_exceeded(metrics, tracer, span, method,
+                                             url, start, attempt, kwargs,
+                                             "content")
+                attempt += 1
+                if span is not None:
+                    span.backoff_time += delay
+                self._log.debug("Retrying %s %s in %.2fs (attempt %s)",
+                                method, url, delay, attempt)
+                await asyncio.sleep(delay)
+        except BaseException as e:
+            # Whatever else ends the call (cancellation, interrupts,
+            # unexpected errors) still ends its span
+            if span is not None and span.duration is None:
+                span.retries = attempt
+                tracer.end_request(span, None, e)
+            raise
+
+    async def _send(self, method, api_endpoint, params=None, headers=None,
+                    json_body=None, data=None, timeout=None):
+        if method != "GET" or self.coalescer is None:
+            return await self._send_signed(method, api_endpoint, params,
+                                           headers, json_body, data, timeout)
+        # Coroutines asking for a GET already in flight await its task
+        key = ResponseCache.make_key(
+            self.API_BASE_URL + api_endpoint, params,
+            self._auth_identity(api_endpoint, headers))
+        task = self._async_inflight.get(key)
+        if task is not None:
+            resp = await asyncio.shield(task)
+            return copy.copy(resp)
+        task = asyncio.ensure_future(self._send_signed(
+            method, api_endpoint, params, headers, json_body, data, timeout))
+        self._async_inflight[key] = task
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if self._async_inflight.get(key) is task:
+                del self._async_inflight[key]
+
+    async def _send_signed(self, method, api_endpoint, params=None,
+                           headers=None, json_body=None, data=None,
+                           timeout=None):
+        # Same rules as the blocking api_* methods: caller supplied
+        # Authorization headers are sent untouched, otherwise the request
+        # is signed by APIAuth against its final URL
+        url = self.API_BASE_URL + api_endpoint
+        kwargs = {
+            "auth": self._get_auth(headers),
+            "rate_limiter": self._get_rate_limiter(api_endpoint, headers),
+            "json": json_body, "content": data, "timeout": timeout}
+        if method == "GET":
+            return await self._cached_get(
+                url, self._auth_identity(api_endpoint, headers), params,
+                headers, **kwargs)
+        return await self._send_request(method, url, params=params,
+                                        headers=headers, **kwargs)
+
+    async def _cached_get(self, url, identity, params=None, headers=None,
+                          **kwargs):
+        cache = self.response_cache
+        if cache is None:
+            return await self._send_request("GET", url, params=params,
+                                            headers=headers, **kwargs)
+        key = cache.make_key(url, params, identity)
+        resp, entry = cache.lookup(key)
+        if resp is not None:
+            return resp
+        if entry is not None:
+            headers = dict(headers or {})
+            headers.update(cache.conditional_headers(entry))
+        resp = await self._send_request("GET", url, params=params,
+                                        headers=headers, **kwargs)
+        if entry is not None and resp.status_code == 304:
+            return cache.revalidated(key, entry, url)
+        cache.store(key, url, resp)
+        return resp
+
+    def _fetch_jwt(self):
+        # The token manager's blocking refresh cannot await the request,
+        # tokens are fetched by get_authorization_internal instead
+        raise TypeError(
+            "AsyncAPIRequests fetches its JWT with "
+            "'await get_authorization_internal()'")
+
+    async def _afetch_jwt(self):
+        basic = base64.b64encode(
+            '{}:{}'.format(
+                self.user,
+                self.pwd).encode()).decode()
+        header = {'Authorization': 'Basic %s' % basic}
+        resp = await self._urllib_request(
+            "{}/sessions".format(self.internal_url), method="POST",
+            headers=header)
+        if resp is None:
+            self._log.error("Could not reach %s/sessions", self.internal_url)
+            return None
+        if resp.status_code != 200:
+            self._log.warning("Response: %s", resp.status_code)
+            self._log.error("Error : %s", resp.content)
+        return APICodec.loads(resp.content).get("jwt")
+
+    async def get_authorization_internal(self):
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        if self.token_manager.needs_refresh():
+            async with self._async_lock:
+                if self.token_manager.needs_refresh():
+                    self._log.debug("refreshing token")
+                    self.jwt = await self._afetch_jwt()
+        cbc_api_request_headers = {
+            'Authorization': 'Bearer %s' % self.jwt,
+            'Content-Type': 'application/json'
+        }
+        return cbc_api_request_headers
+
+    async def do_internal_request(self, url, method, params='', headers={}):
+        attempt = 0
+        while True:
+            header = await self.get_authorization_internal()
+            used_token = header["Authorization"][len("Bearer "):]
+            header.update(headers)
+            resp = await self._urllib_request(
+                url, method, params=params, headers=header)
+            if resp is None or resp.status_code != 401 or \
+                    attempt >= self.max_auth_retries:
+                return resp
+            attempt += 1
+            # Coroutines that got a 401 with an already replaced token
+            # leave the new one alone
+            self.token_manager.invalidate(used_token)
+
+    def iter_listing(self, list_method, *args, prefetch_workers=None,
+                     **kwargs):
+        # The iter_* methods return async generators on this class,
+        # use them with "async for"
+        if kwargs.get("perPage") is None:
+            kwargs.pop("perPage", None)
+
+        def fetch_page(page):
+            return list_method(*args, page=page, **kwargs)
+
+        if prefetch_workers:
+            return aprefetch_items(fetch_page, prefetch_workers)
+        return aiter_items(fetch_page)
+
+    async def _version_headers(self, fetch, headers):
+        # Awaitable form of the "ifmatch" handling of the update_* methods
+        result = await fetch
+        version_id = APICodec.response_json(result)["audit"]["version"]
+        if not headers:
+            headers = {}
+        headers["If-Match"] = "Version: {}".format(version_id)
+        return headers
+
+    # Methods
+    async def api_get(self, api_endpoint, params=None, headers=None,
+                      timeout=None):
+        cbc_api_response = None
+        start = time.time()
+        self._log.info(api_endpoint)
+
+        try:
+            cbc_api_response = await self._send(
+                "GET", api_endpoint, params=params, headers=headers,
+                timeout=timeout)
+            self._log_body(logging.INFO, "", api_endpoint,
+                           cbc_api_response.content)
+
+        except httpx.HTTPStatusError:
+            error = pprint.pformat(
+                APICodec.response_json(cbc_api_response))
+            raise GenericHTTPError(error)
+
+        except MissingAccessKeyError:
+            self._log.debug("Missing Access Key environment variable")
+            print("Missing Access Key environment variable")
+
+        except MissingSecretKeyError:
+            self._log.debug("Missing Access Key environment variable")
+            print("Missing Access Key environment variable")
+
+        # Grab any other exception and send to our generic exception
+        # handler
+        except Exception as e:
+            raise self._api_error(e, api_endpoint, start)
+
+        return (cbc_api_response)
+
+    async def api_post(self, api_endpoint, request_body, headers=None,
+                       timeout=None):
+        cbc_api_response = None
+        start = time.time()
+
+        self._log.info(api_endpoint)
+        self._log_body(logging.DEBUG, "Request body: ", api_endpoint,
+                       request_body)
+
+        try:
+            cbc_api_response = await self._send(
+                "POST", api_endpoint, headers=headers, json_body=request_body,
+                timeout=timeout)
+            self._log_body(logging.DEBUG, "", api_endpoint,
+                           cbc_api_response.content)
+
+        except httpx.HTTPStatusError:
+            error = pprint.pformat(
+                APICodec.response_json(cbc_api_response))
+            raise GenericHTTPError(error)
+
+        except MissingAccessKeyError:
+            print("Missing Access Key environment variable")
+
+        except MissingSecretKeyError:
+            print("Missing Access Key environment variable")
+
+        # Grab any other exception and send to our generic exception
+        # handler
+        except Exception as e:
+            raise self._api_error(e, api_endpoint, start)
+
+        return (cbc_api_response)
+
+    async def api_put(self, api_endpoint, json_request_body=None,
+                      headers=None, data_request_body=None, timeout=None):
+        cbc_api_response = None
+
+        self._log.info(api_endpoint)
+        if json_request_body:
+            self._log_body(logging.DEBUG, "Request body: ", api_endpoint,
+                           json_request_body)
+        if data_request_body:
+            self._log_body(logging.DEBUG, "Request body: ", api_endpoint,
+                           data_request_body)
+        try:
+            cbc_api_response = await self._send(
+                "PUT", api_endpoint, headers=headers,
+                json_body=json_request_body, data=data_request_body,
+                timeout=timeout)
+            self._log_body(logging.DEBUG, "", api_endpoint,
+                           cbc_api_response.content)
+
+        except httpx.HTTPStatusError:
+            error = pprint.pformat(
+                APICodec.response_json(cbc_api_response))
+            raise GenericHTTPError(error)
+
+        except MissingAccessKeyError:
+            print("Missing Access Key environment variable")
+
+        except MissingSecretKeyError:
+            print("Missing Access Key environment variable")
+
+        return (cbc_api_response)
+
+    async def api_patch(self, api_endpoint, request_body, headers=None,
+                        timeout=None):
+        cbc_api_response = None
+
+        self._log.info(api_endpoint)
+        self._log_body(logging.DEBUG, "Request body: ", api_endpoint,
+                       request_body)
+
+        try:
+            cbc_api_response = await self._send(
+                "PATCH", api_endpoint, headers=headers,
+                json_body=request_body, timeout=timeout)
+            self._log_body(logging.DEBUG, "", api_endpoint,
+                           cbc_api_response.content)
+
+        except httpx.HTTPStatusError:
+            error = pprint.pformat(
+                APICodec.response_json(cbc_api_response))
+            raise GenericHTTPError(error)
+
+        except MissingAccessKeyError:
+            print("Missing Access Key environment variable")
+
+        except MissingSecretKeyError:
+            print("Missing Access Key environment variable")
+
+        return (cbc_api_response)
+
+    async def api_del(self, api_endpoint, request_body=None, headers=None,
+                      timeout=None):
+        cbc_api_response = None
+        start = time.time()
+
+        self._log.info(api_endpoint)
+        self._log_body(logging.DEBUG, "Request body: ", api_endpoint,
+                       request_body)
+
+        try:
+            cbc_api_response = await self._send(
+                "DELETE", api_endpoint, headers=headers,
+                json_body=request_body, timeout=timeout)
+            self._log_body(logging.DEBUG, "", api_endpoint,
+                           cbc_api_response.content)
+
+        except httpx.HTTPStatusError:
+            error = pprint.pformat(
+                APICodec.response_json(cbc_api_response))
+            raise GenericHTTPError(error)
+
+        except MissingAccessKeyError:
+            print("Missing Access Key environment variable")
+
+        except MissingSecretKeyError:
+            print("Missing Access Key environment variable")
+
+        # Grab any other exception and send to our generic exception
+        # handler
+        except Exception as e:
+            raise self._api_error(e, api_endpoint, start)
+
+        return (cbc_api_response)
+
+    def stream_download(self, *args, **kwargs):
+        # The blocking implementation cannot run on top of the coroutine
+        # based send path of this class
+        raise TypeError(
+            "AsyncAPIRequests does not support stream_download, use "
+            "APIRequests.stream_download, e.g. from a thread with "
+            "asyncio.to_thread")
+
+    async def _urllib_request(self, api, method='GET', headers=None,
+                              params='', timeout=None, verify=False):
+        # timeout defaults to the client's, or 300s when it has none
+        if timeout is None and self.timeout is None:
+            timeout = 300
+        try:
+            if method == "GET":
+                resp = await self._cached_get(
+                    api, headers and headers.get("Authorization"),
+                    params or None, headers, timeout=timeout)
+            else:
+                resp = await self._send_request(
+                    method, api, content=params or None, headers=headers,
+                    timeout=timeout)
+            return resp
+        except httpx.HTTPStatusError as errh:
+            self._log.error("HTTP Error %s", errh)
+        except httpx.ConnectError as errc:
+            self._log.error("Error Connecting %s", errc)
+        except httpx.TimeoutException as errt:
+            self._log.error("Timeout Error: %s", errt)
+        except httpx.RequestError as err:
+            self._log.error("Something else: %s", err)
+        except CircuitOpenError as err:
+            self._log.error("Circuit open: %s", err)
+        except DeadlineExceeded as err:
+            self._log.error("Deadline exceeded: %s", err)
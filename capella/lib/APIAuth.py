@@ -3,6 +3,7 @@
 import base64
 import hmac
 import hashlib
+from urllib.parse import urlsplit
 from requests.auth import AuthBase
 
 # Other Libs
@@ -14,52 +15,82 @@ import time
 class APIAuth(AuthBase):
     # Extends requests AuthBase for
     # Couchbase Cloud API Authentication Handler.
+    # Meant to be created once per client and re-used for every request,
+    # everything that does not depend on the request is prepared here.
 
     def __init__(self, secret, access, token):
         # Create an authentication handler for Couchbase Cloud APIs
         # :param str access_key: access key for Couchbase Cloud
         # :param str secret_key: secret key for Couchbase Cloud
+        # :param str token: bearer token for the v4 APIs
 
         self.ACCESS_KEY = access
         self.SECRET_KEY = secret
         self.bearer_token = token
 
-    def __call__(self, r):
-        if "v4" in r.url:
-            # Values for the header
-            cbc_api_request_headers = {
-                'Authorization': 'Bearer ' + self.bearer_token,
+        # Without HMAC credentials every request uses the bearer token and
+        # without a token every request is HMAC signed, only clients having
+        # both need to look at the endpoint
+        if secret is None or access is None:
+            self.mode = "bearer"
+        elif token is None:
+            self.mode = "hmac"
+        else:
+            self.mode = "auto"
+
+        self._bearer_headers = None
+        if token is not None:
+            self._bearer_headers = {
+                'Authorization': 'Bearer ' + token,
                 'Content-Type': 'application/json'
             }
-        else:
-            # This is the endpoint being called
-            # Split out from the entire URL
-            endpoint = r.url.split(".com", 1)[-1]
 
-            # The method being used
-            method = r.method
+        # HMAC already keyed with the secret, copied for every signature
+        self._hmac = None
+        if secret is not None:
+            self._hmac = hmac.new(secret.encode(), digestmod=hashlib.sha256)
+        self._access_prefix = 'Bearer {}:'.format(access)
 
-            # Epoch time in milliseconds
-            cbc_api_now = int(time.time() * 1000)
+    def matches(self, secret, access, token):
+        return (self.SECRET_KEY == secret and self.ACCESS_KEY == access
+                and self.bearer_token == token)
 
-            # Form the message string for the Hmac hash
-            cbc_api_message = method + '\n' + endpoint + '\n' + str(cbc_api_now)
+    def get_headers(self, method, url):
+        # Builds the authentication headers for a request, independently of
+        # the HTTP library that is going to send it
+        if self.mode == "bearer":
+            return dict(self._bearer_headers)
+        url = urlsplit(url)
+        if self.mode == "auto" and "v4" in url.path.split("/"):
+            # Values for the header
+            return dict(self._bearer_headers)
 
-            # Calculate the hmac hash value with secret key and message
-            cbc_api_signature = base64.b64encode(
-                hmac.new(self.SECRET_KEY.encode(),
-                         cbc_api_message.encode(),
-                         digestmod=hashlib.sha256).digest())
+        # This is the endpoint being called, path and query string
+        endpoint = url.path
+        if url.query:
+            endpoint += '?' + url.query
 
-            # Values for the header
-            cbc_api_request_headers = {
-               'Authorization': 'Bearer ' + self.ACCESS_KEY + ':' + cbc_api_signature.decode(),
-               'Couchbase-Timestamp': str(cbc_api_now),
-               'Content-Type': 'application/json'
-            }
+        # Epoch time in milliseconds
+        cbc_api_now = str(int(time.time() * 1000))
+
+        # Form the message string for the Hmac hash
+        cbc_api_message = method + '\n' + endpoint + '\n' + cbc_api_now
+
+        # Calculate the hmac hash value with secret key and message
+        signer = self._hmac.copy()
+        signer.update(cbc_api_message.encode())
+        cbc_api_signature = base64.b64encode(signer.digest())
+
+        # Values for the header
+        return {
+            'Authorization': self._access_prefix + cbc_api_signature.decode(),
+            'Couchbase-Timestamp': cbc_api_now,
+            'Content-Type': 'application/json'
+        }
+
+    def __call__(self, r):
         # Add our key:values to the request header
-        r.headers.update(cbc_api_request_headers)
+        r.headers.update(self.get_headers(r.method, r.url))
 
         # Return the request back
         return r
-
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from threading import Lock
+
+from .APIDeadline import deadline
+from .APIExceptions import DeadlineExceeded
+
+
+def _unwrap(error):
+    # CbcAPIError exits by default, the SystemExit carries the error itself
+    if isinstance(error, SystemExit) and isinstance(error.code, BaseException):
+        return error.code
+    return error
+
+
+class BulkResult(object):
+    # Outcome of one job. index is the position of the job in the input,
+    # error is set (and result None) when the call raised, timed out or,
+    # with check_status, returned an HTTP error response.
+
+    def __init__(self, index, job, result=None, error=None, latency=None):
+        self.index = index
+        self.job = job
+        self.result = result
+        self.error = error
+        self.latency = latency
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        return "<BulkResult #{} {}>".format(
+            self.index, "ok" if self.ok else repr(self.error))
+
+
+class BulkCallTimeout(Exception):
+    pass
+
+
+class _Call(object):
+    # Runs in the context it was created in, so the call keeps the
+    # deadline and tracing span of the code submitting it, under a
+    # deadline of `timeout` seconds of its own
+
+    def __init__(self, func, args, kwargs, timeout=None):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.timeout = timeout
+        self.started = None
+        self.context = copy_context()
+
+    def __call__(self):
+        self.started = time.monotonic()
+        return self.context.run(self._run)
+
+    def _run(self):
+        with deadline(self.timeout):
+            return self.func(*self.args, **self.kwargs)
+
+
+class APIBulkExecutor(object):
+    # Runs many API calls on a bounded number of threads, e.g.
+    #   jobs = ((api.fetch_cluster_info, (org, project, cluster))
+    #           for cluster in clusters)
+    #   for result in APIBulkExecutor(workers=8).run(jobs): ...
+    # Jobs are (callable, args) or (callable, args, kwargs) tuples and are
+    # pulled from the iterable only as workers free up, so generators of
+    # any size can be passed in. Results are yielded as the calls complete
+    # and a failing call never stops the others.
+
+    def __init__(self, workers=8, timeout=None, max_pending=None,
+                 check_status=True, grace=1):
+        # :param int workers: calls running at the same time
+        # :param float timeout: seconds a call may run before it is
+        #                       reported as failed, None for no limit. The
+        #                       call runs under an APIDeadline.deadline, so
+        #                       its requests stop with DeadlineExceeded.
+        # :param float grace: seconds past timeout after which a call that
+        #                     is still running (e.g. stuck outside of the
+        #                     HTTP layer) is abandoned and its result
+        #                     dropped. Its thread cannot be interrupted.
+        # :param int max_pending: jobs taken from the input ahead of time,
+        #                         2 * workers by default
+        # :param bool check_status: report responses with a 4xx/5xx status
+        #                           code as failures
+
+        self.workers = workers
+        self.timeout = timeout
+        self.max_pending = max_pending or 2 * workers
+        self.check_status = check_status
+        self.grace = grace
+
+        self._lock = Lock()
+        self._succeeded = 0
+        self._failed = 0
+        self._timed_out = 0
+
+    @staticmethod
+    def _parse(job):
+        if len(job) == 2:
+            return job[0], tuple(job[1]), {}
+        return job[0], tuple(job[1]), dict(job[2] or {})
+
+    def _result(self, index, job, call, future):
+        latency = None
+        if call.started is not None:
+            latency = time.monotonic() - call.started
+        error = future.exception()
+        if error is not None:
+            return self._record(BulkResult(index, job, error=_unwrap(error),
+                                           latency=latency))
+        result = future.result()
+        status_code = getattr(result, "status_code", None)
+        if self.check_status and isinstance(status_code, int) and \
+                status_code >= 400:
+            return self._record(BulkResult(
+                index, job, result=result, latency=latency,
+                error="HTTP {}: {}".format(
+                    status_code, getattr(result, "content", ""))))
+        return self._record(BulkResult(index, job, result=result,
+                                       latency=latency))
+
+    def _record(self, result):
+        with self._lock:
+            if result.ok:
+                self._succeeded += 1
+            else:
+                self._failed += 1
+                if isinstance(result.error,
+                              (BulkCallTimeout, DeadlineExceeded)):
+                    self._timed_out += 1
+        return result
+
+    def _abandon_after(self):
+        if self.timeout is None:
+            return None
+        return self.timeout + self.grace
+
+    def _wait_timeout(self, pending):
+        # How long to wait before the next running call is abandoned
+        abandon_after = self._abandon_after()
+        if abandon_after is None:
+            return None
+        now = time.monotonic()
+        deadlines = [call.started + abandon_after
+                     for _, _, call in pending.values()
+                     if call.started is not None]
+        if not deadlines:
+            return abandon_after
+        return max(0, min(deadlines) - now)
+
+    def run(self, jobs):
+        # Generator of BulkResult, in completion order
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        jobs = enumerate(jobs)
+        exhausted = False
+        pending = {}
+        try:
+            while True:
+                while not exhausted and len(pending) < self.max_pending:
+                    try:
+                        index, job = next(jobs)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    call = _Call(*self._parse(job), timeout=self.timeout)
+                    pending[executor.submit(call)] = (index, job, call)
+                if not pending:
+                    break
+
+                done, _ = wait(list(pending),
+                               timeout=self._wait_timeout(pending),
+                               return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, job, call = pending.pop(future)
+                    yield self._result(index, job, call, future)
+
+                abandon_after = self._abandon_after()
+                if abandon_after is not None:
+                    now = time.monotonic()
+                    for future, (index, job, call) in list(pending.items()):
+                        if call.started is None or \
+                                now - call.started < abandon_after:
+                            continue
+                        del pending[future]
+                        yield self._record(BulkResult(
+                            index, job, latency=now - call.started,
+                            error=BulkCallTimeout(
+                                "Call did not complete within {}s".format(
+                                    self.timeout))))
+        finally:
+            # Stopping early must not leave queued jobs behind
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def run_all(self, jobs):
+        # Runs every job and returns (results in input order, failures)
+        results = sorted(self.run(jobs), key=lambda result: result.index)
+        return results, [result for result in results if not result.ok]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "succeeded": self._succeeded,
+                "failed": self._failed,
+                "timed_out": self._timed_out
+            }
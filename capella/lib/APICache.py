@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+import copy
+import time
+from collections import OrderedDict
+from threading import Lock
+from urllib.parse import urlsplit
+
+from .APIUtils import endpoint_template
+
+
+class _CacheEntry(object):
+
+    def __init__(self, response, path, expires_at):
+        self.response = response
+        self.path = path
+        self.expires_at = expires_at
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+
+    def is_fresh(self, now):
+        return now < self.expires_at
+
+    def has_validators(self):
+        return bool(self.etag or self.last_modified)
+
+
+class ResponseCache(object):
+    # LRU cache of successful GET responses. Entries live for a per
+    # endpoint TTL; once expired, entries that came with an ETag or
+    # Last-Modified header are revalidated with a conditional request
+    # instead of being downloaded again. Any mutation of a path drops the
+    # cached entries of that path, of its sub-resources and of its parents.
+
+    def __init__(self, default_ttl=5, max_entries=1024, ttls=None):
+        # :param float default_ttl: seconds a GET response stays fresh,
+        #                           0 to only cache the endpoints in ttls
+        # :param int max_entries: least recently used entries are evicted
+        #                         past this size
+        # :param dict ttls: {endpoint template: ttl} overrides, templates
+        #                   use {} for ids, e.g.
+        #                   "/v4/organizations/{}/projects/{}/clusters/{}"
+
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.ttls = dict(ttls or {})
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._revalidated = 0
+        self._evictions = 0
+
+    def set_ttl(self, template, ttl):
+        self.ttls[template] = ttl
+
+    def ttl_for(self, url):
+        return self.ttls.get(endpoint_template(url), self.default_ttl)
+
+    @staticmethod
+    def make_key(url, params=None, identity=None):
+        if isinstance(params, dict):
+            params = tuple(sorted((k, str(v)) for k, v in params.items()
+                                  if v is not None))
+        return url, params or None, identity
+
+    def lookup(self, key):
+        # Returns (response, entry). response is a copy of the cached
+        # response when it is still fresh, otherwise None and entry (if
+        # any) holds the validators for a conditional request.
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None, None
+            self._entries.move_to_end(key)
+            if entry.is_fresh(now):
+                self._hits += 1
+                return copy.copy(entry.response), entry
+            self._misses += 1
+            if not entry.has_validators():
+                del self._entries[key]
+                return None, None
+            return None, entry
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def revalidated(self, key, entry, url):
+        # The server answered 304, the cached response is good for another
+        # TTL
+        with self._lock:
+            self._revalidated += 1
+            entry.expires_at = time.monotonic() + self.ttl_for(url)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            return copy.copy(entry.response)
+
+    def store(self, key, url, response):
+        if response is None or response.status_code != 200:
+            return
+        ttl = self.ttl_for(url)
+        if ttl <= 0:
+            return
+        entry = _CacheEntry(response, urlsplit(url).path,
+                            time.monotonic() + ttl)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, url):
+        path = urlsplit(url).path.rstrip("/")
+        with self._lock:
+            for key in [key for key, entry in self._entries.items()
+                        if entry.path == path
+                        or entry.path.startswith(path + "/")
+                        or path.startswith(entry.path + "/")]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "revalidated": self._revalidated,
+                "evictions": self._evictions
+            }
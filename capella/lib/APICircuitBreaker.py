@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+import time
+from threading import Lock
+
+from urllib.parse import urlsplit
+
+from .APIUtils import endpoint_template
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class _Circuit(object):
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.probes = 0
+        self.probe_started = None
+        self.rejected = 0
+        self.times_opened = 0
+
+
+class CircuitBreaker(object):
+    # Stops sending requests to an endpoint group that keeps failing, so
+    # callers fail fast with CircuitOpenError instead of each waiting out
+    # its timeouts, while the other groups are unaffected.
+    # A group is keyed by endpoint template ("endpoint"), by host ("host")
+    # or by key(url) when key is a callable. Its circuit:
+    #   closed     requests flow, failure_threshold consecutive failures
+    #              open it
+    #   open       requests are rejected for recovery_time seconds, then
+    #              the circuit goes half-open
+    #   half_open  up to half_open_calls requests are let through as
+    #              probes, a success closes the circuit, a failure opens it
+    #              again
+    # Connection errors, timeouts and failure_statuses are failures, any
+    # other response is a success.
+
+    def __init__(self, failure_threshold=5, recovery_time=30,
+                 half_open_calls=1, key="endpoint",
+                 failure_statuses=(500, 502, 503, 504)):
+        # :param int failure_threshold: consecutive failures opening a
+        #                               circuit
+        # :param float recovery_time: seconds a circuit stays open
+        # :param int half_open_calls: probes allowed while half-open
+        # :param key: "endpoint", "host" or a callable taking the URL
+        # :param tuple failure_statuses: status codes counted as failures
+
+        if key == "endpoint":
+            key = endpoint_template
+        elif key == "host":
+            key = _host
+        elif not callable(key):
+            raise ValueError("key must be 'endpoint', 'host' or a callable")
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.half_open_calls = half_open_calls
+        self.failure_statuses = frozenset(failure_statuses)
+        self._key = key
+        self._circuits = {}
+        self._lock = Lock()
+
+    def _circuit(self, key):
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = _Circuit()
+        return circuit
+
+    def allow(self, url):
+        # Returns (key, None) when the request may be sent, (key, seconds
+        # until the next probe) when it must be rejected
+        key = self._key(url)
+        now = time.monotonic()
+        with self._lock:
+            circuit = self._circuit(key)
+            if circuit.state == OPEN:
+                wait = circuit.opened_at + self.recovery_time - now
+                if wait > 0:
+                    circuit.rejected += 1
+                    return key, wait
+                circuit.state = HALF_OPEN
+                circuit.probes = 0
+            if circuit.state == HALF_OPEN:
+                # A probe that never reported back (e.g. its caller died)
+                # frees its slot after recovery_time
+                if circuit.probes >= self.half_open_calls and \
+                        now - circuit.probe_started < self.recovery_time:
+                    circuit.rejected += 1
+                    return key, circuit.probe_started + \
+                        self.recovery_time - now
+                if circuit.probes >= self.half_open_calls:
+                    circuit.probes = 0
+                circuit.probes += 1
+                circuit.probe_started = now
+            return key, None
+
+    def is_failure(self, status_code):
+        return status_code in self.failure_statuses
+
+    def record(self, key, success):
+        with self._lock:
+            circuit = self._circuit(key)
+            if success:
+                circuit.state = CLOSED
+                circuit.failures = 0
+                circuit.probes = 0
+                return
+            circuit.failures += 1
+            if circuit.state == HALF_OPEN or (
+                    circuit.state == CLOSED and
+                    circuit.failures >= self.failure_threshold):
+                circuit.state = OPEN
+                circuit.opened_at = time.monotonic()
+                circuit.times_opened += 1
+
+    def state(self, url):
+        key = self._key(url)
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                return CLOSED
+            if circuit.state == OPEN and time.monotonic() >= \
+                    circuit.opened_at + self.recovery_time:
+                return HALF_OPEN
+            return circuit.state
+
+    def reset(self, url=None):
+        # Closes the circuit of url's group, or every circuit
+        with self._lock:
+            if url is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop(self._key(url), None)
+
+    def stats(self):
+        # {group key: {...}}
+        with self._lock:
+            return dict((key, {
+                "state": circuit.state,
+                "failures": circuit.failures,
+                "rejected": circuit.rejected,
+                "times_opened": circuit.times_opened
+            }) for key, circuit in self._circuits.items())
+
+
+def _host(url):
+    return urlsplit(url).netloc
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+import hashlib
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from .APIPool import APIConnectionPool
+from .APITransport import APITransport
+
+
+def _default_factory(url, secret, access, user, pwd, bearer_token,
+                     transport):
+    # Imported here, the dedicated package itself depends on this one
+    from ..dedicated.CapellaAPI_v4 import CapellaAPI
+    return CapellaAPI(url, secret, access, user, pwd, bearer_token,
+                      transport=transport)
+
+
+class APIClientManager(object):
+    # Hands out one client per (base URL, credentials), so services driving
+    # many organizations re-use clients and their connections instead of
+    # building a new client per call. Clients are kept in LRU order: past
+    # max_clients, or after idle_timeout seconds without use, a client is
+    # dropped and its connections closed. Every client gets an equal share
+    # of max_connections, which caps the connections open across tenants:
+    # its api_*, internal and support calls all go through a connection
+    # pool of its own, holding pool_maxsize connections to each of at most
+    # hosts_per_client hosts.
+
+    def __init__(self, factory=None, max_clients=32, max_connections=320,
+                 idle_timeout=None, pool_block=True, hosts_per_client=2):
+        # :param callable factory: factory(url, secret, access, user, pwd,
+        #                          bearer_token, transport) returning the
+        #                          client, a dedicated v4 CapellaAPI by
+        #                          default
+        # :param int max_clients: clients kept at most
+        # :param int max_connections: connections kept open at most by all
+        #                             the clients together
+        # :param float idle_timeout: seconds an unused client is kept, None
+        #                            to only evict on max_clients
+        # :param bool pool_block: wait for a free connection rather than
+        #                         opening more than a client's share
+        # :param int hosts_per_client: hosts a client talks to, the public
+        #                              API and the internal one by default
+
+        self.factory = factory or _default_factory
+        self.max_clients = max_clients
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.pool_block = pool_block
+        self.hosts_per_client = hosts_per_client
+        self.pool_maxsize = max(
+            1, max_connections // (max_clients * hosts_per_client))
+
+        self._clients = OrderedDict()
+        self._lock = Lock()
+        self._created = 0
+        self._evicted = 0
+
+    @staticmethod
+    def _key(url, secret, access, user, pwd, bearer_token):
+        # Only a digest of the credentials is kept
+        credentials = "\0".join(str(value) for value in (
+            secret, access, user, pwd, bearer_token))
+        return url, hashlib.sha256(credentials.encode()).hexdigest()
+
+    def _new_transport(self):
+        # The api_* calls use the session of the client's pool too, so the
+        # pool bounds everything the client keeps open
+        pool = APIConnectionPool(pool_connections=self.hosts_per_client,
+                                 pool_maxsize=self.pool_maxsize,
+                                 pool_block=self.pool_block)
+        return APITransport(pool=pool, session=pool.session)
+
+    def get_client(self, url, secret=None, access=None, user=None, pwd=None,
+                   bearer_token=None):
+        key = self._key(url, secret, access, user, pwd, bearer_token)
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._clients.get(key)
+            if entry is None:
+                transport = self._new_transport()
+                client = self.factory(url, secret, access, user, pwd,
+                                      bearer_token, transport)
+                self._created += 1
+                self._clients[key] = [client, now, transport.pool]
+                while len(self._clients) > self.max_clients:
+                    self._close(self._clients.popitem(last=False)[1])
+            else:
+                client = entry[0]
+                entry[1] = now
+                self._clients.move_to_end(key)
+        return client
+
+    def _evict_idle(self, now):
+        # Must be called with self._lock held
+        if self.idle_timeout is None:
+            return
+        while self._clients:
+            key, entry = next(iter(self._clients.items()))
+            if now - entry[1] < self.idle_timeout:
+                break
+            del self._clients[key]
+            self._close(entry)
+
+    def _close(self, entry):
+        # The pool belongs to the client alone, APITransport.close leaves
+        # it open
+        self._evicted += 1
+        client, _, pool = entry
+        client.close()
+        pool.close()
+
+    def remove_client(self, url, secret=None, access=None, user=None,
+                      pwd=None, bearer_token=None):
+        key = self._key(url, secret, access, user, pwd, bearer_token)
+        with self._lock:
+            entry = self._clients.pop(key, None)
+            if entry is not None:
+                self._close(entry)
+        return entry is not None
+
+    def close(self):
+        with self._lock:
+            entries = list(self._clients.values())
+            self._clients.clear()
+        for client, _, pool in entries:
+            client.close()
+            pool.close()
+
+    def __len__(self):
+        return len(self._clients)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "clients": len(self._clients),
+                "created": self._created,
+                "evicted": self._evicted,
+                "pool_maxsize": self.pool_maxsize
+            }
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+import copy
+from threading import Event, Lock
+
+
+class _InFlight(object):
+
+    def __init__(self):
+        self.done = Event()
+        self.response = None
+        self.error = None
+
+
+class RequestCoalescer(object):
+    # Single-flight for GET requests: while a request is in flight, callers
+    # asking for the same key wait for it and get a copy of its response
+    # instead of sending their own. Nothing is kept once the request
+    # completes, see ResponseCache for that.
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = Lock()
+        self._sent = 0
+        self._coalesced = 0
+
+    def do(self, key, send):
+        # Returns send()'s response, or a copy of the response of the
+        # identical call already in flight
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _InFlight()
+                self._calls[key] = call
+                self._sent += 1
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            # Each caller gets its own response object, the body is shared
+            # and decoded by each caller, so results can be modified freely
+            return copy.copy(call.response)
+
+        try:
+            call.response = send()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.response
+
+    def stats(self):
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "sent": self._sent,
+                "coalesced": self._coalesced
+            }
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# JSON encoding/decoding of request and response bodies. orjson is used
+# when it is installed, as it is several times faster than the stdlib on
+# the large listings some endpoints return, otherwise everything goes
+# through the json module. set_codec() switches between the two.
+# Generic/Built-in
+import json
+
+# Other Libs
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class _StdlibCodec(object):
+    name = "json"
+
+    @staticmethod
+    def dumps(obj):
+        return json.dumps(obj)
+
+    @staticmethod
+    def encode(obj):
+        return json.dumps(obj).encode()
+
+    @staticmethod
+    def loads(data):
+        return json.loads(data)
+
+
+class _OrjsonCodec(object):
+    # orjson rejects a few things the json module accepts (integers past
+    # 64 bits, non string keys), those objects are handed to the json
+    # module instead
+    name = "orjson"
+
+    @staticmethod
+    def dumps(obj):
+        try:
+            text = orjson.dumps(obj).decode()
+        except TypeError:
+            return json.dumps(obj)
+        # The str is often sent as a request body, which http.client
+        # encodes as latin-1, keep it ASCII as json.dumps does
+        if not text.isascii():
+            return json.dumps(obj)
+        return text
+
+    @staticmethod
+    def encode(obj):
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            return json.dumps(obj).encode()
+
+    @staticmethod
+    def loads(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # e.g. NaN/Infinity, which only the json module accepts
+            return json.loads(data)
+
+
+_codecs = {"json": _StdlibCodec}
+if orjson is not None:
+    _codecs["orjson"] = _OrjsonCodec
+
+_codec = _OrjsonCodec if orjson is not None else _StdlibCodec
+
+
+def set_codec(name):
+    # "json" or "orjson" (when installed)
+    global _codec
+    if name not in _codecs:
+        raise ValueError("Unknown or unavailable JSON codec {}, available: "
+                         "{}".format(name, ", ".join(sorted(_codecs))))
+    _codec = _codecs[name]
+
+
+def get_codec():
+    return _codec.name
+
+
+def dumps(obj, **kwargs):
+    # str, like json.dumps. Formatting options (indent, sort_keys, ...)
+    # are only supported by the json module.
+    if kwargs:
+        return json.dumps(obj, **kwargs)
+    return _codec.dumps(obj)
+
+
+def encode(obj):
+    # bytes, for request bodies
+    return _codec.encode(obj)
+
+
+def loads(data):
+    return _codec.loads(data)
+
+
+def response_json(response):
+    # Replacement for response.json(), works for requests and httpx
+    # responses
+    return _codec.loads(response.content)
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+import gzip
+
+from urllib3.util.request import ACCEPT_ENCODING as _DECODABLE
+
+# Response encodings advertised: gzip and deflate, plus br and zstd when
+# the brotli/zstandard packages are installed, which is when both urllib3
+# (requests) and httpx can decode them
+ACCEPT_ENCODING = ", ".join(_DECODABLE.split(","))
+
+
+class _CompressedBody(bytes):
+    # gzip'd request body, remembering the size it was compressed from for
+    # the metrics
+    raw_size = 0
+
+
+class BodyCompression(object):
+    # Advertises the response encodings the client can decode and gzips
+    # request bodies of at least `threshold` bytes, see
+    # APIRequests.enable_compression. Responses are decoded by the HTTP
+    # library. Bodies that do not shrink, and requests already carrying a
+    # Content-Encoding or an Accept-Encoding header, are left alone.
+
+    def __init__(self, threshold=1024, level=6, compress_requests=True):
+        # :param int threshold: smallest request body gzipped, in bytes
+        # :param int level: gzip compression level, 1 (fast) to 9 (small)
+        # :param bool compress_requests: gzip request bodies at all
+
+        self.threshold = threshold
+        self.level = level
+        self.compress_requests = compress_requests
+
+    def apply(self, kwargs, body_key):
+        headers = dict(kwargs.get("headers") or {})
+        names = set(name.lower() for name in headers)
+        if "accept-encoding" not in names:
+            headers["Accept-Encoding"] = ACCEPT_ENCODING
+        kwargs["headers"] = headers
+        body = kwargs.get(body_key)
+        if not self.compress_requests or "content-encoding" in names or \
+                not isinstance(body, (bytes, str)) or \
+                len(body) < self.threshold:
+            return kwargs
+        if isinstance(body, str):
+            body = body.encode()
+        compressed = gzip.compress(body, self.level, mtime=0)
+        if len(compressed) >= len(body):
+            return kwargs
+        kwargs[body_key] = _CompressedBody(compressed)
+        kwargs[body_key].raw_size = len(body)
+        headers["Content-Encoding"] = "gzip"
+        return kwargs
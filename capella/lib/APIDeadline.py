@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+import contextvars
+import time
+from contextlib import contextmanager
+
+# Monotonic time by which the calls of the current thread or task must be
+# done, None when there is no deadline
+_deadline = contextvars.ContextVar("capella_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds):
+    # Every request sent inside the block has to complete within `seconds`
+    # of entering it: timeouts are cut down to the time left and requests
+    # past it raise DeadlineExceeded. Nested blocks can only shorten the
+    # deadline, so a multi-call helper run under a deadline hands each
+    # step whatever is left of it. seconds=None leaves things as they are.
+    if seconds is None:
+        yield remaining()
+        return
+    new_deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        new_deadline = min(current, new_deadline)
+    token = _deadline.set(new_deadline)
+    try:
+        yield new_deadline - time.monotonic()
+    finally:
+        _deadline.reset(token)
+
+
+def remaining():
+    # Seconds left before the current deadline, None without one
+    current = _deadline.get()
+    if current is None:
+        return None
+    return current - time.monotonic()
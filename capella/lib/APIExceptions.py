@@ -7,13 +7,47 @@ import inspect
 class CbcAPIError(Exception):
     #Base class for our custom exceptions
     #Stops the traceback information being shown
-    def __init__(self, msg):
+    #When exit_on_error is False the error is raised as an ordinary exception
+    #instead, so one failed call does not tear down a worker thread/process
+    exit_on_error = True
+
+    def __init__(self, msg, status_code=None, endpoint=None, latency=None,
+                 retries=None, response=None):
         try:
             ln = sys.exc_info()[-1].tb_lineno
         except AttributeError:
             ln = inspect.currentframe().f_back.f_lineno
         self.args = "{0.__name__} : {1}".format(type(self), msg),
-        sys.exit(self)
+        self.msg = msg
+        self.status_code = status_code
+        self.endpoint = endpoint
+        self.latency = latency
+        self.retries = retries
+        self.response = response
+        if self.exit_on_error:
+            sys.exit(self)
+
+    def __reduce__(self):
+        # Keeps the error intact when it crosses a process pool boundary,
+        # without running __init__, and so sys.exit, on the receiving end.
+        # The response is left behind.
+        state = dict(self.__dict__)
+        state["response"] = None
+        return _rebuild_error, (type(self), self.args, state)
+
+
+def _rebuild_error(cls, args, state):
+    #Unpickles a CbcAPIError, see CbcAPIError.__reduce__
+    error = cls.__new__(cls)
+    error.args = args
+    error.__dict__.update(state)
+    return error
+
+
+def set_exit_on_error(exit_on_error):
+    #Switches every CbcAPIError (and subclass) between exiting the process,
+    #the historical behaviour, and being raised as a regular exception
+    CbcAPIError.exit_on_error = exit_on_error
 
 
 class MissingAccessKeyError(CbcAPIError):
@@ -49,3 +83,31 @@ class GenericHTTPError(CbcAPIError):
     # Raised for generic http errors resulting
     # from calling the API
     pass
+
+
+class PageFetchError(GenericHTTPError):
+    #Raised when a page of a paginated listing comes back with an error,
+    #see APIPaginator. One bad page must not end the process, whatever
+    #exit_on_error says
+    exit_on_error = False
+
+
+class IncompleteDownloadError(CbcAPIError):
+    #Raised when a streamed download ends with fewer (or more) bytes than
+    #the server announced
+    pass
+
+
+class DeadlineExceeded(CbcAPIError):
+    #Raised when a request cannot complete before the deadline it runs
+    #under, see APIDeadline.deadline
+    #Running out of time must not end the process, whatever exit_on_error
+    #says
+    exit_on_error = False
+
+
+class CircuitOpenError(CbcAPIError):
+    #Raised without sending the request while the circuit breaker of its
+    #endpoint group is open, see APICircuitBreaker.CircuitBreaker
+    #Failing fast must not end the process, whatever exit_on_error says
+    exit_on_error = False
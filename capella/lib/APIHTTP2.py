@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+from threading import Lock
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Other Libs
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+# Connection specific headers, which HTTP/2 forbids
+_HOP_BY_HOP = frozenset(("connection", "keep-alive", "proxy-connection",
+                         "transfer-encoding", "upgrade", "host"))
+
+
+def _httpx_timeout(timeout):
+    # requests style (connect, read) or single value timeout to httpx's
+    if timeout is None or not isinstance(timeout, tuple):
+        return httpx.Timeout(timeout)
+    connect, read = timeout
+    return httpx.Timeout(None, connect=connect, read=read, write=read,
+                         pool=connect)
+
+
+def _require_http2():
+    if httpx is None:
+        raise ImportError(
+            "HTTP/2 requires the httpx package with its http2 extra, "
+            "install it with 'pip install httpx[http2]'")
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        raise ImportError(
+            "HTTP/2 requires the h2 package, install it with "
+            "'pip install httpx[http2]'")
+
+
+class _HTTPXBody(object):
+    # What requests expects to find in response.raw, reading from an httpx
+    # response. Bodies are decoded (gzip, ...) by httpx.
+
+    def __init__(self, response):
+        self._response = response
+        self._buffer = b""
+        self._chunks = None
+
+    def stream(self, amt=None, decode_content=True):
+        # Used by requests.Response.iter_content
+        try:
+            for chunk in self._response.iter_bytes(amt):
+                yield chunk
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.ConnectionError(e)
+        except httpx.TransportError as e:
+            raise requests.exceptions.ChunkedEncodingError(e)
+
+    def read(self, amt=None, decode_content=True):
+        if self._chunks is None:
+            self._chunks = self.stream()
+        data = self._buffer
+        while amt is None or len(data) < amt:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            data += chunk
+        if amt is None:
+            self._buffer = b""
+            return data
+        self._buffer = data[amt:]
+        return data[:amt]
+
+    def tell(self):
+        # Bytes received on the wire, before decoding
+        return self._response.num_bytes_downloaded
+
+    def close(self):
+        self._response.close()
+
+    def release_conn(self):
+        self._response.close()
+
+
+class HTTP2Adapter(BaseAdapter):
+    # requests transport adapter sending requests over HTTP/2 with httpx,
+    # so that concurrent calls to a host are multiplexed as streams of a
+    # few connections instead of each taking a connection of its own.
+    # Everything above the adapter (auth handlers, APIAuth signing, JWT
+    # headers, hooks, retries, responses) is plain requests. Servers
+    # not offering HTTP/2 in the TLS handshake are spoken HTTP/1.1 to.
+    # Mount it for https:// only, HTTP/2 is negotiated through TLS.
+
+    def __init__(self, max_connections=10, max_keepalive_connections=10,
+                 keepalive_expiry=30):
+        # :param int max_connections: connections open at once, each
+        #                             carries many concurrent requests
+        # :param int max_keepalive_connections: idle connections kept
+        # :param float keepalive_expiry: seconds an idle connection is kept
+
+        _require_http2()
+        super(HTTP2Adapter, self).__init__()
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry)
+        # One client per verify setting, which httpx fixes per client
+        self._clients = {}
+        self._lock = Lock()
+
+    def _client(self, verify):
+        key = verify if isinstance(verify, (bool, str)) else True
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self._clients[key] = httpx.Client(
+                        http2=True, verify=key, limits=self._limits,
+                        follow_redirects=False)
+        return client
+
+    def send(self, request, stream=False, timeout=None, verify=True,
+             cert=None, proxies=None):
+        client = self._client(verify)
+        headers = [(name, value) for name, value in request.headers.items()
+                   if name.lower() not in _HOP_BY_HOP]
+        body = request.body
+        if body is not None and not isinstance(body, (bytes, str)):
+            # Generators and file objects
+            body = b"".join(
+                chunk if isinstance(chunk, bytes) else chunk.encode()
+                for chunk in body)
+        try:
+            resp = client.send(
+                client.build_request(request.method, request.url,
+                                     headers=headers, content=body,
+                                     timeout=_httpx_timeout(timeout)),
+                stream=True)
+        except httpx.ConnectTimeout as e:
+            raise requests.exceptions.ConnectTimeout(e, request=request)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.ReadTimeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e, request=request)
+        return self.build_response(request, resp)
+
+    def build_response(self, request, resp):
+        response = requests.Response()
+        response.status_code = resp.status_code
+        response.headers = CaseInsensitiveDict(resp.headers.items())
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = _HTTPXBody(resp)
+        response.reason = resp.reason_phrase
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.http_version = resp.http_version
+        return response
+
+    def stats(self):
+        # Connections currently open, and how many requests they carry
+        connections = []
+        with self._lock:
+            clients = list(self._clients.values())
+        for client in clients:
+            pool = getattr(client._transport, "_pool", None)
+            for connection in getattr(pool, "connections", []):
+                connections.append(connection.info())
+        return {"connections": len(connections), "info": connections}
+
+    def close(self):
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            client.close()
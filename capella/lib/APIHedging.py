@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from threading import Lock
+
+from .APIUtils import endpoint_template
+
+
+class HedgePolicy(object):
+    # Hedged requests for GETs. When the first request has not answered
+    # after the `percentile` latency of the recent requests to its
+    # endpoint template, an identical second request is sent and whichever
+    # answers first is used, the other one is dropped. Endpoints with fewer
+    # than min_samples recent requests are not hedged.
+    # The extra load is capped by a budget shared by every endpoint: each
+    # GET earns `budget` of a hedge and a hedge spends a whole one, with at
+    # most max_burst banked, so budget=0.05 adds at most ~5% requests.
+
+    def __init__(self, percentile=0.95, budget=0.05, max_burst=10,
+                 window=200, min_samples=20, min_delay=0.01, max_delay=None,
+                 max_workers=64):
+        # :param float percentile: recent latency quantile after which a
+        #                          request is hedged
+        # :param float budget: hedges earned per GET
+        # :param int max_burst: hedges that can be banked
+        # :param int window: recent latencies kept per endpoint
+        # :param int min_samples: latencies needed before hedging
+        # :param float min_delay: lower bound of the hedging delay, seconds
+        # :param float max_delay: upper bound of the hedging delay, seconds
+        # :param int max_workers: threads sending the blocking requests
+
+        self.percentile = percentile
+        self.budget = budget
+        self.max_burst = max_burst
+        self.window = window
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.max_workers = max_workers
+        self._latencies = {}
+        self._tokens = 0.0
+        self._lock = Lock()
+        self._executor = None
+        self._requests = 0
+        self._hedged = 0
+        self._hedge_wins = 0
+        self._budget_denied = 0
+
+    def _delay(self, key):
+        # Seconds to wait before hedging, None when the endpoint is not
+        # hedged. Every call earns its share of the budget.
+        with self._lock:
+            self._requests += 1
+            self._tokens = min(self.max_burst, self._tokens + self.budget)
+            latencies = self._latencies.get(key)
+            if latencies is None or len(latencies) < self.min_samples:
+                return None
+            ordered = sorted(latencies)
+        delay = ordered[min(len(ordered) - 1,
+                            int(self.percentile * len(ordered)))]
+        delay = max(delay, self.min_delay)
+        if self.max_delay is not None:
+            delay = min(delay, self.max_delay)
+        return delay
+
+    def _take_hedge(self):
+        with self._lock:
+            if self._tokens < 1:
+                self._budget_denied += 1
+                return False
+            self._tokens -= 1
+            self._hedged += 1
+            return True
+
+    def _observe(self, key, latency):
+        with self._lock:
+            latencies = self._latencies.get(key)
+            if latencies is None:
+                latencies = self._latencies[key] = deque(maxlen=self.window)
+            latencies.append(latency)
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix="capella-hedge")
+            return self._executor
+
+    def _timed(self, key, send):
+        start = time.monotonic()
+        resp = send()
+        self._observe(key, time.monotonic() - start)
+        return resp
+
+    @staticmethod
+    def _winner(done):
+        # First attempt that returned a response, None if all raised
+        for attempt in done:
+            if attempt.exception() is None:
+                return attempt
+        return None
+
+    def send(self, url, send, close, span=None):
+        # Returns send()'s response, hedged as described above. The losing
+        # request cannot be interrupted, its response is passed to close()
+        # once it arrives. Errors are only raised when both requests fail.
+        key = endpoint_template(url)
+        delay = self._delay(key)
+        if delay is None:
+            return self._timed(key, send)
+        executor = self._get_executor()
+        first = executor.submit(self._timed, key, send)
+        done, _ = wait([first], timeout=delay)
+        if done or not self._take_hedge():
+            return first.result()
+        if span is not None:
+            span.attributes["hedged"] = True
+        second = executor.submit(self._timed, key, send)
+        pending = {first, second}
+        winner = None
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = self._winner(done)
+        if winner is None:
+            return first.result()
+        if winner is second:
+            with self._lock:
+                self._hedge_wins += 1
+            if span is not None:
+                span.attributes["hedge_won"] = True
+        for attempt in pending:
+            attempt.add_done_callback(self._close_later(close))
+        return winner.result()
+
+    @staticmethod
+    def _close_later(close):
+        def callback(attempt):
+            if attempt.exception() is None:
+                close(attempt.result())
+        return callback
+
+    async def _atimed(self, key, send):
+        start = time.monotonic()
+        resp = await send()
+        self._observe(key, time.monotonic() - start)
+        return resp
+
+    async def asend(self, url, send, span=None):
+        # asyncio form of send(), send returns an awaitable. The losing
+        # request is cancelled.
+        key = endpoint_template(url)
+        delay = self._delay(key)
+        if delay is None:
+            return await self._atimed(key, send)
+        first = asyncio.ensure_future(self._atimed(key, send))
+        pending = {first}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done or not self._take_hedge():
+                return await first
+            if span is not None:
+                span.attributes["hedged"] = True
+            second = asyncio.ensure_future(self._atimed(key, send))
+            pending.add(second)
+            winner = None
+            while pending and winner is None:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = self._winner(done)
+        finally:
+            for attempt in pending:
+                attempt.cancel()
+        if winner is None:
+            return await first
+        if winner is second:
+            with self._lock:
+                self._hedge_wins += 1
+            if span is not None:
+                span.attributes["hedge_won"] = True
+        return winner.result()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "hedged": self._hedged,
+                "hedge_wins": self._hedge_wins,
+                "budget_denied": self._budget_denied,
+                "budget_left": self._tokens
+            }
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
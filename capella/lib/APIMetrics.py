@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+import bisect
+from threading import Lock
+
+from .APIUtils import endpoint_template
+
+# Upper bounds, in seconds, of the latency histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0, 30.0, 60.0, 120.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n") \
+        .replace('"', '\\"')
+
+
+def _labels(**labels):
+    return ",".join('{}="{}"'.format(name, _escape(value))
+                    for name, value in labels.items())
+
+
+def _ratio(size, wire_size):
+    return size / wire_size if wire_size else None
+
+
+class _EndpointStats(object):
+
+    def __init__(self, buckets):
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.statuses = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        # Same, as sent/received on the wire, i.e. compressed
+        self.wire_bytes_sent = 0
+        self.wire_bytes_received = 0
+        self.latency_sum = 0.0
+        # One counter per bucket plus the +Inf one, not cumulative
+        self.bucket_counts = [0] * (len(buckets) + 1)
+
+    def quantile(self, q, buckets):
+        # Estimated like Prometheus' histogram_quantile: linear
+        # interpolation inside the bucket holding the q-th observation
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, in_bucket in enumerate(self.bucket_counts):
+            if in_bucket and seen + in_bucket >= rank:
+                if i == len(buckets):
+                    # +Inf bucket, the best we can say is its lower bound
+                    return buckets[-1]
+                lower = buckets[i - 1] if i else 0.0
+                return lower + (buckets[i] - lower) * \
+                    (rank - seen) / in_bucket
+            seen += in_bucket
+        return buckets[-1]
+
+
+class APIMetrics(object):
+    # Per endpoint counters and latency histograms of the requests sent by
+    # the clients it is attached to (see APIRequests.enable_metrics).
+    # Endpoints are keyed by method and endpoint template, so e.g. every
+    # cluster's info call lands under
+    # GET /v4/organizations/{}/projects/{}/clusters/{}.
+    # Query it with snapshot() or export it with to_prometheus().
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, prefix="capella_api"):
+        # :param tuple buckets: latency histogram upper bounds in seconds
+        # :param str prefix: prefix of the exported metric names
+
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self._endpoints = {}
+        self._lock = Lock()
+
+    def _stats(self, method, url):
+        key = (endpoint_template(url), method)
+        stats = self._endpoints.get(key)
+        if stats is None:
+            stats = self._endpoints.setdefault(
+                key, _EndpointStats(self.buckets))
+        return stats
+
+    def record(self, method, url, status_code, latency, bytes_sent=0,
+               bytes_received=0, retries=0, error=False,
+               wire_bytes_sent=None, wire_bytes_received=None):
+        # status_code is None when no response was received. The wire
+        # sizes default to the body sizes, i.e. no compression.
+        with self._lock:
+            stats = self._stats(method, url)
+            stats.count += 1
+            stats.retries += retries or 0
+            if error or status_code is None or status_code >= 400:
+                stats.errors += 1
+            status = str(status_code) if status_code is not None \
+                else "error"
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.bytes_sent += bytes_sent or 0
+            stats.bytes_received += bytes_received or 0
+            if wire_bytes_sent is None:
+                wire_bytes_sent = bytes_sent
+            if wire_bytes_received is None:
+                wire_bytes_received = bytes_received
+            stats.wire_bytes_sent += wire_bytes_sent or 0
+            stats.wire_bytes_received += wire_bytes_received or 0
+            stats.latency_sum += latency
+            stats.bucket_counts[
+                bisect.bisect_left(self.buckets, latency)] += 1
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def snapshot(self):
+        # {(endpoint template, method): {...}}
+        with self._lock:
+            result = {}
+            for key, stats in self._endpoints.items():
+                result[key] = {
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "retries": stats.retries,
+                    "statuses": dict(stats.statuses),
+                    "bytes_sent": stats.bytes_sent,
+                    "bytes_received": stats.bytes_received,
+                    "wire_bytes_sent": stats.wire_bytes_sent,
+                    "wire_bytes_received": stats.wire_bytes_received,
+                    # Body bytes per byte on the wire, 1.0 uncompressed
+                    "request_compression_ratio": _ratio(
+                        stats.bytes_sent, stats.wire_bytes_sent),
+                    "response_compression_ratio": _ratio(
+                        stats.bytes_received, stats.wire_bytes_received),
+                    "latency_mean": stats.latency_sum / stats.count
+                    if stats.count else None,
+                    "p50": stats.quantile(0.5, self.buckets),
+                    "p95": stats.quantile(0.95, self.buckets),
+                    "p99": stats.quantile(0.99, self.buckets)
+                }
+            return result
+
+    def to_prometheus(self):
+        # Prometheus text exposition format, e.g. to write to a file read
+        # by the node exporter textfile collector or to serve as is
+        name = self.prefix
+        lines = []
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+
+            def family(metric, kind, doc):
+                lines.append("# HELP {}_{} {}".format(name, metric, doc))
+                lines.append("# TYPE {}_{} {}".format(name, metric, kind))
+
+            family("requests_total", "counter", "Requests sent")
+            for (endpoint, method), stats in endpoints:
+                for status, count in sorted(stats.statuses.items()):
+                    lines.append("{}_requests_total{{{}}} {}".format(
+                        name, _labels(endpoint=endpoint, method=method,
+                                      status=status), count))
+
+            for metric, attribute, doc in (
+                    ("errors_total", "errors",
+                     "Requests that failed or got a 4xx/5xx response"),
+                    ("retries_total", "retries", "Retried attempts"),
+                    ("request_bytes_total", "bytes_sent",
+                     "Request body bytes sent"),
+                    ("response_bytes_total", "bytes_received",
+                     "Response body bytes received"),
+                    ("request_wire_bytes_total", "wire_bytes_sent",
+                     "Request body bytes sent on the wire (compressed)"),
+                    ("response_wire_bytes_total", "wire_bytes_received",
+                     "Response body bytes received on the wire "
+                     "(compressed)")):
+                family(metric, "counter", doc)
+                for (endpoint, method), stats in endpoints:
+                    lines.append("{}_{}{{{}}} {}".format(
+                        name, metric,
+                        _labels(endpoint=endpoint, method=method),
+                        getattr(stats, attribute)))
+
+            family("request_duration_seconds", "histogram",
+                   "Request latency, retries included")
+            for (endpoint, method), stats in endpoints:
+                cumulative = 0
+                bounds = [repr(bound) for bound in self.buckets] + ["+Inf"]
+                for bound, in_bucket in zip(bounds, stats.bucket_counts):
+                    cumulative += in_bucket
+                    lines.append(
+                        "{}_request_duration_seconds_bucket{{{}}} {}".format(
+                            name, _labels(endpoint=endpoint, method=method,
+                                          le=bound), cumulative))
+                labels = _labels(endpoint=endpoint, method=method)
+                lines.append("{}_request_duration_seconds_sum{{{}}} {}".format(
+                    name, labels, stats.latency_sum))
+                lines.append(
+                    "{}_request_duration_seconds_count{{{}}} {}".format(
+                        name, labels, stats.count))
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+import time
+from threading import Lock
+
+
+class _Snapshot(object):
+
+    def __init__(self):
+        self.lock = Lock()
+        self.value = None
+        self.loaded_at = None
+
+
+class NameIndex(object):
+    # Keeps the result of listing calls (e.g. every cluster by name, or the
+    # buckets of one cluster by name) so that resolving names to ids is a
+    # dict lookup instead of a listing download. Each snapshot is loaded on
+    # first use and reloaded once it is older than ttl seconds. A name that
+    # is missing from a snapshot older than miss_max_age seconds reloads it,
+    # so freshly created resources are found.
+
+    def __init__(self, ttl=300, miss_max_age=5):
+        # :param float ttl: seconds a snapshot is used for
+        # :param float miss_max_age: a miss reloads snapshots older than
+        #                            this, 0 to always reload on a miss
+
+        self.ttl = ttl
+        self.miss_max_age = miss_max_age
+        self._snapshots = {}
+        self._lock = Lock()
+        self._loads = 0
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key, load, max_age=None):
+        # Returns the snapshot stored under key, calling load() for a new
+        # one when there is none or it is older than max_age (ttl by
+        # default). Only one thread loads a given key at a time.
+        if max_age is None:
+            max_age = self.ttl
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is None:
+                snapshot = self._snapshots[key] = _Snapshot()
+        with snapshot.lock:
+            if snapshot.loaded_at is None or \
+                    time.monotonic() - snapshot.loaded_at >= max_age:
+                snapshot.value = load()
+                snapshot.loaded_at = time.monotonic()
+                with self._lock:
+                    self._loads += 1
+            return snapshot.value
+
+    def lookup(self, key, load, name, section=None):
+        # Returns snapshot[name] (or snapshot[section][name]), reloading a
+        # stale enough snapshot once when name is not in it
+        def find(max_age=None):
+            snapshot = self.get(key, load, max_age)
+            if section is not None:
+                snapshot = snapshot[section]
+            return snapshot.get(name)
+
+        value = find()
+        if value is None:
+            value = find(self.miss_max_age)
+        with self._lock:
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return value
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "snapshots": len(self._snapshots),
+                "loads": self._loads,
+                "hits": self._hits,
+                "misses": self._misses
+            }
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+import asyncio
+from collections import deque
+from contextvars import copy_context
+from concurrent.futures import ThreadPoolExecutor
+
+from . import APICodec
+from .APIExceptions import PageFetchError
+
+
+def _next_page(body, page):
+    # Works out the page to fetch after `page` from the cursor of a listing
+    # response, None once the last page has been read
+    cursor = (body.get("cursor") or {}) if isinstance(body, dict) else {}
+    pages = cursor.get("pages") or {}
+    next_page = pages.get("next")
+    if next_page:
+        return next_page if next_page > page else None
+    last = pages.get("last")
+    if last and page < last:
+        return page + 1
+    return None
+
+
+def _last_page(body):
+    cursor = (body.get("cursor") or {}) if isinstance(body, dict) else {}
+    return (cursor.get("pages") or {}).get("last")
+
+
+def _check_response(resp):
+    if resp.status_code != 200:
+        raise PageFetchError("{} {}: {}".format(
+            resp.status_code, resp.url, resp.content),
+            status_code=resp.status_code, endpoint=str(resp.url),
+            response=resp)
+    return APICodec.response_json(resp)
+
+
+def iter_pages(fetch_page, start_page=1):
+    # Lazily follows cursor.pages, fetch_page(page) must return the response
+    # for that page. Yields the decoded body of each page.
+    page = start_page
+    while page:
+        body = _check_response(fetch_page(page))
+        yield body
+        page = _next_page(body, page)
+
+
+def iter_items(fetch_page, start_page=1, key="data"):
+    # Same as iter_pages but yields the items of every page one at a time
+    for body in iter_pages(fetch_page, start_page):
+        for item in body.get(key) or []:
+            yield item
+
+
+def prefetch_pages(fetch_page, workers=4, start_page=1):
+    # Like iter_pages, but once the first page gives away cursor.pages.last
+    # the remaining pages are fetched by `workers` threads. Pages are still
+    # yielded in order and at most 2 * workers of them are held at a time.
+    # The workers fetch under the caller's deadline and tracing span.
+    first = _check_response(fetch_page(start_page))
+    yield first
+    last = _last_page(first)
+    if not last or last <= start_page:
+        # No page count to plan with, follow the cursor instead
+        next_page = _next_page(first, start_page)
+        if next_page:
+            for body in iter_pages(fetch_page, next_page):
+                yield body
+        return
+
+    remaining = iter(range(start_page + 1, last + 1))
+    executor = ThreadPoolExecutor(max_workers=workers)
+    pending = deque()
+    try:
+        for page in remaining:
+            pending.append(
+                executor.submit(copy_context().run, fetch_page, page))
+            if len(pending) >= 2 * workers:
+                break
+        while pending:
+            resp = pending.popleft().result()
+            page = next(remaining, None)
+            if page is not None:
+                pending.append(
+                    executor.submit(copy_context().run, fetch_page, page))
+            yield _check_response(resp)
+    finally:
+        # Stopping early or failing must not leave pages being fetched
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def prefetch_items(fetch_page, workers=4, start_page=1, key="data"):
+    for body in prefetch_pages(fetch_page, workers, start_page):
+        for item in body.get(key) or []:
+            yield item
+
+
+async def aiter_pages(fetch_page, start_page=1):
+    # Async generator version of iter_pages, fetch_page returns a coroutine
+    page = start_page
+    while page:
+        body = _check_response(await fetch_page(page))
+        yield body
+        page = _next_page(body, page)
+
+
+async def aiter_items(fetch_page, start_page=1, key="data"):
+    async for body in aiter_pages(fetch_page, start_page):
+        for item in body.get(key) or []:
+            yield item
+
+
+async def aprefetch_pages(fetch_page, workers=4, start_page=1):
+    # Async version of prefetch_pages, up to `workers` page requests are
+    # kept in flight on the event loop
+    first = _check_response(await fetch_page(start_page))
+    yield first
+    last = _last_page(first)
+    if not last or last <= start_page:
+        next_page = _next_page(first, start_page)
+        if next_page:
+            async for body in aiter_pages(fetch_page, next_page):
+                yield body
+        return
+
+    remaining = iter(range(start_page + 1, last + 1))
+    pending = deque()
+    try:
+        for page in remaining:
+            pending.append(asyncio.ensure_future(fetch_page(page)))
+            if len(pending) >= workers:
+                break
+        while pending:
+            resp = await pending.popleft()
+            page = next(remaining, None)
+            if page is not None:
+                pending.append(asyncio.ensure_future(fetch_page(page)))
+            yield _check_response(resp)
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def aprefetch_items(fetch_page, workers=4, start_page=1, key="data"):
+    async for body in aprefetch_pages(fetch_page, workers, start_page):
+        for item in body.get(key) or []:
+            yield item
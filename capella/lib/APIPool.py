@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+from http.cookiejar import DefaultCookiePolicy
+from threading import Lock
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .APIHTTP2 import HTTP2Adapter
+
+
+class _NoCookiePolicy(DefaultCookiePolicy):
+    # The internal/support calls used to get a brand new session each time,
+    # so no cookie ever outlived a single call. Keep it that way now that
+    # the session is shared between clients and threads.
+
+    def set_ok(self, cookie, request):
+        return False
+
+    def return_ok(self, cookie, request):
+        return False
+
+
+class APIConnectionPool(object):
+    # Wraps a requests.Session whose adapters keep TCP/TLS connections
+    # alive between calls, so that repeated calls to the same host only
+    # pay the handshake once per pooled connection.
+
+    def __init__(self, pool_connections=10, pool_maxsize=10,
+                 pool_block=False, keep_alive=True, http2=False):
+        # :param int pool_connections: number of per-host pools to cache
+        # :param int pool_maxsize: max connections kept open per host
+        # :param bool pool_block: block instead of opening extra
+        #                         connections once pool_maxsize is reached
+        # :param bool keep_alive: re-use connections between requests
+        # :param bool http2: send https requests over HTTP/2, multiplexed
+        #                    over up to pool_maxsize connections per host
+
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.http2 = http2
+        self.session = self._new_session()
+
+    def _new_session(self):
+        session = requests.Session()
+        session.cookies.set_policy(_NoCookiePolicy())
+        adapter = HTTPAdapter(pool_connections=self.pool_connections,
+                              pool_maxsize=self.pool_maxsize,
+                              pool_block=self.pool_block)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if self.http2:
+            session.mount("https://", HTTP2Adapter(
+                max_connections=self.pool_maxsize,
+                max_keepalive_connections=self.pool_maxsize
+                if self.keep_alive else 0))
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def stats(self):
+        # Per host counters from the underlying urllib3 pools.
+        # "connections" is the number of connections ever opened and
+        # "requests" the number of requests sent over them, so
+        # requests > connections means connections are being re-used.
+        stats = {}
+        seen = set()
+        for adapter in self.session.adapters.values():
+            if id(adapter) in seen:
+                continue
+            seen.add(id(adapter))
+            if isinstance(adapter, HTTP2Adapter):
+                stats["http2"] = adapter.stats()
+                continue
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                host = "{}://{}:{}".format(pool.scheme, pool.host, pool.port)
+                # The queue is pre-filled with None placeholders, only
+                # real entries are open idle connections
+                idle = 0
+                if pool.pool is not None:
+                    idle = len([conn for conn in list(pool.pool.queue)
+                                if conn is not None])
+                stats[host] = {
+                    "connections": pool.num_connections,
+                    "requests": pool.num_requests,
+                    "idle": idle,
+                    "maxsize": self.pool_maxsize
+                }
+        return stats
+
+    def close(self):
+        self.session.close()
+
+
+_shared_pool = None
+_shared_pool_lock = Lock()
+
+
+def get_shared_pool():
+    # Returns the process wide pool, creating it with the defaults on
+    # first use.
+    global _shared_pool
+    if _shared_pool is None:
+        with _shared_pool_lock:
+            if _shared_pool is None:
+                _shared_pool = APIConnectionPool()
+    return _shared_pool
+
+
+def configure_shared_pool(pool_connections=10, pool_maxsize=10,
+                          pool_block=False, keep_alive=True, http2=False):
+    # Replaces the process wide pool. Every client that was not given a
+    # pool of its own picks up the new one on its next request.
+    global _shared_pool
+    with _shared_pool_lock:
+        old_pool = _shared_pool
+        _shared_pool = APIConnectionPool(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+            pool_block=pool_block, keep_alive=keep_alive, http2=http2)
+    if old_pool is not None:
+        old_pool.close()
+    return _shared_pool
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+import asyncio
+import hashlib
+import time
+from threading import Lock
+
+
+class TokenBucketRateLimiter(object):
+    # Client side token bucket. Every request takes a token, tokens come
+    # back at `rate` per second and up to `burst` can be saved up. When
+    # adaptive, a 429 halves the rate (and honours Retry-After) and every
+    # successful response nudges it back up towards the configured rate.
+
+    def __init__(self, rate, burst=None, adaptive=True, min_rate=None,
+                 decrease_factor=0.5, increase_step=None):
+        # :param float rate: requests per second
+        # :param int burst: bucket size, defaults to one second worth
+        # :param bool adaptive: react to 429 responses
+        # :param float min_rate: floor for the adaptive rate
+        # :param float decrease_factor: rate multiplier applied on a 429
+        # :param float increase_step: rate added back per success
+
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1, rate))
+        self.adaptive = adaptive
+        self.min_rate = float(min_rate if min_rate is not None
+                              else self.max_rate / 10)
+        self.decrease_factor = decrease_factor
+        self.increase_step = float(increase_step if increase_step is not None
+                                   else self.max_rate / 100)
+
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._paused_until = 0
+        self._lock = Lock()
+        self._throttled = 0
+        self._waited = 0.0
+
+    def _refill(self, now):
+        elapsed = now - self._last
+        self._last = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+
+    def _reserve(self):
+        # Takes a token and returns how long the caller has to wait for it
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # Tokens may go negative, each waiter reserves its own slot
+            self._tokens -= 1
+            wait = 0
+            if self._tokens < 0:
+                wait = -self._tokens / self.rate
+            wait = max(wait, self._paused_until - now)
+            self._waited += wait
+        return wait
+
+    def acquire(self):
+        # Takes a token, sleeping until one is available.
+        # Returns the time spent waiting in seconds.
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self):
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def on_response(self, status_code, retry_after=None):
+        if not self.adaptive:
+            return
+        with self._lock:
+            if status_code == 429:
+                self._throttled += 1
+                self.rate = max(self.min_rate,
+                                self.rate * self.decrease_factor)
+                self._tokens = min(self._tokens, 0)
+                if retry_after:
+                    self._paused_until = max(self._paused_until,
+                                             time.monotonic() + retry_after)
+            elif status_code < 500 and self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "max_rate": self.max_rate,
+                "burst": self.burst,
+                "throttled": self._throttled,
+                "waited": self._waited
+            }
+
+
+_limiters = {}
+_limiters_lock = Lock()
+
+
+def get_rate_limiter(identity, rate, burst=None, **kwargs):
+    # Returns the limiter shared by every client using the same access key
+    # or bearer token, creating it on first use. Only a digest of the
+    # credential is kept as the key.
+    key = hashlib.sha256(str(identity).encode()).hexdigest()
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = TokenBucketRateLimiter(rate, burst, **kwargs)
+            _limiters[key] = limiter
+        return limiter
@@ -1,26 +1,296 @@
 # -*- coding: utf-8 -*-
 # Generic/Built-in
-from threading import Lock
+import time
 
 import requests
 import logging
 import pprint
 
 
+from . import APICodec
 from .APIAuth import APIAuth
+from .APICache import ResponseCache
+from .APICoalescer import RequestCoalescer
+from .APICircuitBreaker import CircuitBreaker
+from .APICompression import BodyCompression
+from .APIDeadline import remaining
+from .APIHTTP2 import HTTP2Adapter
+from .APIHedging import HedgePolicy
+from .APIMetrics import APIMetrics
+from .APIPaginator import iter_items, prefetch_items
+from .APIPool import get_shared_pool
+from .APIRateLimiter import get_rate_limiter
+from .APIRetry import parse_retry_after
+from .APITokenManager import JWTTokenManager
+from .APITracing import APITracer, InMemorySpanExporter
+from .APITransport import APITransport
+from .APIUtils import endpoint_template
 from .APIExceptions import (
     MissingAccessKeyError,
     MissingSecretKeyError,
     GenericHTTPError,
+    IncompleteDownloadError,
+    DeadlineExceeded,
+    CircuitOpenError,
     CbcAPIError
 )
 import base64
-import json
+import os
+import random
+import re
+
+
+_CONTENT_RANGE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+# Content-Range of a 416, carrying the size of the artifact
+_CONTENT_RANGE_UNSATISFIED = re.compile(r"bytes\s+\*/(\d+)")
+
+
+class _LogBody(object):
+    # Defers turning a body into text until a log handler formats the
+    # record, and keeps at most `limit` characters of it
+    __slots__ = ("body", "limit")
+
+    def __init__(self, body, limit):
+        self.body = body
+        self.limit = limit
+
+    def __str__(self):
+        body, limit = self.body, self.limit
+        if isinstance(body, (bytes, bytearray)):
+            size = len(body)
+            text = str(bytes(body[:limit]) if limit is not None else body)
+        else:
+            text = str(body)
+            size = len(text)
+            if limit is not None:
+                text = text[:limit]
+        if limit is not None and size > limit:
+            text += "... ({} of {} shown)".format(limit, size)
+        return text
+
+
+def _encode_json_body(kwargs, body_key):
+    # Encodes a json= body with APICodec rather than the HTTP library's
+    # own (stdlib) encoder
+    body = kwargs.pop("json", None)
+    if body is None or kwargs.get(body_key) is not None:
+        return kwargs
+    kwargs[body_key] = APICodec.encode(body)
+    headers = dict(kwargs.get("headers") or {})
+    if not any(name.lower() == "content-type" for name in headers):
+        headers["Content-Type"] = "application/json"
+    kwargs["headers"] = headers
+    return kwargs
+
+
+# Returned by _apply_deadline once the deadline has passed
+_EXPIRED = object()
+
+
+def _apply_deadline(timeout):
+    # Cuts a (connect, read) or single value timeout down to the time left
+    # before the current deadline
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        return _EXPIRED
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+    else:
+        connect = read = timeout
+    return (left if connect is None else min(connect, left),
+            left if read is None else min(read, left))
+
+
+# The errors below are built once the request is recorded
+
+def _deadline_exceeded(metrics, tracer, span, method, url, start, retries,
+                       kwargs, body_key):
+    latency = time.monotonic() - start
+    _finish_request(metrics, tracer, span, method, url, None, start,
+                    retries, kwargs, body_key, DeadlineExceeded)
+    return DeadlineExceeded(
+        "Deadline exceeded before {} {} could complete".format(method, url),
+        endpoint=url, latency=latency, retries=retries)
+
+
+def _circuit_open(metrics, tracer, span, method, url, start, retries, kwargs,
+                  body_key, circuit, wait):
+    latency = time.monotonic() - start
+    _finish_request(metrics, tracer, span, method, url, None, start,
+                    retries, kwargs, body_key, CircuitOpenError)
+    return CircuitOpenError(
+        "Circuit for {} is open, not sending {} {} (next try in "
+        "{:.1f}s)".format(circuit, method, url, wait),
+        endpoint=url, latency=latency, retries=retries)
+
+
+def _close_response(resp):
+    resp.close()
+
+
+def _body_size(body):
+    if isinstance(body, str):
+        return len(body.encode())
+    if isinstance(body, (bytes, bytearray)):
+        return len(body)
+    return 0
+
+
+def _wire_size(resp, received):
+    # Response body bytes as they came over the wire, before decompression
+    raw = getattr(resp, "raw", None)
+    if raw is not None and hasattr(raw, "tell"):
+        try:
+            return raw.tell()
+        except (OSError, ValueError):
+            return received
+    # httpx
+    return getattr(resp, "num_bytes_downloaded", received)
+
+
+def _record_metrics(metrics, method, url, resp, start, retries, kwargs,
+                    body_key):
+    latency = time.monotonic() - start
+    body = kwargs.get(body_key)
+    wire_sent = _body_size(body)
+    sent = getattr(body, "raw_size", wire_sent)
+    if resp is None:
+        metrics.record(method, url, None, latency, sent, 0, retries,
+                       wire_bytes_sent=wire_sent)
+        return
+    if kwargs.get("stream"):
+        # The body has not been read, go by what the server announced
+        received = wire_received = int(
+            resp.headers.get("Content-Length") or 0)
+    else:
+        received = len(resp.content)
+        wire_received = _wire_size(resp, received)
+    metrics.record(method, url, resp.status_code, latency, sent, received,
+                   retries, wire_bytes_sent=wire_sent,
+                   wire_bytes_received=wire_received)
+
+
+def _finish_request(metrics, tracer, span, method, url, resp, start, retries,
+                    kwargs, body_key, error=None):
+    if metrics is not None:
+        _record_metrics(metrics, method, url, resp, start, retries, kwargs,
+                        body_key)
+    if span is not None:
+        span.retries = retries
+        tracer.end_request(span, resp, error)
+
+
+def _time_attempt(span, resp, total, stream):
+    # Splits the time spent in the HTTP library into waiting for the
+    # response headers (the library's own elapsed) and reading the body.
+    # httpx's elapsed runs until the body is read, so with the async
+    # client the transfer is part of wait_time.
+    try:
+        elapsed = resp.elapsed.total_seconds()
+    except (AttributeError, RuntimeError):
+        # httpx only knows it once the response is closed
+        return
+    span.wait_time = elapsed
+    span.transfer_time = None if stream else max(0.0, total - elapsed)
+
+
+def _pool_connections(session, url):
+    # Connections ever opened by the urllib3 pools of the adapter serving
+    # url, None when it does not use urllib3 pools
+    try:
+        pools = session.get_adapter(url).poolmanager.pools
+    except (AttributeError, requests.exceptions.InvalidSchema):
+        return None
+    total = 0
+    for key in list(pools.keys()):
+        pool = pools.get(key)
+        if pool is not None:
+            total += pool.num_connections
+    return total
+
+
+def _resumes_at(resp, offset, expected):
+    # Whether a 206 continues the download at offset, of the same size
+    match = _CONTENT_RANGE.match(resp.headers.get("Content-Range", ""))
+    if match is None or int(match.group(1)) != offset:
+        return False
+    return expected is None or match.group(3) == "*" or \
+        int(match.group(3)) == expected
+
+
+def _expected_size(resp, offset):
+    # Total size of the artifact announced by a 200 or 206 response, None
+    # when unknown or when the body is content-encoded (iter_content
+    # decodes it, so the byte counts would not match)
+    if resp.headers.get("Content-Encoding", "identity") != "identity":
+        return None
+    if resp.status_code == 206:
+        match = _CONTENT_RANGE.match(resp.headers.get("Content-Range", ""))
+        if match and match.group(3) != "*":
+            return int(match.group(3))
+        return None
+    length = resp.headers.get("Content-Length")
+    return int(length) + offset if length is not None else None
+
+
+def _validator(resp):
+    # Strong ETag, or else Last-Modified, identifying the version of the
+    # artifact being downloaded, for If-Range
+    etag = resp.headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return resp.headers.get("Last-Modified")
+
+
+def _read_resume_state(path, url):
+    # Validator of the partial download of url left at path.resume by an
+    # interrupted stream_download, None when there is none
+    try:
+        with open(path + ".resume", "rb") as f:
+            state = APICodec.loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get("url") != url:
+        return None
+    return state.get("validator")
+
+
+def _transport_attribute(name):
+    # Exposes an attribute of the transport under its historical name on
+    # APIRequests, so existing code reading or setting it keeps working
+    def fget(self):
+        return getattr(self.transport, name)
+
+    def fset(self, value):
+        setattr(self.transport, name, value)
+    return property(fget, fset)
 
 
 class APIRequests(object):
 
-    def __init__(self, url, secret=None, access=None, token=None):
+    # State living on the (possibly shared) transport
+    network_session = _transport_attribute("session")
+    lock = _transport_attribute("lock")
+    token_manager = _transport_attribute("token_manager")
+    retry_policy = _transport_attribute("retry_policy")
+    rate_limit = _transport_attribute("rate_limit")
+    response_cache = _transport_attribute("response_cache")
+    coalescer = _transport_attribute("coalescer")
+    log_body_limit = _transport_attribute("log_body_limit")
+    metrics = _transport_attribute("metrics")
+    tracer = _transport_attribute("tracer")
+    timeout = _transport_attribute("timeout")
+    hedging = _transport_attribute("hedging")
+    circuit_breaker = _transport_attribute("circuit_breaker")
+    compression = _transport_attribute("compression")
+    body_log_sampling = _transport_attribute("body_log_sampling")
+    _pool = _transport_attribute("pool")
+    _auth = _transport_attribute("auth")
+
+    def __init__(self, url, secret=None, access=None, token=None, pool=None,
+                 retry_policy=None, transport=None):
         # handles http requests - GET , PUT, POST, DELETE
         # to the Couchbase Cloud APIs
         # Read the values from the environmental variables
@@ -32,70 +302,468 @@ class APIRequests(object):
         self._log = logging.getLogger(__name__)
 
         # We will re-use the first session we setup to avoid
-        # the overhead of creating new sessions for each request
-        self.network_session = requests.Session()
-        self.jwt = None
-        self.lock = Lock()
+        # the overhead of creating new sessions for each request.
+        # Clients given the same APITransport share its session, pool,
+        # auth, retry policy, rate limit, cache and JWT.
+        if transport is None:
+            # Internal/support calls go through a pooled session, shared
+            # by every client unless a dedicated APIConnectionPool is
+            # passed in. The optional RetryPolicy is applied to every
+            # request this client sends.
+            transport = APITransport(pool=pool, retry_policy=retry_policy)
+        self.transport = transport
+
+        # JWT of the internal APIs, refreshed ahead of its expiry and by a
+        # single thread at a time
+        if transport.token_manager is None:
+            transport.token_manager = JWTTokenManager(self._fetch_jwt)
+        # Times a request is re-sent with a new JWT after a 401
+        self.max_auth_retries = 1
+
+    def close(self):
+        # Closes the connections of the transport, and so of every client
+        # sharing it
+        self.transport.close()
 
     def set_logging_level(self, level):
         self._log.setLevel(level)
 
+    def set_retry_policy(self, retry_policy):
+        self.retry_policy = retry_policy
+
+    def enable_rate_limiter(self, rate, burst=None, **kwargs):
+        # Limits api_* calls to `rate` requests per second with bursts of
+        # up to `burst`. The bucket is shared with every other client using
+        # the same access key or bearer token, the first client to create
+        # it decides its settings. See TokenBucketRateLimiter for kwargs.
+        self.rate_limit = (rate, burst, kwargs)
+
+    def disable_rate_limiter(self):
+        self.rate_limit = None
+
+    def set_body_logging(self, limit=2048, sample_rate=1.0,
+                         sample_rates=None):
+        # Request and response bodies are only logged when the level they
+        # are logged at is enabled. limit caps the characters logged per
+        # body (None for no cap), sample_rate is the fraction of calls
+        # whose bodies are logged and sample_rates overrides it per
+        # endpoint template, e.g. {"/v4/organizations/{}/events": 0.01}
+        self.log_body_limit = limit
+        if sample_rate >= 1 and not sample_rates:
+            self.body_log_sampling = None
+        else:
+            self.body_log_sampling = (sample_rate, dict(sample_rates or {}))
+
+    def _log_body(self, level, prefix, api_endpoint, body):
+        if body is None or not self._log.isEnabledFor(level):
+            return
+        sampling = self.body_log_sampling
+        if sampling is not None:
+            rate, rates = sampling
+            if rates:
+                rate = rates.get(endpoint_template(api_endpoint), rate)
+            if rate <= 0 or (rate < 1 and random.random() >= rate):
+                return
+        self._log.log(level, "%s%s", prefix,
+                      _LogBody(body, self.log_body_limit))
+
+    def _auth_identity(self, api_endpoint, headers):
+        # The credential a request is sent with
+        if headers and "Authorization" in headers:
+            return headers["Authorization"]
+        elif "v4" in api_endpoint:
+            return self.bearer_token
+        return self.ACCESS
+
+    def _get_rate_limiter(self, api_endpoint, headers):
+        if self.rate_limit is None:
+            return None
+        rate, burst, kwargs = self.rate_limit
+        return get_rate_limiter(self._auth_identity(api_endpoint, headers),
+                                rate, burst, **kwargs)
+
+    def enable_response_cache(self, default_ttl=5, max_entries=1024,
+                              ttls=None):
+        # Caches GET responses of api_get and the internal GET requests,
+        # see ResponseCache. Mutations sent through this client invalidate
+        # the entries of the paths they touch.
+        self.response_cache = ResponseCache(default_ttl, max_entries, ttls)
+        return self.response_cache
+
+    def disable_response_cache(self):
+        self.response_cache = None
+
+    def enable_request_coalescing(self):
+        # Concurrent GETs for the same URL, params and credential share a
+        # single request, every caller gets a copy of its response
+        if self.coalescer is None:
+            self.coalescer = RequestCoalescer()
+        return self.coalescer
+
+    def disable_request_coalescing(self):
+        self.coalescer = None
+
+    def set_timeout(self, connect=None, read=None):
+        # Default connect and read timeouts, in seconds, of the requests
+        # sent by this client. None leaves them unbounded, as they were,
+        # except for the internal calls which default to 300s. Use
+        # APIDeadline.deadline() to bound a whole sequence of calls.
+        if connect is None and read is None:
+            self.timeout = None
+        else:
+            self.timeout = (connect, read)
+
+    def enable_hedging(self, policy=None):
+        # Hedges the GETs that are slower than usual for their endpoint,
+        # e.g. when polling cluster or index status, see HedgePolicy. Pass
+        # the same policy to several clients to share its budget.
+        if policy is None:
+            policy = self.hedging or HedgePolicy()
+        self.hedging = policy
+        return policy
+
+    def disable_hedging(self):
+        self.hedging = None
+
+    def enable_circuit_breaker(self, breaker=None):
+        # Fails requests fast with CircuitOpenError while their endpoint
+        # group keeps failing, see CircuitBreaker. Pass the same breaker to
+        # several clients to share what they learn about the backends.
+        if breaker is None:
+            breaker = self.circuit_breaker or CircuitBreaker()
+        self.circuit_breaker = breaker
+        return breaker
+
+    def disable_circuit_breaker(self):
+        self.circuit_breaker = None
+
+    def enable_compression(self, threshold=1024, level=6,
+                           compress_requests=True):
+        # Advertises gzip (and br/zstd when they can be decoded) for the
+        # responses and gzips request bodies of threshold bytes or more,
+        # see BodyCompression. The ratios show in the metrics.
+        self.compression = BodyCompression(threshold, level,
+                                           compress_requests)
+        return self.compression
+
+    def disable_compression(self):
+        # Back to the HTTP library's defaults
+        self.compression = None
+
+    def enable_http2(self, max_connections=10, **kwargs):
+        # Sends the api_* calls over HTTP/2, where concurrent calls share a
+        # few connections, see HTTP2Adapter for kwargs. The internal calls
+        # use the connection pool, give the client an
+        # APIConnectionPool(http2=True) for those. Requires httpx and h2.
+        adapter = HTTP2Adapter(max_connections=max_connections, **kwargs)
+        self.network_session.mount("https://", adapter)
+        return adapter
+
+    def enable_metrics(self, metrics=None):
+        # Records count, errors, status codes, bytes and latency of every
+        # request sent, per endpoint template, in an APIMetrics registry.
+        # Pass the same registry to several clients to aggregate them.
+        if metrics is None:
+            metrics = self.metrics or APIMetrics()
+        self.metrics = metrics
+        return metrics
+
+    def disable_metrics(self):
+        self.metrics = None
+
+    def enable_tracing(self, tracer=None):
+        # Wraps every request in a Span handed to the tracer's hooks and
+        # exporters, see APITracer. With no tracer, one keeping the spans
+        # in an InMemorySpanExporter is created.
+        if tracer is None:
+            tracer = self.tracer or APITracer([InMemorySpanExporter()])
+        self.tracer = tracer
+        return tracer
+
+    def disable_tracing(self):
+        self.tracer = None
+
+    def get_retry_stats(self):
+        if self.retry_policy is None:
+            return {}
+        return self.retry_policy.stats()
+
+    @property
+    def connection_pool(self):
+        if self._pool is not None:
+            return self._pool
+        return get_shared_pool()
+
+    def get_pool_stats(self):
+        return self.connection_pool.stats()
+
+    @property
+    def jwt(self):
+        return self.token_manager.token
+
+    @jwt.setter
+    def jwt(self, token):
+        if token is None:
+            self.token_manager.invalidate()
+        else:
+            self.token_manager.set_token(token)
+
+    def _fetch_jwt(self):
+        basic = base64.b64encode(
+            '{}:{}'.format(
+                self.user,
+                self.pwd).encode()).decode()
+        header = {'Authorization': 'Basic %s' % basic}
+        resp = self._urllib_request(
+            "{}/sessions".format(self.internal_url), method="POST",
+            headers=header)
+        if resp is None:
+            self._log.error("Could not reach %s/sessions", self.internal_url)
+            return None
+        if resp.status_code != 200:
+            self._log.warning("Response: %s", resp.status_code)
+            self._log.error("Error : %s", resp.content)
+        return APICodec.loads(resp.content).get("jwt")
+
     def get_authorization_internal(self):
-        if self.jwt is None:
-            self.lock.acquire()
-            if self.jwt is None:
-                self._log.debug("refreshing token")
-                basic = base64.b64encode(
-                    '{}:{}'.format(
-                        self.user,
-                        self.pwd).encode()).decode()
-                header = {'Authorization': 'Basic %s' % basic}
-                resp = self._urllib_request(
-                    "{}/sessions".format(self.internal_url), method="POST",
-                    headers=header)
-                if resp.status_code != 200:
-                    self._log.warning("Response: {}".format(resp.status_code))
-                    self._log.error("Error : {}".format(resp.content))
-                self.jwt = json.loads(resp.content).get("jwt")
-            self.lock.release()
         cbc_api_request_headers = {
-            'Authorization': 'Bearer %s' % self.jwt,
+            'Authorization': 'Bearer %s' % self.token_manager.get_token(),
             'Content-Type': 'application/json'
         }
         return cbc_api_request_headers
 
     def do_internal_request(self, url, method, params='', headers={}):
-        header = self.get_authorization_internal()
-        header.update(headers)
-        resp = self._urllib_request(
-            url, method, params=params, headers=header)
-        if resp.status_code == 401:
-            self.jwt = None
-            return self.do_internal_request(url, method, params)
+        attempt = 0
+        while True:
+            header = self.get_authorization_internal()
+            used_token = header["Authorization"][len("Bearer "):]
+            header.update(headers)
+            resp = self._urllib_request(
+                url, method, params=params, headers=header)
+            if resp is None or resp.status_code != 401 or \
+                    attempt >= self.max_auth_retries:
+                return resp
+            # Only the first of the threads that got a 401 with this token
+            # fetches a new one, the others pick it up
+            attempt += 1
+            self.token_manager.refresh(stale_token=used_token)
+
+    def _get_auth(self, headers):
+        # Requests carrying their own Authorization header are not signed
+        if headers and "Authorization" in headers:
+            return None
+        auth = self._auth
+        # The credentials are plain attributes that callers do change,
+        # rebuild the handler when they no longer match
+        if auth is None or not auth.matches(
+                self.SECRET, self.ACCESS, self.bearer_token):
+            auth = APIAuth(self.SECRET, self.ACCESS, self.bearer_token)
+            self._auth = auth
+        return auth
+
+    def _send_get(self, session, url, identity, params=None, headers=None,
+                  **kwargs):
+        # GET through the request coalescer and the response cache, when
+        # enabled
+        coalescer = self.coalescer
+        if coalescer is None:
+            return self._cached_get(session, url, identity, params, headers,
+                                    **kwargs)
+        return coalescer.do(
+            ResponseCache.make_key(url, params, identity),
+            lambda: self._cached_get(session, url, identity, params,
+                                     headers, **kwargs))
+
+    def _cached_get(self, session, url, identity, params=None, headers=None,
+                    **kwargs):
+        cache = self.response_cache
+        if cache is None:
+            return self._send_request(session, "GET", url, params=params,
+                                      headers=headers, **kwargs)
+        key = cache.make_key(url, params, identity)
+        resp, entry = cache.lookup(key)
+        if resp is not None:
+            return resp
+        if entry is not None:
+            headers = dict(headers or {})
+            headers.update(cache.conditional_headers(entry))
+        resp = self._send_request(session, "GET", url, params=params,
+                                  headers=headers, **kwargs)
+        if entry is not None and resp is not None and \
+                resp.status_code == 304:
+            return cache.revalidated(key, entry, url)
+        cache.store(key, url, resp)
         return resp
 
+    def _send_request(self, session, method, url, rate_limiter=None,
+                      **kwargs):
+        # Every HTTP call made by this class goes through here
+        kwargs = _encode_json_body(kwargs, "data")
+        if self.compression is not None:
+            kwargs = self.compression.apply(kwargs, "data")
+        timeout = kwargs.pop("timeout", None)
+        if timeout is None:
+            timeout = self.timeout
+        policy = self.retry_policy
+        metrics = self.metrics
+        tracer = self.tracer
+        hedging = self.hedging
+        if method != "GET" or kwargs.get("stream"):
+            hedging = None
+        breaker = self.circuit_breaker
+        span = None
+        if tracer is not None:
+            kwargs["headers"] = dict(kwargs.get("headers") or {})
+            span = tracer.start_request(method, url, kwargs)
+        start = time.monotonic()
+        attempt = 0
+        try:
+            while True:
+                if rate_limiter is not None:
+                    waited = rate_limiter.acquire()
+                    if span is not None:
+                        span.queue_time += waited
+                kwargs["timeout"] = _apply_deadline(timeout)
+                if kwargs["timeout"] is _EXPIRED:
+                    raise _deadline_exceeded(metrics, tracer, span, method,
+                                             url, start, attempt, kwargs,
+                                             "data")
+                if breaker is not None:
+                    circuit, wait = breaker.allow(url)
+                    if wait is not None:
+                        raise _circuit_open(metrics, tracer, span, method, url,
+                                            start, attempt, kwargs, "data",
+                                            circuit, wait)
+                if span is not None:
+                    connections = _pool_connections(session, url)
+                    sent = time.monotonic()
+                try:
+                    if hedging is None:
+                        resp = session.request(method, url, **kwargs)
+                    else:
+                        resp = hedging.send(
+                            url,
+                            lambda: session.request(method, url, **kwargs),
+                            _close_response, span)
+                except (requests.exceptions.ConnectionError,
+                        requests.exceptions.Timeout) as e:
+                    if breaker is not None:
+                        breaker.record(circuit, False)
+                    if isinstance(e, requests.exceptions.Timeout) and \
+                            _apply_deadline(None) is _EXPIRED:
+                        raise _deadline_exceeded(
+                            metrics, tracer, span, method, url, start, attempt,
+                            kwargs, "data") from e
+                    if policy is None or \
+                            not policy.should_retry_error(method, attempt):
+                        e.retries = attempt
+                        _finish_request(metrics, tracer, span, method, url,
+                                        None, start, attempt, kwargs, "data",
+                                        e)
+                        raise
+                    delay = policy.get_backoff(attempt)
+                    policy.record_retry(url, type(e).__name__)
+                except requests.exceptions.RequestException as e:
+                    # Never retried: truncated or undecodable bodies, invalid
+                    # URLs, too many redirects...
+                    if breaker is not None:
+                        breaker.record(circuit, False)
+                    e.retries = attempt
+                    _finish_request(metrics, tracer, span, method, url, None,
+                                    start, attempt, kwargs, "data", e)
+                    raise
+                else:
+                    if breaker is not None:
+                        breaker.record(
+                            circuit, not breaker.is_failure(resp.status_code))
+                    if span is not None:
+                        _time_attempt(span, resp, time.monotonic() - sent,
+                                      kwargs.get("stream"))
+                        if connections is not None:
+                            span.new_connection = \
+                                _pool_connections(session, url) > connections
+                    if rate_limiter is not None:
+                        rate_limiter.on_response(resp.status_code,
+                                                 parse_retry_after(resp))
+                    if policy is None or not policy.should_retry(
+                            method, resp.status_code, attempt):
+                        if method != "GET" and self.response_cache is not None:
+                            self.response_cache.invalidate(url)
+                        resp.retries = attempt
+                        _finish_request(metrics, tracer, span, method, url,
+                                        resp, start, attempt, kwargs, "data")
+                        return resp
+                    delay = policy.get_backoff(attempt, resp)
+                    policy.record_retry(url, resp.status_code)
+                    resp.close()
+                left = remaining()
+                if left is not None and delay >= left:
+                    # The retry could not be sent in time
+                    raise _deadline_exceeded(metrics, tracer, span, method,
+                                             url, start, attempt, kwargs,
+                                             "data")
+                attempt += 1
+                if span is not None:
+                    span.backoff_time += delay
+                self._log.debug("Retrying %s %s in %.2fs (attempt %s)",
+                                method, url, delay, attempt)
+                time.sleep(delay)
+        except BaseException as e:
+            # Whatever else ends the call (cancellation, interrupts,
+            # unexpected errors) still ends its span
+            if span is not None and span.duration is None:
+                span.retries = attempt
+                tracer.end_request(span, None, e)
+            raise
+
+    def iter_listing(self, list_method, *args, prefetch_workers=None,
+                     **kwargs):
+        # Calls list_method(*args, page=n, **kwargs) for n = 1, 2, ...
+        # following cursor.pages, and yields the listed items one by one.
+        # Works for the v4 list_* methods and the v2 listings taking a
+        # page argument. Pages are only fetched as the caller consumes the
+        # items, unless prefetch_workers is set, in which case pages 2..last
+        # are fetched concurrently by that many threads.
+        if kwargs.get("perPage") is None:
+            kwargs.pop("perPage", None)
+
+        def fetch_page(page):
+            return list_method(*args, page=page, **kwargs)
+
+        if prefetch_workers:
+            return prefetch_items(fetch_page, prefetch_workers)
+        return iter_items(fetch_page)
+
+    def _api_error(self, error, api_endpoint, start):
+        # Errors that are already ours are passed on as they are
+        if isinstance(error, CbcAPIError):
+            return error
+        return CbcAPIError(error, endpoint=api_endpoint,
+                           latency=time.time() - start,
+                           retries=getattr(error, "retries", None))
+
     # Methods
-    def api_get(self, api_endpoint, params=None, headers=None):
+    def api_get(self, api_endpoint, params=None, headers=None,
+                timeout=None):
         cbc_api_response = None
+        start = time.time()
         self._log.info(api_endpoint)
 
         try:
-            if headers and "Authorization" in headers:
-                cbc_api_response = self.network_session.get(
-                    self.API_BASE_URL + api_endpoint,
-                    params=params,
-                    verify=False, headers=headers)
-            else:
-                cbc_api_response = self.network_session.get(
-                    self.API_BASE_URL + api_endpoint,
-                    auth=APIAuth(
-                        self.SECRET, self.ACCESS, self.bearer_token),
-                    params=params,
-                    verify=False, headers=headers)
-            self._log.info(cbc_api_response.content)
+            cbc_api_response = self._send_get(
+                self.network_session,
+                self.API_BASE_URL + api_endpoint,
+                self._auth_identity(api_endpoint, headers),
+                auth=self._get_auth(headers),
+                rate_limiter=self._get_rate_limiter(api_endpoint, headers),
+                params=params, timeout=timeout,
+                verify=False, headers=headers)
+            self._log_body(logging.INFO, "", api_endpoint,
+                           cbc_api_response.content)
 
         except requests.exceptions.HTTPError:
-            error = pprint.pformat(cbc_api_response.json())
+            error = pprint.pformat(
+                APICodec.response_json(cbc_api_response))
             raise GenericHTTPError(error)
 
         except MissingAccessKeyError:
@@ -109,33 +777,33 @@ class APIRequests(object):
         # Grab any other exception and send to our generic exception
         # handler
         except Exception as e:
-            raise CbcAPIError(e)
+            raise self._api_error(e, api_endpoint, start)
 
         return (cbc_api_response)
 
-    def api_post(self, api_endpoint, request_body, headers=None):
+    def api_post(self, api_endpoint, request_body, headers=None,
+                 timeout=None):
         cbc_api_response = None
+        start = time.time()
 
         self._log.info(api_endpoint)
-        self._log.debug("Request body: " + str(request_body))
+        self._log_body(logging.DEBUG, "Request body: ", api_endpoint,
+                       request_body)
 
         try:
-            if headers and "Authorization" in headers:
-                cbc_api_response = self.network_session.post(
-                    self.API_BASE_URL + api_endpoint,
-                    json=request_body,
-                    verify=False, headers=headers)
-            else:
-                cbc_api_response = self.network_session.post(
-                    self.API_BASE_URL + api_endpoint,
-                    json=request_body,
-                    auth=APIAuth(
-                        self.SECRET, self.ACCESS, self.bearer_token),
-                    verify=False, headers=headers)
-            self._log.debug(cbc_api_response.content)
+            cbc_api_response = self._send_request(
+                self.network_session, "POST",
+                self.API_BASE_URL + api_endpoint,
+                json=request_body,
+                auth=self._get_auth(headers),
+                rate_limiter=self._get_rate_limiter(api_endpoint, headers),
+                timeout=timeout, verify=False, headers=headers)
+            self._log_body(logging.DEBUG, "", api_endpoint,
+                           cbc_api_response.content)
 
         except requests.exceptions.HTTPError:
-            error = pprint.pformat(cbc_api_response.json())
+            error = pprint.pformat(
+                APICodec.response_json(cbc_api_response))
             raise GenericHTTPError(error)
 
         except MissingAccessKeyError:
@@ -147,38 +815,36 @@ class APIRequests(object):
         # Grab any other exception and send to our generic exception
         # handler
         except Exception as e:
-            raise CbcAPIError(e)
+            raise self._api_error(e, api_endpoint, start)
 
         return (cbc_api_response)
 
     def api_put(self, api_endpoint, json_request_body=None, headers=None,
-                data_request_body=None):
+                data_request_body=None, timeout=None):
         cbc_api_response = None
 
         self._log.info(api_endpoint)
         if json_request_body:
-            self._log.debug("Request body: " + str(json_request_body))
+            self._log_body(logging.DEBUG, "Request body: ", api_endpoint,
+                           json_request_body)
         if data_request_body:
-            self._log.debug("Request body: " + str(data_request_body))
+            self._log_body(logging.DEBUG, "Request body: ", api_endpoint,
+                           data_request_body)
         try:
-            if headers and "Authorization" in headers:
-                cbc_api_response = self.network_session.put(
-                    self.API_BASE_URL + api_endpoint,
-                    json=json_request_body,
-                    data=data_request_body,
-                    verify=False, headers=headers)
-            else:
-                cbc_api_response = self.network_session.put(
-                    self.API_BASE_URL + api_endpoint,
-                    json=json_request_body,
-                    data=data_request_body,
-                    auth=APIAuth(
-                        self.SECRET, self.ACCESS, self.bearer_token),
-                    verify=False, headers=headers)
-            self._log.debug(cbc_api_response.content)
+            cbc_api_response = self._send_request(
+                self.network_session, "PUT",
+                self.API_BASE_URL + api_endpoint,
+                json=json_request_body,
+                data=data_request_body,
+                auth=self._get_auth(headers),
+                rate_limiter=self._get_rate_limiter(api_endpoint, headers),
+                timeout=timeout, verify=False, headers=headers)
+            self._log_body(logging.DEBUG, "", api_endpoint,
+                           cbc_api_response.content)
 
         except requests.exceptions.HTTPError:
-            error = pprint.pformat(cbc_api_response.json())
+            error = pprint.pformat(
+                APICodec.response_json(cbc_api_response))
             raise GenericHTTPError(error)
 
         except MissingAccessKeyError:
@@ -189,29 +855,28 @@ class APIRequests(object):
 
         return (cbc_api_response)
 
-    def api_patch(self, api_endpoint, request_body, headers=None):
+    def api_patch(self, api_endpoint, request_body, headers=None,
+                  timeout=None):
         cbc_api_response = None
 
         self._log.info(api_endpoint)
-        self._log.debug("Request body: " + str(request_body))
+        self._log_body(logging.DEBUG, "Request body: ", api_endpoint,
+                       request_body)
 
         try:
-            if headers and "Authorization" in headers:
-                cbc_api_response = self.network_session.patch(
-                    self.API_BASE_URL + api_endpoint,
-                    json=request_body,
-                    verify=False, headers=headers)
-            else:
-                cbc_api_response = self.network_session.patch(
-                    self.API_BASE_URL + api_endpoint,
-                    json=request_body,
-                    auth=APIAuth(
-                        self.SECRET, self.ACCESS, self.bearer_token),
-                    verify=False, headers=headers)
-            self._log.debug(cbc_api_response.content)
+            cbc_api_response = self._send_request(
+                self.network_session, "PATCH",
+                self.API_BASE_URL + api_endpoint,
+                json=request_body,
+                auth=self._get_auth(headers),
+                rate_limiter=self._get_rate_limiter(api_endpoint, headers),
+                timeout=timeout, verify=False, headers=headers)
+            self._log_body(logging.DEBUG, "", api_endpoint,
+                           cbc_api_response.content)
 
         except requests.exceptions.HTTPError:
-            error = pprint.pformat(cbc_api_response.json())
+            error = pprint.pformat(
+                APICodec.response_json(cbc_api_response))
             raise GenericHTTPError(error)
 
         except MissingAccessKeyError:
@@ -222,42 +887,30 @@ class APIRequests(object):
 
         return (cbc_api_response)
 
-    def api_del(self, api_endpoint, request_body=None, headers=None):
+    def api_del(self, api_endpoint, request_body=None, headers=None,
+                timeout=None):
         cbc_api_response = None
+        start = time.time()
 
         self._log.info(api_endpoint)
-        self._log.debug("Request body: " + str(request_body))
+        self._log_body(logging.DEBUG, "Request body: ", api_endpoint,
+                       request_body)
 
         try:
-            if headers and "Authorization" in headers:
-                if request_body is None:
-                    cbc_api_response = self.network_session.delete(
-                        self.API_BASE_URL + api_endpoint,
-                        verify=False, headers=headers)
-                else:
-                    cbc_api_response = self.network_session.delete(
-                        self.API_BASE_URL + api_endpoint,
-                        json=request_body,
-                        verify=False, headers=headers)
-            else:
-                if request_body is None:
-                    cbc_api_response = self.network_session.delete(
-                        self.API_BASE_URL + api_endpoint,
-                        auth=APIAuth(
-                            self.SECRET, self.ACCESS, self.bearer_token),
-                        verify=False, headers=headers)
-                else:
-                    cbc_api_response = self.network_session.delete(
-                        self.API_BASE_URL + api_endpoint,
-                        json=request_body,
-                        auth=APIAuth(
-                            self.SECRET, self.ACCESS, self.bearer_token),
-                        verify=False, headers=headers)
+            cbc_api_response = self._send_request(
+                self.network_session, "DELETE",
+                self.API_BASE_URL + api_endpoint,
+                json=request_body,
+                auth=self._get_auth(headers),
+                rate_limiter=self._get_rate_limiter(api_endpoint, headers),
+                timeout=timeout, verify=False, headers=headers)
 
-            self._log.debug(cbc_api_response.content)
+            self._log_body(logging.DEBUG, "", api_endpoint,
+                           cbc_api_response.content)
 
         except requests.exceptions.HTTPError:
-            error = pprint.pformat(cbc_api_response.json())
+            error = pprint.pformat(
+                APICodec.response_json(cbc_api_response))
             raise GenericHTTPError(error)
 
         except MissingAccessKeyError:
@@ -269,35 +922,173 @@ class APIRequests(object):
         # Grab any other exception and send to our generic exception
         # handler
         except Exception as e:
-            raise CbcAPIError(e)
+            raise self._api_error(e, api_endpoint, start)
 
         return (cbc_api_response)
 
+    def stream_download(self, url, destination, headers=None,
+                        chunk_size=1024 * 1024, resume=True, max_resumes=3,
+                        timeout=300, verify=False):
+        # Downloads url into destination (a path or a writable binary file
+        # object) chunk by chunk, so memory use does not grow with the size
+        # of the artifact. The byte count is checked against the size the
+        # server announced. Dropped connections are resumed with a Range
+        # request up to max_resumes times, guarded by If-Range so that a
+        # changed artifact is downloaded again from the start.
+        # With resume, the download state is kept next to a destination
+        # path in destination + ".resume" until it completes, and a later
+        # call for the same URL completes the partial file instead of
+        # replacing it. Any other file at destination is replaced.
+        # headers are sent as they are: pass get_authorization_internal()
+        # for the internal APIs, nothing for pre-signed links.
+        # Returns the number of bytes in destination.
+        session = self.connection_pool.session
+        own_file = isinstance(destination, str)
+        state_path = destination + ".resume" if own_file else None
+        written = 0
+        validator = None
+        if own_file:
+            if resume and os.path.exists(destination):
+                validator = _read_resume_state(destination, url)
+            if validator is not None:
+                fileobj = open(destination, "r+b")
+                fileobj.seek(0, os.SEEK_END)
+                written = fileobj.tell()
+            else:
+                fileobj = open(destination, "wb")
+        else:
+            fileobj = destination
+        base = fileobj.tell() - written
+        start_offset = written
+        resumes = 0
+        expected = None
+        try:
+            while True:
+                request_headers = dict(headers or {})
+                if written:
+                    request_headers["Range"] = "bytes={}-".format(written)
+                    if validator is not None:
+                        request_headers["If-Range"] = validator
+                resp = self._send_request(
+                    session, "GET", url, headers=request_headers,
+                    stream=True, timeout=timeout, verify=verify)
+                try:
+                    if resp.status_code == 416 and written:
+                        match = _CONTENT_RANGE_UNSATISFIED.match(
+                            resp.headers.get("Content-Range", ""))
+                        if match and int(match.group(1)) == written:
+                            # Nothing past what we already have
+                            expected = written
+                            break
+                        if resumes >= max_resumes:
+                            raise IncompleteDownloadError(
+                                "{} bytes at {} do not match {}".format(
+                                    written, destination, url),
+                                status_code=416, endpoint=url,
+                                retries=resumes)
+                        # What we have is not a prefix of the artifact
+                        resumes += 1
+                        fileobj.seek(base)
+                        fileobj.truncate()
+                        written = 0
+                        continue
+                    if resp.status_code not in (200, 206):
+                        raise GenericHTTPError(
+                            "{} {}: {}".format(resp.status_code, url,
+                                               resp.content),
+                            status_code=resp.status_code, endpoint=url,
+                            response=resp)
+                    if resp.status_code == 206 and not _resumes_at(
+                            resp, written, expected):
+                        if resumes >= max_resumes:
+                            raise IncompleteDownloadError(
+                                "Unexpected Content-Range {} resuming {} at "
+                                "{} bytes".format(
+                                    resp.headers.get("Content-Range"), url,
+                                    written),
+                                status_code=206, endpoint=url,
+                                retries=resumes)
+                        # Not the continuation of what we have, start over
+                        resumes += 1
+                        fileobj.seek(base)
+                        fileobj.truncate()
+                        written = 0
+                        continue
+                    if resp.status_code == 200 and written:
+                        # The server ignored the Range header or the
+                        # artifact changed, start over
+                        fileobj.seek(base)
+                        fileobj.truncate()
+                        written = 0
+                    if resp.status_code == 200 or validator is None:
+                        validator = _validator(resp)
+                        if resume and own_file and validator is not None:
+                            with open(state_path, "wb") as f:
+                                f.write(APICodec.encode(
+                                    {"url": url, "validator": validator}))
+                    expected = _expected_size(resp, written)
+                    try:
+                        for chunk in resp.iter_content(chunk_size):
+                            fileobj.write(chunk)
+                            written += len(chunk)
+                    except (requests.exceptions.ChunkedEncodingError,
+                            requests.exceptions.ConnectionError) as e:
+                        if resumes >= max_resumes:
+                            raise
+                        resumes += 1
+                        self._log.warning(
+                            "Download of %s interrupted at %s bytes, "
+                            "resuming: %s", url, written, e)
+                        continue
+                finally:
+                    resp.close()
+
+                if expected is not None and written < expected and \
+                        resumes < max_resumes:
+                    resumes += 1
+                    continue
+                break
+            if expected is not None and written != expected:
+                raise IncompleteDownloadError(
+                    "Downloaded {} of {} bytes from {}".format(
+                        written, expected, url),
+                    endpoint=url, retries=resumes)
+            if own_file and os.path.exists(state_path):
+                os.remove(state_path)
+            self._log.debug("Downloaded %s bytes from %s (%s resumed, "
+                            "%s resumes)",
+                            written, url, start_offset, resumes)
+            return written
+        finally:
+            if own_file:
+                fileobj.close()
+
     def _urllib_request(self, api, method='GET', headers=None,
-                        params='', timeout=300, verify=False):
-        session = requests.Session()
+                        params='', timeout=None, verify=False):
+        # timeout defaults to the client's, or 300s when it has none
+        session = self.connection_pool.session
+        if timeout is None and self.timeout is None:
+            timeout = 300
         try:
             if method == "GET":
-                resp = session.get(api, params=params, headers=headers,
-                                   timeout=timeout, verify=verify)
-            elif method == "POST":
-                resp = session.post(api, data=params, headers=headers,
-                                    timeout=timeout, verify=verify)
-            elif method == "DELETE":
-                resp = session.delete(api, data=params, headers=headers,
-                                      timeout=timeout, verify=verify)
-            elif method == "PUT":
-                resp = session.put(api, data=params, headers=headers,
-                                   timeout=timeout, verify=verify)
-            elif method == "PATCH":
-                resp = session.patch(api, data=params, headers=headers,
-                                     timeout=timeout, verify=verify)
+                identity = headers.get("Authorization") if headers else None
+                resp = self._send_get(
+                    session, api, identity, params=params, headers=headers,
+                    timeout=timeout, verify=verify)
+            else:
+                resp = self._send_request(
+                    session, method, api, data=params, headers=headers,
+                    timeout=timeout, verify=verify)
             return resp
         except requests.exceptions.HTTPError as errh:
-            self._log.error("HTTP Error {0}".format(errh))
+            self._log.error("HTTP Error %s", errh)
         except requests.exceptions.ConnectionError as errc:
-            self._log.error("Error Connecting {0}".format(errc))
+            self._log.error("Error Connecting %s", errc)
         except requests.exceptions.Timeout as errt:
-            self._log.error("Timeout Error: {0}".format(errt))
+            self._log.error("Timeout Error: %s", errt)
         except requests.exceptions.RequestException as err:
-            self._log.error("Something else: {0}".format(err))
+            self._log.error("Something else: %s", err)
+        except CircuitOpenError as err:
+            self._log.error("Circuit open: %s", err)
+        except DeadlineExceeded as err:
+            self._log.error("Deadline exceeded: %s", err)
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+import random
+import time
+from email.utils import parsedate_to_datetime
+from threading import Lock
+
+from .APIUtils import endpoint_template
+
+
+def parse_retry_after(response):
+    # Retry-After is either a number of seconds or an HTTP date
+    if response is None:
+        return None
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return max(seconds, 0)
+
+
+class RetryPolicy(object):
+    # Decides whether a request that came back throttled (429), with a
+    # server error (5xx) or that failed to connect is sent again, and how
+    # long to wait before doing so.
+
+    def __init__(self, max_retries=3, backoff_factor=0.5, max_backoff=30,
+                 jitter=True,
+                 status_forcelist=(429, 500, 502, 503, 504),
+                 allowed_methods=("GET", "HEAD", "OPTIONS", "PUT", "DELETE"),
+                 respect_retry_after=True, max_retry_after=120,
+                 retry_on_connection_errors=True):
+        # :param int max_retries: retries on top of the first attempt
+        # :param float backoff_factor: base delay in seconds, doubled on
+        #                              every retry
+        # :param float max_backoff: cap on the computed delay
+        # :param bool jitter: pick the delay uniformly in [0, backoff]
+        # :param tuple status_forcelist: status codes that are retried
+        # :param tuple allowed_methods: only these methods are retried,
+        #                               by default the idempotent ones
+        # :param bool respect_retry_after: wait as long as the Retry-After
+        #                                  header asks, up to max_retry_after
+        # :param bool retry_on_connection_errors: retry connection errors
+        #                                         and timeouts as well
+
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.status_forcelist = frozenset(status_forcelist)
+        self.allowed_methods = frozenset(m.upper() for m in allowed_methods)
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+        self.retry_on_connection_errors = retry_on_connection_errors
+
+        self._stats = {}
+        self._stats_lock = Lock()
+
+    def is_retryable_method(self, method):
+        return method.upper() in self.allowed_methods
+
+    def should_retry(self, method, status_code, attempt):
+        return (attempt < self.max_retries
+                and status_code in self.status_forcelist
+                and self.is_retryable_method(method))
+
+    def should_retry_error(self, method, attempt):
+        return (attempt < self.max_retries
+                and self.retry_on_connection_errors
+                and self.is_retryable_method(method))
+
+    def get_retry_after(self, response):
+        seconds = parse_retry_after(response)
+        if seconds is None:
+            return None
+        return min(seconds, self.max_retry_after)
+
+    def get_backoff(self, attempt, response=None):
+        if self.respect_retry_after:
+            retry_after = self.get_retry_after(response)
+            if retry_after is not None:
+                return retry_after
+        backoff = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        if self.jitter:
+            backoff = random.uniform(0, backoff)
+        return backoff
+
+    def record_retry(self, url, reason):
+        endpoint = endpoint_template(url)
+        with self._stats_lock:
+            stats = self._stats.setdefault(
+                endpoint, {"retries": 0, "reasons": {}})
+            stats["retries"] += 1
+            stats["reasons"][reason] = stats["reasons"].get(reason, 0) + 1
+
+    def stats(self):
+        # {endpoint template: {"retries": n, "reasons": {reason: n}}}
+        with self._stats_lock:
+            return dict((endpoint, {"retries": stats["retries"],
+                                    "reasons": dict(stats["reasons"])})
+                        for endpoint, stats in self._stats.items())
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._stats = {}
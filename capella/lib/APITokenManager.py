@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+import base64
+import heapq
+import itertools
+import logging
+import time
+import weakref
+from threading import Condition, Thread
+
+from . import APICodec
+
+
+def jwt_expiry(token):
+    # Returns the "exp" claim of a JWT as epoch seconds, None when the token
+    # cannot be decoded or has no expiry. The signature is not verified,
+    # this is only used to schedule refreshes.
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = APICodec.loads(base64.urlsafe_b64decode(payload.encode()))
+        return float(claims["exp"])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class _RefreshScheduler(object):
+    # A single daemon thread scheduling the background refreshes of every
+    # JWTTokenManager. Managers are only weakly referenced, so a client
+    # dropped without close() is not kept alive by its pending refresh,
+    # and building many clients does not start a thread per client.
+
+    def __init__(self):
+        self._cond = Condition()
+        self._queue = []
+        self._ids = itertools.count(1)
+        self._thread = None
+
+    def schedule(self, delay, manager):
+        # Returns the id the manager keeps to recognise its latest refresh
+        entry_id = next(self._ids)
+        with self._cond:
+            heapq.heappush(self._queue, (time.monotonic() + delay, entry_id,
+                                         weakref.ref(manager)))
+            if self._thread is None:
+                self._thread = Thread(target=self._run,
+                                      name="capella-jwt-refresh")
+                self._thread.daemon = True
+                self._thread.start()
+            self._cond.notify()
+        return entry_id
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if not self._queue:
+                        self._cond.wait()
+                        continue
+                    wait = self._queue[0][0] - time.monotonic()
+                    if wait <= 0:
+                        _, entry_id, ref = heapq.heappop(self._queue)
+                        break
+                    self._cond.wait(wait)
+            manager = ref()
+            # Cancelled or superseded entries are simply dropped
+            if manager is not None and manager._scheduled == entry_id:
+                refresh = Thread(target=manager._background_refresh,
+                                 name="capella-jwt-refresh-run")
+                refresh.daemon = True
+                refresh.start()
+            manager = None
+
+
+_scheduler = _RefreshScheduler()
+
+
+class JWTTokenManager(object):
+    # Holds the JWT used for the internal APIs. Only one refresh runs at a
+    # time, concurrent callers wait for it and share its result. Tokens
+    # carrying an expiry are refreshed in the background refresh_margin
+    # seconds before they expire, so callers normally never wait. Tokens
+    # living no longer than refresh_margin + expiry_skew are only
+    # refreshed when a caller needs one.
+
+    def __init__(self, fetch_token, refresh_margin=60, expiry_skew=5,
+                 background=True):
+        # :param callable fetch_token: returns a new JWT
+        # :param float refresh_margin: seconds before expiry to refresh in
+        #                              the background
+        # :param float expiry_skew: tokens this close to expiry are no
+        #                           longer handed out
+        # :param bool background: refresh ahead of expiry in a daemon
+        #                         thread
+
+        self._fetch_token = fetch_token
+        self.refresh_margin = refresh_margin
+        self.expiry_skew = expiry_skew
+        self.background = background
+        self._log = logging.getLogger(__name__)
+
+        self._cond = Condition()
+        self._token = None
+        self._expires_at = None
+        self._refreshing = False
+        self._generation = 0
+        # Id of the pending background refresh, see _RefreshScheduler
+        self._scheduled = None
+        self.refresh_count = 0
+
+    @property
+    def token(self):
+        return self._token
+
+    def set_token(self, token):
+        with self._cond:
+            self._set_token(token)
+
+    def _set_token(self, token):
+        # Must be called with self._cond held
+        self._token = token
+        self._expires_at = jwt_expiry(token) if token else None
+        self._generation += 1
+        self._schedule_refresh()
+
+    def _schedule_refresh(self):
+        self._scheduled = None
+        if not self.background or self._expires_at is None:
+            return
+        lifetime = self._expires_at - time.time()
+        if lifetime <= self.refresh_margin + self.expiry_skew:
+            # Refreshing ahead would fetch a new token right away, over
+            # and over
+            return
+        # Never sooner than a quarter of the token's lifetime
+        delay = max(lifetime - self.refresh_margin, lifetime / 4)
+        self._scheduled = _scheduler.schedule(delay, self)
+
+    def _background_refresh(self):
+        try:
+            self.refresh(stale_token=self._token)
+        except Exception as e:
+            # The current token is still valid, the next caller after it
+            # expires will try again
+            self._log.warning("Background token refresh failed: %s", e)
+
+    def _is_usable(self, token, expires_at):
+        return token is not None and (
+            expires_at is None or
+            time.time() < expires_at - self.expiry_skew)
+
+    def needs_refresh(self):
+        return not self._is_usable(self._token, self._expires_at)
+
+    def get_token(self):
+        token, expires_at = self._token, self._expires_at
+        if self._is_usable(token, expires_at):
+            return token
+        return self.refresh(stale_token=token)
+
+    def refresh(self, stale_token=None):
+        # Fetches a new token, unless another caller already replaced
+        # stale_token, in which case that token is returned
+        with self._cond:
+            if self._token is not None and self._token != stale_token:
+                return self._token
+            if self._refreshing:
+                generation = self._generation
+                while self._refreshing and generation == self._generation:
+                    self._cond.wait()
+                return self._token
+            self._refreshing = True
+        token = None
+        try:
+            self._log.debug("refreshing token")
+            token = self._fetch_token()
+            self.refresh_count += 1
+        finally:
+            # Waiters are released even when the fetch raised
+            with self._cond:
+                self._refreshing = False
+                if token is not None:
+                    self._set_token(token)
+                else:
+                    self._generation += 1
+                self._cond.notify_all()
+        return token
+
+    def invalidate(self, token=None):
+        # Drops the current token, or only `token` when it is still current
+        with self._cond:
+            if token is None or self._token == token:
+                self._token = None
+                self._expires_at = None
+                self._scheduled = None
+
+    def close(self):
+        with self._cond:
+            self._scheduled = None
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+import contextvars
+import logging
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from threading import Lock
+
+from .APIUtils import endpoint_template
+
+# Span of the flow (see APITracer.span) the current thread or task is in
+_current_span = contextvars.ContextVar("capella_current_span", default=None)
+
+
+def _new_id():
+    return os.urandom(8).hex()
+
+
+class Span(object):
+    # One HTTP call (retries included) or one named step grouping calls.
+    # Times are in seconds. For HTTP calls:
+    #   queue_time     waiting for the rate limiter
+    #   backoff_time   sleeping between retries
+    #   wait_time      request sent until the response headers arrived, as
+    #                  measured by the HTTP library. It includes setting up
+    #                  the connection when new_connection is True.
+    #   transfer_time  reading the response body
+    # new_connection is None when it could not be told.
+
+    def __init__(self, name, trace_id=None, parent_id=None, method=None,
+                 url=None):
+        self.name = name
+        self.trace_id = trace_id or _new_id()
+        self.span_id = _new_id()
+        self.parent_id = parent_id
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint_template(url) if url else None
+        self.status_code = None
+        self.retries = 0
+        self.error = None
+        self.start_time = time.time()
+        self._start = time.monotonic()
+        self.duration = None
+        self.queue_time = 0.0
+        self.backoff_time = 0.0
+        self.wait_time = None
+        self.transfer_time = None
+        self.new_connection = None
+        self.attributes = {}
+
+    def finish(self):
+        self.duration = time.monotonic() - self._start
+
+    def to_dict(self):
+        return dict((key, value) for key, value in self.__dict__.items()
+                    if not key.startswith("_"))
+
+    def __repr__(self):
+        return "<Span {} {} {} {:.3f}s>".format(
+            self.name, self.status_code or self.error or "",
+            self.span_id, self.duration or 0)
+
+
+class SpanExporter(object):
+    # Receives every finished span. Subclass it to ship spans elsewhere,
+    # export() runs on the calling thread so it should not block.
+
+    def export(self, span):
+        raise NotImplementedError
+
+    def shutdown(self):
+        pass
+
+
+class InMemorySpanExporter(SpanExporter):
+    # Keeps the last max_spans spans
+
+    def __init__(self, max_spans=10000):
+        self._spans = deque(maxlen=max_spans)
+        self._lock = Lock()
+
+    def export(self, span):
+        with self._lock:
+            self._spans.append(span)
+
+    def spans(self, trace_id=None):
+        with self._lock:
+            spans = list(self._spans)
+        if trace_id is not None:
+            spans = [span for span in spans if span.trace_id == trace_id]
+        return spans
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+
+class APITracer(object):
+    # Creates a span around every request sent by the clients it is
+    # attached to (see APIRequests.enable_tracing), runs the pre-request
+    # and post-response hooks and hands finished spans to the exporters.
+    # Calls made inside a `with tracer.span("name"):` block become its
+    # children, which ties together the calls of a multi-step flow.
+
+    def __init__(self, exporters=None):
+        self.exporters = list(exporters or [])
+        self.pre_request_hooks = []
+        self.post_response_hooks = []
+        self._log = logging.getLogger(__name__)
+
+    def add_exporter(self, exporter):
+        self.exporters.append(exporter)
+
+    def add_pre_request_hook(self, hook):
+        # hook(span, request_kwargs), may add headers or attributes
+        self.pre_request_hooks.append(hook)
+
+    def add_post_response_hook(self, hook):
+        # hook(span, response), response is None when the call raised
+        self.post_response_hooks.append(hook)
+
+    def _child(self, name, method=None, url=None):
+        parent = _current_span.get()
+        if parent is None:
+            return Span(name, method=method, url=url)
+        return Span(name, parent.trace_id, parent.span_id, method, url)
+
+    def start_request(self, method, url, kwargs):
+        span = self._child("{} {}".format(method, endpoint_template(url)),
+                           method, url)
+        for hook in self.pre_request_hooks:
+            self._run_hook(hook, span, kwargs)
+        return span
+
+    def end_request(self, span, response=None, error=None):
+        # error is the exception raised, or its class
+        if response is not None:
+            span.status_code = response.status_code
+        if isinstance(error, type):
+            span.error = error.__name__
+        elif error is not None:
+            span.error = type(error).__name__
+        span.finish()
+        for hook in self.post_response_hooks:
+            self._run_hook(hook, span, response)
+        self._export(span)
+
+    @contextmanager
+    def span(self, name, **attributes):
+        span = self._child(name)
+        span.attributes.update(attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            _current_span.reset(token)
+            span.finish()
+            self._export(span)
+
+    def _run_hook(self, hook, *args):
+        # A broken hook must not fail the request
+        try:
+            hook(*args)
+        except Exception:
+            self._log.exception("Tracing hook %s failed", hook)
+
+    def _export(self, span):
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception:
+                self._log.exception("Span exporter %s failed", exporter)
+
+    def shutdown(self):
+        for exporter in self.exporters:
+            exporter.shutdown()
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+from threading import Lock
+
+import requests
+
+
+class APITransport(object):
+    # Everything an APIRequests needs to put requests on the wire: the
+    # session and its connections, the signing handler, retry policy, rate
+    # limit, response cache and JWT. The API groups of one client (e.g.
+    # CapellaAPI, its cluster_ops_apis and org_ops_apis) are handed the
+    # same transport, so they share one set of connections and settings
+    # instead of each holding its own.
+
+    def __init__(self, pool=None, retry_policy=None, session=None):
+        # :param APIConnectionPool pool: pool for the internal/support
+        #                                calls, the shared one when None
+        # :param RetryPolicy retry_policy: applied to every request
+        # :param requests.Session session: session for the api_* calls,
+        #                                  a new one when None
+
+        self.session = session if session is not None else requests.Session()
+        self.lock = Lock()
+        self.pool = pool
+        self.retry_policy = retry_policy
+
+        # (rate, burst, options) once a rate limit is enabled
+        self.rate_limit = None
+
+        # Optional ResponseCache for GET requests
+        self.response_cache = None
+
+        # Optional RequestCoalescer merging identical in-flight GETs
+        self.coalescer = None
+
+        # Default (connect, read) timeout of every request, None for none
+        self.timeout = None
+
+        # Optional HedgePolicy hedging slow GETs
+        self.hedging = None
+
+        # Optional CircuitBreaker failing fast on broken endpoint groups
+        self.circuit_breaker = None
+
+        # Optional BodyCompression of requests and responses
+        self.compression = None
+
+        # Optional APIMetrics registry recording every request
+        self.metrics = None
+
+        # Optional APITracer creating a span around every request
+        self.tracer = None
+
+        # Signing handler, built on first use and re-used afterwards
+        self.auth = None
+
+        # Characters of a request/response body kept in the logs, and the
+        # optional (rate, {endpoint template: rate}) body log sampling
+        self.log_body_limit = 2048
+        self.body_log_sampling = None
+
+        # JWTTokenManager of the internal APIs, created by the first client
+        # using this transport
+        self.token_manager = None
+
+    def close(self):
+        # Closes the connections of the session. The pool is left alone as
+        # it may be shared with other transports.
+        if self.token_manager is not None:
+            self.token_manager.close()
+        self.session.close()
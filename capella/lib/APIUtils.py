@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+import re
+
+from urllib.parse import urlsplit
+
+
+_ID_SEGMENT = re.compile(
+    r"^("
+    r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-"
+    r"[0-9a-fA-F]{12}"     # UUIDs
+    r"|\d+"                # numeric ids
+    r"|[0-9a-fA-F]{16,}"   # hex ids
+    r"|[A-Za-z0-9_\-+/]+=+"  # padded base64, e.g. v4 bucket ids
+    r")$")
+
+# Segments whose child is a name or a base64 encoded name rather than a
+# UUID, so the heuristics above cannot recognise it
+_NAMED_COLLECTIONS = frozenset([
+    "buckets", "bucket", "scopes", "collections", "indexes", "index",
+    "appEndpoints", "flags", "features", "functions", "languagemodels",
+    "metrics", "verify"
+])
+
+
+def endpoint_template(url):
+    # Collapses the ids in a URL (or endpoint) to "{}" so that every call
+    # to the same API ends up under one key, e.g.
+    # https://host/v4/organizations/<uuid>/projects/<uuid>?page=2
+    #   -> /v4/organizations/{}/projects/{}
+    path = urlsplit(url).path
+    segments = path.split("/")
+    template = []
+    previous = None
+    for segment in segments:
+        if segment and (previous in _NAMED_COLLECTIONS or
+                        _ID_SEGMENT.match(segment)):
+            template.append("{}")
+        else:
+            template.append(segment)
+        previous = segment
+    return "/".join(template)
@@ -2,7 +2,7 @@
 # Generic/Built-in
 import logging
 
-import json
+from ..lib import APICodec
 import subprocess
 from ..common.CapellaAPI import CommonCapellaAPI
 
@@ -24,7 +24,7 @@ class CapellaAPI(CommonCapellaAPI):
 
     def create_serverless_dataplane(self, config):
         url = "{}/internal/support/serverless-dataplanes".format(self.internal_url)
-        resp = self.request(url, "POST", params=json.dumps(config))
+        resp = self.request(url, "POST", params=APICodec.dumps(config))
         return resp
 
     def get_all_dataplanes(self):
@@ -40,25 +40,25 @@ class CapellaAPI(CommonCapellaAPI):
 
     def create_serverless_database(self, tenant_id, config):
         url = "{}/v2/organizations/{}/databases".format(self.internal_url, tenant_id)
-        resp = self.do_internal_request(url, method="POST", params=json.dumps(config))
+        resp = self.do_internal_request(url, method="POST", params=APICodec.dumps(config))
         return resp
 
     def create_serverless_database_overRide(self, config):
         url = "{}/internal/support/serverless-databases".format(
             self.internal_url)
-        resp = self.request(url, "POST", params=json.dumps(config))
+        resp = self.request(url, "POST", params=APICodec.dumps(config))
         return resp
 
     def update_serverless_database(self, database_id, config):
         url = "{}/internal/support/serverless-databases/{}".format(
             self.internal_url, database_id)
-        resp = self.request(url, "PUT", params=json.dumps(config))
+        resp = self.request(url, "PUT", params=APICodec.dumps(config))
         return resp
 
     def reweight_dataplane(self, dataplane_id):
         url = "{}/internal/support/serverless-databases/{}/reweight".format(
             self.internal_url, dataplane_id)
-        resp = self.request(url, "POST", params=json.dumps({}))
+        resp = self.request(url, "POST", params=APICodec.dumps({}))
         return resp
 
     def get_serverless_db_info(self, tenant_id, project_id, database_id):
@@ -106,7 +106,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = "{}/internal/support/serverless-databases/{}" \
             .format(self.internal_url, database_id)
         resp = self.request(url, "PUT",
-                                    params=json.dumps(override_obj))
+                                    params=APICodec.dumps(override_obj))
         return resp
 
     def list_all_databases(self, tenant_id, project_id):
@@ -119,7 +119,7 @@ class CapellaAPI(CommonCapellaAPI):
         # This to to add the list of IPs provided in config for whitelisting
         url = "{}/v2/organizations/{}/projects/{}/clusters/{}/allowlists-bulk" \
             .format(self.internal_url, tenant_id, project_id, database_id)
-        resp = self.do_internal_request(url, method="POST", params=json.dumps(config))
+        resp = self.do_internal_request(url, method="POST", params=APICodec.dumps(config))
         return resp
 
     def allow_my_ip(self, tenant_id, project_id, cluster_id):
@@ -132,14 +132,14 @@ class CapellaAPI(CommonCapellaAPI):
         body = {"cidr": "{}/32".format(resp.content.decode())}
         url = '{}/allowlists'.format(url)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(body))
+                                        params=APICodec.dumps(body))
         return resp
 
     def generate_keys(self, tenant_id, project_id, database_id):
         url = "{}/v2/organizations/{}/projects/{}/databases/{}/keys" \
             .format(self.internal_url, tenant_id, project_id, database_id)
         body = {}
-        resp = self.do_internal_request(url, method="POST", params=json.dumps(body))
+        resp = self.do_internal_request(url, method="POST", params=APICodec.dumps(body))
         return resp
 
     def delete_database(self, tenant_id, project_id, database_id):
@@ -195,7 +195,7 @@ class CapellaAPI(CommonCapellaAPI):
                 raise Exception("Fetch public IP failed!")
             ip = resp.content.decode()
         body = {"allowCIDR": "{}/32".format(ip)}
-        resp = self.request(url, "POST", params=json.dumps(body))
+        resp = self.request(url, "POST", params=APICodec.dumps(body))
         return resp
 
     def get_serverless_database_debugInfo(self, database_id):
@@ -226,7 +226,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = "{}/internal/support/serverless-dataplanes/{}/cluster-specs" \
               .format(self.internal_url, dataplane_id)
         resp = self.request(url, "POST",
-                                    params=json.dumps(specs))
+                                    params=APICodec.dumps(specs))
         return resp
 
     def get_all_scaling_records(self, dataplane_id, page=1, perPage=100):
@@ -245,7 +245,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = "{}/v2/organizations/{}/projects/{}/databases/{}/app-services" \
             .format(self.internal_url, tenant_id, project_id, database_id)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def list_sgw_backends(self, tenant_id, project_id, database_id, page=1, perPage=100):
@@ -265,7 +265,7 @@ class CapellaAPI(CommonCapellaAPI):
             .format(self.internal_url, tenant_id, project_id, database_id, app_service_id)
         body = {"cidr": "{}/32".format(ip), "comment": ""}
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(body))
+                                        params=APICodec.dumps(body))
         return resp
 
     def allow_my_ip_sgw(self, tenant_id, project_id, database_id, app_service_id):
@@ -276,7 +276,7 @@ class CapellaAPI(CommonCapellaAPI):
             raise Exception("Fetch public IP failed!")
         body = {"cidr": "{}/32".format(resp.content.decode()), "comment": ""}
         resp = self.do_internal_request(url, method="POST",
-                                    params=json.dumps(body))
+                                    params=APICodec.dumps(body))
         return resp
 
     def delete_allowed_ip_sgw(self, tenant_id, project_id, database_id, app_service_id, ip):
@@ -289,7 +289,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = '{}/v2/organizations/{}/projects/{}/databases/{}/app-services/{}/adminusers' \
               .format(self.self.internal_url, tenant_id, project_id, database_id, app_service_id)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def list_admin_users_sgw(self, tenant_id, project_id, database_id, app_service_id):
@@ -308,7 +308,7 @@ class CapellaAPI(CommonCapellaAPI):
         url = '{}/v2/organizations/{}/projects/{}/databases/{}/app_services/{}/databases' \
               .format(self.internal_url, tenant_id, project_id, database_id, app_service_id)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def list_sgw_databases(self, tenant_id, project_id, database_id, app_service_id, page=1, perPage=100):
@@ -341,21 +341,21 @@ class CapellaAPI(CommonCapellaAPI):
         url = '{}/v2/organizations/{}/projects/{}/databases/{}/app-services/{}/databases/{}/sync' \
               .format(self.internal_url, tenant_id, project_id, database_id, app_service_id, db_name)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def add_app_role_sgw(self, tenant_id, project_id, database_id, app_service_id, db_name, config):
         url = '{}/v2/organizations/{}/projects/{}/databases/{}/app-services/{}/databases/{}/roles' \
               .format(self.internal_url, tenant_id, project_id, database_id, app_service_id, db_name)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def add_user_sgw(self, tenant_id, project_id, database_id, app_service_id, db_name, config):
         url = '{}/v2/organizations/{}/projects/{}/databases/{}/app-services/{}/databases/{}/users' \
               .format(self.internal_url, tenant_id, project_id, database_id, app_service_id, db_name)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
 
     def get_sgw_links(self, tenant_id, project_id, database_id, app_service_id, db_name):
@@ -380,5 +380,5 @@ class CapellaAPI(CommonCapellaAPI):
         url = '{}/internal/support/serverless-app-services-subcluster/{}/scale' \
               .format(self.internal_url, subcluster_id)
         resp = self.do_internal_request(url, method="POST",
-                                        params=json.dumps(config))
+                                        params=APICodec.dumps(config))
         return resp
\ No newline at end of file
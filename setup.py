@@ -4,5 +4,9 @@ setup(
     name='capellaApi',
     version='1.0',
     packages=find_packages(),
-    install_requires=['requests']
+    install_requires=['requests'],
+    extras_require={
+        'async': ['httpx'],
+        'http2': ['httpx[http2]']
+    }
 )
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import unittest
+
+from capella.lib.APICircuitBreaker import CircuitBreaker
+from capella.lib.APIExceptions import CbcAPIError, CircuitOpenError
+from capella.lib.APIRequests import APIRequests
+
+try:
+    from capella.lib.APIAsyncRequests import AsyncAPIRequests
+except ImportError:  # pragma: no cover - optional dependency
+    AsyncAPIRequests = None
+
+URL = "http://127.0.0.1:9"
+
+
+def _rejected(breaker):
+    return sum(circuit["rejected"] for circuit in breaker.stats().values())
+
+
+def _open_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_time=60)
+    key, _ = breaker.allow(URL + "/v4/organizations")
+    breaker.record(key, False)
+    return breaker
+
+
+class OpenCircuitTest(unittest.TestCase):
+    # Rejections of an open circuit under the default exit_on_error
+
+    def setUp(self):
+        self.assertTrue(CbcAPIError.exit_on_error)
+
+    def test_api_get_raises(self):
+        client = APIRequests(URL, "secret", "access")
+        client.enable_circuit_breaker(_open_breaker())
+        with self.assertRaises(CircuitOpenError):
+            client.api_get("/v4/organizations")
+
+    def test_internal_request_returns_none(self):
+        client = APIRequests(URL, "secret", "access")
+        breaker = client.enable_circuit_breaker(_open_breaker())
+        self.assertIsNone(client._urllib_request(URL + "/v4/organizations"))
+        self.assertEqual(_rejected(breaker), 1)
+
+    @unittest.skipIf(AsyncAPIRequests is None, "httpx is not installed")
+    def test_async_internal_request_returns_none(self):
+        client = AsyncAPIRequests(URL, "secret", "access")
+        breaker = client.enable_circuit_breaker(_open_breaker())
+        self.assertIsNone(asyncio.run(
+            client._urllib_request(URL + "/v4/organizations")))
+        self.assertEqual(_rejected(breaker), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
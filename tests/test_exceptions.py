@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+import pickle
+import unittest
+
+from capella.lib.APIExceptions import CbcAPIError, GenericHTTPError
+
+
+class PickleTest(unittest.TestCase):
+
+    def test_round_trip_does_not_exit(self):
+        # Built with exiting off, as a worker process would have, and
+        # unpickled with the default exit_on_error=True
+        CbcAPIError.exit_on_error = False
+        try:
+            error = GenericHTTPError("boom", status_code=500,
+                                     endpoint="/v4/organizations",
+                                     latency=0.5, retries=2,
+                                     response=object())
+        finally:
+            CbcAPIError.exit_on_error = True
+        copy = pickle.loads(pickle.dumps(error))
+        self.assertIsInstance(copy, GenericHTTPError)
+        self.assertEqual(copy.args, error.args)
+        self.assertEqual(copy.msg, "boom")
+        self.assertEqual(copy.status_code, 500)
+        self.assertEqual(copy.endpoint, "/v4/organizations")
+        self.assertEqual(copy.latency, 0.5)
+        self.assertEqual(copy.retries, 2)
+        self.assertIsNone(copy.response)
+
+
+if __name__ == "__main__":
+    unittest.main()